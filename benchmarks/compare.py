@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Compares two JSON results files saved by benchmarks/suite.py, e.g. from
+before and after a change, and flags the cases that got slower.
+
+Usage: python benchmarks/compare.py BASELINE.json CURRENT.json
+                                    [--metric median_us] [--threshold 0.1]
+
+Exits with status 1 if any case regressed by more than the threshold.
+
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, current, metric, threshold):
+    """
+    Prints a row per case and returns the names of the cases whose metric
+    grew by more than the threshold (a fraction, e.g. 0.1 for 10%).
+
+    """
+    regressions = []
+    names = sorted(set(baseline['results']) | set(current['results']))
+    print("%-30s %12s %12s %8s" % ("case", "baseline", "current", "change"))
+    for name in names:
+        before = baseline['results'].get(name, {}).get(metric)
+        after = current['results'].get(name, {}).get(metric)
+        if before is None or after is None:
+            print("%-30s %12s %12s %8s" % (name, _format(before), _format(after), "n/a"))
+            continue
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  slower"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print("%-30s %12.1f %12.1f %+7.1f%%%s" % (name, before, after, change * 100, flag))
+    return regressions
+
+
+def _format(value):
+    return "-" if value is None else "%.1f" % value
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Compares benchmark results.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--metric", default="median_us",
+                        help="per-call metric to compare; lower is better")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="fractional change that counts as a regression")
+    args = parser.parse_args(argv[1:])
+
+    baseline, current = load(args.baseline), load(args.current)
+    for label, results in (("baseline", baseline), ("current", current)):
+        meta = results.get('meta', {})
+        print("%-8s bulbs %s, %s %s, size=%s" % (label, meta.get('bulbs'),
+              meta.get('implementation'), meta.get('python'), meta.get('size')))
+    regressions = compare(baseline, current, args.metric, args.threshold)
+    if regressions:
+        print("%d case(s) slower by more than %d%%" %
+              (len(regressions), args.threshold * 100))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
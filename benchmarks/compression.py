@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Measures the bytes on the wire and the latency of large Rexster requests,
+with and without compression, over a throttled local link.
+
+Each case runs against a bulbs.testing.FakeServer with the given bandwidth
+and round-trip latency, once uncompressed, once with compress_responses and
+once with compress_threshold too. The bytes are counted by the server, so
+they're the compressed sizes.
+
+Usage: python benchmarks/compression.py [--size N] [--number N]
+                                        [--bandwidth BYTES] [--latency SECONDS]
+
+"""
+from __future__ import print_function
+
+import argparse
+import sys
+
+from bulbs.config import Config
+from bulbs.metrics import timer
+from bulbs.rexster import Graph
+from bulbs.testing import FakeServer, MemoryGraph
+
+MODES = [("none", False, None),
+         ("responses", True, None),
+         ("both", True, 1024)]
+
+
+def build_graph(size):
+    graph = MemoryGraph()
+    hub = graph.add_vertex(dict(name="hub"))
+    for i in range(size):
+        vertex = graph.add_vertex(dict(name="person %d" % i, email="person%d@example.com" % i,
+                                       age=i % 90, city="Dallas"))
+        graph.add_edge(hub._id, "knows", vertex._id, dict())
+    return graph, hub._id
+
+
+def get_cases(size, hub_id):
+    data = dict(("property%d" % i, "value %d" % i) for i in range(size))
+    return [("gremlin g.V", lambda g: list(g.gremlin.query("g.V"))),
+            ("vertex outV", lambda g: list(g.vertices.get(hub_id).outV())),
+            ("vertex update", lambda g: g.client.update_vertex(hub_id, data))]
+
+
+def measure(server, g, func, number):
+    func(g)    # warm up the connection
+    received, sent = server.bytes_received, server.bytes_sent
+    start = timer()
+    for i in range(number):
+        func(g)
+    elapsed = timer() - start
+    return (elapsed / number * 1e3,
+            (server.bytes_received - received) / float(number),
+            (server.bytes_sent - sent) / float(number))
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmarks HTTP compression.")
+    parser.add_argument("--size", type=int, default=1000,
+                        help="elements in the results and properties in the update")
+    parser.add_argument("--number", type=int, default=10, help="calls per case")
+    parser.add_argument("--bandwidth", type=int, default=1000000,
+                        help="bytes per second of the link")
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="seconds of latency per request")
+    args = parser.parse_args(argv[1:])
+
+    graph, hub_id = build_graph(args.size)
+    print("%d bytes/s, %.1f ms latency" % (args.bandwidth, args.latency * 1e3))
+    print("%-16s %-10s %12s %12s %12s" %
+          ("case", "compress", "ms/call", "sent B", "received B"))
+    with FakeServer(graph, latency=args.latency, bandwidth=args.bandwidth) as server:
+        for name, func in get_cases(args.size, hub_id):
+            for mode, compress_responses, compress_threshold in MODES:
+                config = Config(server.get_graph_uri())
+                config.compress_responses = compress_responses
+                config.compress_threshold = compress_threshold
+                g = Graph(config)
+                ms, sent, received = measure(server, g, func, args.number)
+                print("%-16s %-10s %12.1f %12d %12d" % (name, mode, ms, sent, received))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
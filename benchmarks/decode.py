@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Times the client side of a response, stage by stage, by replaying recorded
+payloads through the Response and element initialization pipeline.
+
+Stages, each timed on its own:
+
+  json      Response.get_content: decoding the body.
+  results   Building the Result objects from the decoded content.
+  lookup    utils.get_element_class for each result.
+  init      Creating each element and calling its _initialize.
+  access    Reading every property of each element. Models convert their
+            properties lazily, so this is where that cost shows up; their
+            converted values are cleared first so each run converts them.
+  total     The whole pipeline: Response() plus initialize_elements().
+
+Payloads come in several shapes (Neo4j and Rexster vertices, Models, and
+edges) and sizes. --memory adds tracemalloc allocation stats per stage
+(Python 3.4+), and --profile runs the whole pipeline under cProfile.
+
+Usage: python benchmarks/decode.py [--shape SHAPE] [--size N] [--repeat N]
+                                   [--memory] [--profile] [--profile-output FILE]
+
+"""
+from __future__ import print_function
+
+import argparse
+import cProfile
+import gc
+import json
+import pstats
+import sys
+
+import httplib2
+
+from bulbs.config import Config
+from bulbs.metrics import timer
+from bulbs.neo4jserver.client import Neo4jClient, NEO4J_URI
+from bulbs.rexster.client import RexsterClient, REXSTER_URI
+from bulbs.utils import initialize_elements, get_element_class
+
+from suite import Person, build_person_data
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2 and < 3.4
+    tracemalloc = None
+
+STAGES = ("json", "results", "lookup", "init", "access", "total")
+
+
+# Recorded payloads
+
+def build_model_data(client):
+    # The DB form of a Person, as the client would have saved it.
+    person = Person(client)
+    person.get_bundle(**build_person_data(1))
+    return person._get_property_data()
+
+
+def neo4j_vertex(i, data):
+    uri = "%snode/%d" % (NEO4J_URI, i)
+    return {"self": uri, "data": data, "properties": uri + "/properties",
+            "outgoing_relationships": uri + "/relationships/out",
+            "incoming_relationships": uri + "/relationships/in"}
+
+
+def neo4j_edge(i, data):
+    uri = "%srelationship/%d" % (NEO4J_URI, i)
+    return {"self": uri, "data": data, "type": "knows", "properties": uri + "/properties",
+            "start": "%snode/%d" % (NEO4J_URI, i), "end": "%snode/%d" % (NEO4J_URI, i + 1)}
+
+
+def rexster_vertex(i, data):
+    return dict(data, _id=str(i), _type="vertex")
+
+
+def rexster_edge(i, data):
+    return dict(data, _id=str(i), _type="edge", _outV=str(i), _inV=str(i + 1),
+                _label="knows")
+
+
+def build_shapes():
+    """Returns a dict of (client, build_payload) tuples keyed by shape."""
+    neo4j = Neo4jClient(Config(NEO4J_URI))
+    rexster = RexsterClient(Config(REXSTER_URI))
+    for client in (neo4j, rexster):
+        client.registry.add_class(Person)
+    model_data = build_model_data(neo4j)
+
+    def plain(i):
+        return dict(name="James %d" % i, age=i)
+
+    def neo4j_payload(build, get_data):
+        # Neo4j Server's Gremlin extension returns a bare list.
+        return lambda size: [build(i, get_data(i)) for i in range(size)]
+
+    def rexster_payload(build, get_data):
+        return lambda size: dict(results=[build(i, get_data(i)) for i in range(size)])
+
+    return {
+        "neo4j.vertex": (neo4j, neo4j_payload(neo4j_vertex, plain)),
+        "neo4j.model": (neo4j, neo4j_payload(neo4j_vertex, lambda i: model_data)),
+        "neo4j.edge": (neo4j, neo4j_payload(neo4j_edge, plain)),
+        "rexster.vertex": (rexster, rexster_payload(rexster_vertex, plain)),
+        "rexster.model": (rexster, rexster_payload(rexster_vertex, lambda i: model_data)),
+        "rexster.edge": (rexster, rexster_payload(rexster_edge, plain)),
+    }
+
+
+def build_http_response(payload):
+    # The (headers, content) tuple httplib2 returns.
+    headers = httplib2.Response({"status": "200", "content-type": "application/json"})
+    return headers, json.dumps(payload).encode("utf-8")
+
+
+# Stages. Each one gets its inputs from the previous stage's output, built
+# once up front, so only the stage itself is timed.
+
+class Pipeline(object):
+
+    def __init__(self, client, http_resp):
+        self.client = client
+        self.config = client.config
+        self.http_resp = http_resp
+        self.response_class = client.request.response_class
+        self.result_class = self.response_class.result_class
+        self.response = self.response_class(http_resp, self.config)
+        self.content = self.response.content
+        self.raw_results = self._get_raw_results()
+        self.results = self.stage_results()
+        self.classes = self.stage_lookup()
+        self.elements = self.stage_init()
+
+    def _get_raw_results(self):
+        if isinstance(self.content, dict):
+            return self.content['results']
+        return self.content
+
+    def stage_json(self):
+        return self.response.get_content(self.http_resp)
+
+    def stage_results(self):
+        result_class, config = self.result_class, self.config
+        return [result_class(raw, config) for raw in self.raw_results]
+
+    def stage_lookup(self):
+        client = self.client
+        return [get_element_class(client, result) for result in self.results]
+
+    def stage_init(self):
+        client = self.client
+        elements = []
+        for element_class, result in zip(self.classes, self.results):
+            element = element_class(client)
+            element._initialize(result)
+            elements.append(element)
+        return elements
+
+    def stage_access(self):
+        for element in self.elements:
+            properties = getattr(element, "_properties", None)
+            if properties is not None:
+                element._clear_property_data()
+                for key in properties:
+                    getattr(element, key)
+            else:
+                element.data()
+
+    def stage_total(self):
+        response = self.response_class(self.http_resp, self.config)
+        return list(initialize_elements(self.client, response) or [])
+
+
+def time_stage(func, repeat):
+    """Returns the fastest of the repeated runs, in seconds."""
+    func()
+    times = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for i in range(repeat):
+            start = timer()
+            func()
+            times.append(timer() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return min(times)
+
+
+def measure_memory(func):
+    """
+    Returns the (peak KB, blocks) the function allocates: the peak traced
+    memory while it runs and the number of memory blocks it leaves live,
+    i.e. the objects its result holds on to.
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        start, _ = tracemalloc.get_traced_memory()
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del result
+    return (peak - start) / 1024.0, blocks
+
+
+def run(shapes, sizes, repeat, memory):
+    all_shapes = build_shapes()
+    header = "%-16s %7s %-8s %12s %12s" % ("shape", "size", "stage", "ms", "us/element")
+    if memory:
+        header += " %10s %10s" % ("peak_kb", "blocks")
+    print(header)
+    for shape in shapes:
+        client, build_payload = all_shapes[shape]
+        for size in sizes:
+            pipeline = Pipeline(client, build_http_response(build_payload(size)))
+            for stage in STAGES:
+                func = getattr(pipeline, "stage_%s" % stage)
+                seconds = time_stage(func, repeat)
+                line = "%-16s %7d %-8s %12.3f %12.3f" % (shape, size, stage, seconds * 1e3,
+                                                        seconds / size * 1e6)
+                if memory:
+                    peak_kb, blocks = measure_memory(func)
+                    line += " %10.1f %10d" % (peak_kb, blocks)
+                print(line)
+
+
+def profile(shapes, sizes, repeat, output, top):
+    all_shapes = build_shapes()
+    profiler = cProfile.Profile()
+    for shape in shapes:
+        client, build_payload = all_shapes[shape]
+        for size in sizes:
+            pipeline = Pipeline(client, build_http_response(build_payload(size)))
+            profiler.enable()
+            for i in range(repeat):
+                pipeline.stage_total()
+                pipeline.stage_access()
+            profiler.disable()
+    if output:
+        profiler.dump_stats(output)
+        print("Saved profile to %s" % output)
+    stats = pstats.Stats(profiler, stream=sys.stdout)
+    stats.sort_stats("cumulative").print_stats(top)
+
+
+def main(argv):
+    shapes = sorted(build_shapes())
+    parser = argparse.ArgumentParser(description="Times response decoding and "
+                                     "element initialization by stage.")
+    parser.add_argument("--shape", action="append", choices=shapes,
+                        help="payload shape; repeat for several (default: all)")
+    parser.add_argument("--size", action="append", type=int,
+                        help="elements per payload; repeat for several "
+                        "(default: 10, 1000, 10000)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per stage")
+    parser.add_argument("--memory", action="store_true",
+                        help="add tracemalloc allocation stats")
+    parser.add_argument("--profile", action="store_true",
+                        help="run the whole pipeline under cProfile instead")
+    parser.add_argument("--profile-output", default=None,
+                        help="save the cProfile stats for pstats or snakeviz")
+    parser.add_argument("--top", type=int, default=25, help="profile rows to print")
+    args = parser.parse_args(argv[1:])
+
+    shapes = args.shape or shapes
+    sizes = args.size or [10, 1000, 10000]
+    if args.memory and tracemalloc is None:
+        parser.error("--memory requires tracemalloc (Python 3.4+)")
+    if args.profile:
+        profile(shapes, sizes, args.repeat, args.profile_output, args.top)
+    else:
+        run(shapes, sizes, args.repeat, args.memory)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
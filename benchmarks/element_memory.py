@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Measures the memory used per element when initializing a large result,
+with the slotted Result/lazy proxy internals and with the old layout.
+
+The "legacy" classes below recreate the old layout: a Result with a
+__dict__ and its own type_map, and elements that build their vertex and
+edge proxies in _initialize. Requires Python 3.4+ for tracemalloc.
+
+Usage: python benchmarks/element_memory.py [num_elements]
+
+"""
+from __future__ import print_function
+
+import gc
+import sys
+import tracemalloc
+
+from bulbs.config import Config
+from bulbs.element import Vertex, VertexProxy, Edge, EdgeProxy
+from bulbs.neo4jserver.client import Neo4jResult, NEO4J_URI
+from bulbs.registry import Registry
+
+
+class LegacyNeo4jResult(Neo4jResult):
+
+    # No __slots__, so instances get a __dict__ like they used to.
+
+    def __init__(self, result, config):
+        super(LegacyNeo4jResult, self).__init__(result, config)
+        self.type_map = dict(node="vertex", relationship="edge")
+
+
+class LegacyVertex(Vertex):
+
+    def _initialize(self, result):
+        super(LegacyVertex, self)._initialize(result)
+        self.__dict__["_vertex_proxy"] = VertexProxy(Vertex, self._client)
+        self.__dict__["_edge_proxy"] = EdgeProxy(Edge, self._client)
+
+
+class Client(object):
+    """Just enough of a Client to initialize elements."""
+
+    def __init__(self):
+        self.config = Config(NEO4J_URI)
+        self.registry = Registry(self.config)
+
+
+def build_payload(count):
+    # What a Neo4j node representation looks like after JSON decoding.
+    return [{"self": "%snode/%d" % (NEO4J_URI, i),
+             "data": {"name": "node%d" % i, "age": i}} for i in range(count)]
+
+
+def measure(result_class, element_class, payload, client):
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    elements = []
+    for raw in payload:
+        element = element_class(client)
+        element._initialize(result_class(raw, client.config))
+        elements.append(element)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (current - start) / float(len(payload))
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 100000
+    client = Client()
+    payload = build_payload(count)
+
+    print("%d elements" % count)
+    print("%-32s %14s" % ("layout", "bytes/element"))
+    cases = [("legacy result + eager proxies", LegacyNeo4jResult, LegacyVertex),
+             ("slotted result + lazy proxies", Neo4jResult, Vertex)]
+    for name, result_class, element_class in cases:
+        per_element = measure(result_class, element_class, payload, client)
+        print("%-32s %14.1f" % (name, per_element))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
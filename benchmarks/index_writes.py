@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Counts the index writes one save makes with the update_indexed_* and
+patch_indexed_* scripts, before and after they only rewrote changed keys.
+
+The client sends the scripts from rexster/gremlin.groovy to a
+bulbs.testing.FakeServer. No Groovy runs: the fake server's Gremlin
+emulator recognizes each library script and runs its Python stand-in,
+MemoryGraph.update_properties or patch_properties, which follow the
+current scripts' index logic. The "before" rows run the same requests
+against a graph whose update_properties follows the old scripts instead,
+removing every indexed entry and adding them all back. The graphs'
+indices count the entries they add and remove.
+
+Usage: python benchmarks/index_writes.py [num_properties] [num_saves]
+
+"""
+from __future__ import print_function
+
+import sys
+import time
+
+from bulbs.config import Config
+from bulbs.memory.store import MemoryIndex
+from bulbs.rexster import RexsterClient
+from bulbs.testing import FakeServer, MemoryGraph
+
+
+class CountingIndex(MemoryIndex):
+    """MemoryIndex that counts the entries added and removed."""
+
+    def __init__(self, *args, **kwds):
+        super(CountingIndex, self).__init__(*args, **kwds)
+        self.writes = 0
+
+    def put(self, key, value, _id):
+        self.writes += 1
+        return super(CountingIndex, self).put(key, value, _id)
+
+    def remove(self, _id, key=None, value=None):
+        self.writes += 1
+        return super(CountingIndex, self).remove(_id, key, value)
+
+
+class CountingGraph(MemoryGraph):
+    """MemoryGraph whose indices are CountingIndexes."""
+
+    def create_index(self, name, index_class, index_type="manual"):
+        with self.lock:
+            if name in self.indices:
+                raise ValueError("Index already exists: %s" % name)
+            index = self.indices[name] = CountingIndex(name, index_class, index_type)
+            return index
+
+
+class FullRewriteGraph(CountingGraph):
+    """
+    CountingGraph whose update_properties follows the update_indexed_*
+    scripts before they only rewrote changed keys.
+
+    """
+    def update_properties(self, element, data, index=None, keys=None):
+        with self.lock:
+            for key, value in element.data.items():
+                if index is not None and (keys is None or key in keys):
+                    index.remove(element._id, key, value)
+            element.data = dict((key, value) for key, value in (data or {}).items()
+                                if value is not None)
+            for key, value in element.data.items():
+                if index is not None and (keys is None or key in keys):
+                    index.put(key, value, element._id)
+            return element
+
+
+def run(client, graph, element_type, script, num_properties, num_saves):
+    # Saves that change one counter field; update_* sends all the data, like
+    # save_all(), and patch_* only the changed key, like save().
+    data = dict(("prop%d" % i, i) for i in range(num_properties))
+    index_name = "%s_writes" % script
+    if element_type == "vertex":
+        client.get_or_create_vertex_index(index_name)
+        resp = client.create_indexed_vertex(data, index_name)
+    else:
+        client.get_or_create_edge_index(index_name)
+        outV = client.create_vertex({}).one().get_id()
+        inV = client.create_vertex({}).one().get_id()
+        resp = client.create_indexed_edge(outV, "knows", inV, data, index_name)
+    _id = resp.one().get_id()
+    index = graph.indices[index_name]
+    index.writes = 0
+    update = getattr(client, script)
+    start = time.time()
+    for count in range(num_saves):
+        data["prop0"] = count + num_properties
+        payload = data if script.startswith("update") else dict(prop0=data["prop0"])
+        update(_id, payload, index_name)
+    elapsed = time.time() - start
+    element = graph.get_vertex(_id) if element_type == "vertex" else graph.get_edge(_id)
+    assert element.data == data
+    return index.writes / float(num_saves), elapsed
+
+
+def main(argv):
+    num_properties = int(argv[1]) if len(argv) > 1 else 20
+    num_saves = int(argv[2]) if len(argv) > 2 else 200
+
+    print("%d properties, 1 changed per save, %d saves" %
+          (num_properties, num_saves))
+    print("%-8s %-24s %16s %10s" % ("", "script", "writes/save", "seconds"))
+    cases = [("before", FullRewriteGraph, "vertex", "update_indexed_vertex"),
+             ("after", CountingGraph, "vertex", "update_indexed_vertex"),
+             ("after", CountingGraph, "vertex", "patch_indexed_vertex"),
+             ("before", FullRewriteGraph, "edge", "update_indexed_edge"),
+             ("after", CountingGraph, "edge", "update_indexed_edge"),
+             ("after", CountingGraph, "edge", "patch_indexed_edge")]
+    for version, graph_class, element_type, script in cases:
+        graph = graph_class()
+        with FakeServer(graph) as server:
+            client = RexsterClient(Config(server.get_graph_uri()))
+            writes, elapsed = run(client, graph, element_type, script,
+                                  num_properties, num_saves)
+        print("%-8s %-24s %16.1f %10.3f" % (version, script, writes, elapsed))
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Compares the per-Model encoder/decoder built by ModelMeta with the generic
+per-Property loop Model used to run on every save and load.
+
+No database is needed; the model is encoded and decoded in memory.
+
+Usage: python benchmarks/model_codec.py [iterations]
+
+"""
+from __future__ import print_function
+
+import sys
+import timeit
+
+from bulbs.config import Config
+from bulbs.json import JSONTypeSystem
+from bulbs.model import Node
+from bulbs.property import String, Integer, Long, Float, Bool, List, \
+    Dictionary, DateTime
+from bulbs.utils import current_datetime
+
+
+class Client(object):
+    """Just enough of a Client for Model to get its config and type system."""
+
+    def __init__(self):
+        self.config = Config("http://localhost")
+        self.type_system = JSONTypeSystem()
+
+
+class Wide(Node):
+
+    element_type = "wide"
+
+    name = String(nullable=False)
+    title = String()
+    email = String()
+    city = String()
+    country = String()
+    bio = String()
+    age = Integer()
+    score = Integer()
+    rank = Integer()
+    visits = Integer()
+    views = Long()
+    bytes = Long()
+    height = Float()
+    weight = Float()
+    rating = Float()
+    active = Bool()
+    admin = Bool()
+    verified = Bool()
+    tags = List()
+    roles = List()
+    settings = Dictionary()
+    created = DateTime()
+    updated = DateTime()
+    last_seen = DateTime()
+
+
+def build_model(client):
+    now = current_datetime()
+    model = Wide(client)
+    model.get_bundle(name="James", title="Dr", email="james@example.com",
+                     city="Dallas", country="US", bio="x" * 200, age=34,
+                     score=1, rank=2, visits=3, views=4, bytes=5,
+                     height=1.8, weight=80.0, rating=4.5, active=True,
+                     admin=False, verified=True, tags=["a", "b"],
+                     roles=["user"], settings=dict(theme="dark"),
+                     created=now, updated=now, last_seen=now)
+    return model
+
+
+def legacy_encode(model, type_system):
+    # Model._get_property_data's loop before the per-Model encoder
+    data = {}
+    for key in model._properties:
+        property_instance = model._properties[key]
+        value = model._get_property_value(key)
+        property_instance.validate(key, value)
+        data[key] = property_instance.convert_to_db(type_system, key, value)
+    return data
+
+
+def legacy_decode(model, data, type_system):
+    # Model._set_property_data's loop before the per-Model decoder
+    for key in model._properties:
+        if model._is_calculated_property(key):
+            continue
+        property_instance = model._properties[key]
+        value = data.get(key, None)
+        value = property_instance.convert_to_python(type_system, key, value)
+        object.__setattr__(model, key, value)
+
+
+def main(argv):
+    number = int(argv[1]) if len(argv) > 1 else 20000
+    client = Client()
+    type_system = client.type_system
+    model = build_model(client)
+    encode, decode = Wide.get_codec(type_system)
+    data = encode(model, {})
+    assert data == legacy_encode(model, type_system)
+
+    cases = [
+        ("encode (legacy loop)", lambda: legacy_encode(model, type_system)),
+        ("encode (compiled)", lambda: encode(model, {})),
+        ("decode (legacy loop)", lambda: legacy_decode(model, data, type_system)),
+        ("decode (compiled)", lambda: decode(model, data)),
+    ]
+
+    print("%d properties, %d iterations" % (len(Wide._properties), number))
+    print("%-24s %12s" % ("case", "usec/call"))
+    timings = {}
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        timings[name] = seconds
+        print("%-24s %12.2f" % (name, seconds / number * 1e6))
+
+    for stage in ("encode", "decode"):
+        legacy = timings["%s (legacy loop)" % stage]
+        compiled = timings["%s (compiled)" % stage]
+        print("%s speedup: %.2fx" % (stage, legacy / compiled))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
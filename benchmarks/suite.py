@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+End-to-end benchmarks for the bulbs hot paths.
+
+The Rexster cases run against bulbs.testing.FakeServer, the RexPro cases
+against FakeRexProServer, and the Neo4j cases against a ReplayServer of
+recorded responses, so no database is needed and
+the network is local. Each case reports its throughput and its per-call
+latency, plus "client" time: the latency minus the time spent waiting on
+the server (from the metrics CallInfo), i.e. the overhead bulbs adds.
+Streamed requests aren't timed by the metrics, so for them it's the whole
+latency.
+
+Results are printed and can be saved as JSON for benchmarks/compare.py.
+
+Usage: python benchmarks/suite.py [--size N] [--number N] [--repeat N]
+                                  [--filter TEXT] [--output FILE]
+
+"""
+from __future__ import print_function
+
+import argparse
+import contextlib
+import gc
+import json
+import platform
+import sys
+import time
+
+import bulbs
+from bulbs.config import Config
+from bulbs.metrics import Collector, timer
+from bulbs.model import Node
+from bulbs.neo4jserver import Graph as Neo4jGraph
+from bulbs.property import String, Integer, Float, Bool, List, DateTime
+from bulbs.rexster import Graph as RexsterGraph, RexProClient
+from bulbs.testing import FakeServer, FakeRexProServer, MemoryGraph, ReplayServer
+from bulbs.utils import current_datetime
+
+NEO4J_ROOT = "db/data"
+
+
+class ServerTimeCollector(Collector):
+    """Sums the time spent waiting on the server."""
+
+    def __init__(self):
+        self.server_time = 0.0
+
+    def record_request(self, info):
+        self.server_time += info.server_time
+
+    def record_initialization(self, info):
+        pass
+
+
+class Person(Node):
+
+    element_type = "person"
+
+    name = String(nullable=False)
+    email = String()
+    age = Integer()
+    score = Float()
+    active = Bool()
+    tags = List()
+    created = DateTime()
+
+
+def build_person_data(i):
+    return dict(name="James %d" % i, email="james%d@example.com" % i, age=34,
+                score=1.5, active=True, tags=["a", "b"], created=current_datetime())
+
+
+# Recorded Neo4j Server responses
+
+def neo4j_node(root_uri, _id, data):
+    uri = "%snode/%d" % (root_uri, _id)
+    return {"self": uri, "data": data, "properties": uri + "/properties",
+            "outgoing_relationships": uri + "/relationships/out",
+            "incoming_relationships": uri + "/relationships/in"}
+
+
+def neo4j_index(root_uri, index_type, name):
+    return {"template": "%sindex/%s/%s/{key}/{value}" % (root_uri, index_type, name),
+            "provider": "lucene", "type": "exact"}
+
+
+def neo4j_routes(root_uri, size):
+    def gremlin(params):
+        # Echo the script's data back in a node, like the create and
+        # update scripts do.
+        data = (params.get('params') or {}).get('data') or {}
+        return neo4j_node(root_uri, 1, data)
+
+    # Pre-encoded: the streaming parser needs "columns" before "data", and
+    # json.dumps doesn't keep a dict's key order on Python 2.
+    rows = [["James %d" % i, i, i * 1.5] for i in range(size)]
+    columns = ["n.name", "n.age", "n.score"]
+    table = ('{"columns": %s, "data": %s}' % (json.dumps(columns), json.dumps(rows))).encode('utf-8')
+    return [("POST", r"index/node$",
+             lambda params: neo4j_index(root_uri, "node", params['name'])),
+            ("POST", r"index/relationship$",
+             lambda params: neo4j_index(root_uri, "relationship", params['name'])),
+            ("POST", r"ext/GremlinPlugin", gremlin),
+            ("POST", r"ext/CypherPlugin", table)]
+
+
+# Benchmark cases. Each one is a context manager that sets up its server
+# and yields the graph's Config and the function to time.
+
+CASES = []
+
+
+def case(name):
+    def decorator(func):
+        CASES.append((name, contextlib.contextmanager(func)))
+        return func
+    return decorator
+
+
+@contextlib.contextmanager
+def rexster_graph(graph=None):
+    with FakeServer(graph) as server:
+        yield RexsterGraph(Config(server.get_graph_uri()))
+
+
+class RexProGraph(RexsterGraph):
+
+    client_class = RexProClient
+
+
+@contextlib.contextmanager
+def rexpro_graph(graph=None):
+    with FakeRexProServer(graph) as server:
+        g = RexProGraph(Config(server.get_graph_uri()))
+        try:
+            yield g
+        finally:
+            g.client.close()
+
+
+@contextlib.contextmanager
+def neo4j_graph(size):
+    with ReplayServer(root=NEO4J_ROOT) as server:
+        # The recorded URIs need the server's port.
+        root_uri = server.get_root_uri()
+        server.add_routes(neo4j_routes(root_uri, size))
+        g = Neo4jGraph(Config(root_uri))
+        g.add_proxy("people", Person)
+        yield g
+
+
+@case("rexster.vertices.create")
+def vertices_create(size):
+    with rexster_graph() as g:
+        yield g.config, lambda: g.vertices.create(name="James", age=34)
+
+
+@case("rexster.vertices.get")
+def vertices_get(size):
+    with rexster_graph() as g:
+        _id = g.vertices.create(name="James", age=34).eid
+        yield g.config, lambda: g.vertices.get(_id)
+
+
+@case("rexster.vertex.outV")
+def vertex_outV(size):
+    with rexster_graph() as g:
+        james = g.vertices.create(name="James")
+        for i in range(10):
+            g.edges.create(james, "knows", g.vertices.create(name="friend %d" % i))
+        yield g.config, lambda: list(james.outV())
+
+
+@case("rexster.index.lookup")
+def index_lookup(size):
+    with rexster_graph() as g:
+        for i in range(10):
+            g.vertices.index.put(g.vertices.create(name="James").eid, name="James")
+        yield g.config, lambda: list(g.vertices.index.lookup(name="James"))
+
+
+@case("rexster.gremlin.query")
+def gremlin_query(size):
+    graph = MemoryGraph()
+    for i in range(size):
+        graph.add_vertex(dict(name="v%d" % i, number=i))
+    with rexster_graph(graph) as g:
+        yield g.config, lambda: list(g.gremlin.query("g.V"))
+
+
+# Small Gremlin calls, where the per-request overhead of REST dominates.
+
+@case("rexster.gremlin.get_vertex")
+def rexster_get_vertex(size):
+    with rexster_graph() as g:
+        _id = g.vertices.create(name="James", age=34).eid
+        script = g.scripts.get("get_vertex")
+        yield g.config, lambda: g.client.gremlin(script, dict(_id=_id))
+
+
+@case("rexpro.gremlin.get_vertex")
+def rexpro_get_vertex(size):
+    with rexpro_graph() as g:
+        _id = g.vertices.create(name="James", age=34).eid
+        script = g.scripts.get("get_vertex")
+        yield g.config, lambda: g.client.gremlin(script, dict(_id=_id))
+
+
+@case("rexpro.vertices.create")
+def rexpro_vertices_create(size):
+    with rexpro_graph() as g:
+        yield g.config, lambda: g.vertices.create(name="James", age=34)
+
+
+@case("neo4j.people.create")
+def people_create(size):
+    with neo4j_graph(size) as g:
+        data = build_person_data(1)
+        yield g.config, lambda: g.people.create(**data)
+
+
+@case("neo4j.person.save")
+def person_save(size):
+    with neo4j_graph(size) as g:
+        person = g.people.create(**build_person_data(1))
+
+        def save():
+            person.age += 1
+            person.save()
+        yield g.config, save
+
+
+@case("neo4j.cypher.table")
+def cypher_table(size):
+    with neo4j_graph(size) as g:
+        yield g.config, lambda: g.cypher.table("START n=node(*) RETURN n.name, n.age, n.score")
+
+
+@case("neo4j.cypher.table.columnar")
+def cypher_table_columnar(size):
+    with neo4j_graph(size) as g:
+        query = "START n=node(*) RETURN n.name, n.age, n.score"
+        yield g.config, lambda: g.cypher.table(query, columnar=True)
+
+
+@case("model.encode")
+def model_encode(size):
+    with neo4j_graph(size) as g:
+        person = g.people.create(**build_person_data(1))
+        yield g.config, person._get_property_data
+
+
+@case("model.decode")
+def model_decode(size):
+    with neo4j_graph(size) as g:
+        person = g.people.create(**build_person_data(1))
+        person._data = person._get_property_data()
+        yield g.config, person._set_property_data
+
+
+# Runner
+
+def measure(func, number, repeat, collector):
+    """
+    Times the function number times per repeat and returns the stats of
+    the fastest repeat, which is the least disturbed by other processes.
+
+    """
+    func()    # warm up connections and caches
+    best = None
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for i in range(repeat):
+            latencies = []
+            collector.server_time = 0.0
+            start = timer()
+            for j in range(number):
+                call_start = timer()
+                func()
+                latencies.append(timer() - call_start)
+            elapsed = timer() - start
+            if best is None or elapsed < best[0]:
+                best = (elapsed, latencies, collector.server_time)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    elapsed, latencies, server_time = best
+    latencies.sort()
+    return dict(calls=number,
+                ops_per_sec=number / elapsed,
+                mean_us=elapsed / number * 1e6,
+                median_us=latencies[number // 2] * 1e6,
+                p95_us=latencies[min(number - 1, int(number * 0.95))] * 1e6,
+                min_us=latencies[0] * 1e6,
+                client_us=(elapsed - server_time) / number * 1e6)
+
+
+def run(size, number, repeat, text=None):
+    results = dict()
+    print("%-30s %10s %10s %10s %10s %10s" %
+          ("case", "ops/s", "median_us", "p95_us", "min_us", "client_us"))
+    for name, setup in CASES:
+        if text and text not in name:
+            continue
+        collector = ServerTimeCollector()
+        with setup(size) as (config, func):
+            # Metrics are enabled after setup so only the timed calls count.
+            config.metrics = collector
+            stats = measure(func, number, repeat, collector)
+        results[name] = stats
+        print("%-30s %10.1f %10.1f %10.1f %10.1f %10.1f" %
+              (name, stats['ops_per_sec'], stats['median_us'], stats['p95_us'],
+               stats['min_us'], stats['client_us']))
+    return results
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmarks the bulbs hot paths.")
+    parser.add_argument("--size", type=int, default=1000,
+                        help="rows or elements in the large results")
+    parser.add_argument("--number", type=int, default=200, help="calls per repeat")
+    parser.add_argument("--repeat", type=int, default=5, help="repeats per case")
+    parser.add_argument("--filter", default=None, help="only run cases containing this")
+    parser.add_argument("--output", default=None, help="save the results as JSON")
+    args = parser.parse_args(argv[1:])
+
+    results = run(args.size, args.number, args.repeat, args.filter)
+    if args.output:
+        meta = dict(bulbs=bulbs.__version__, python=platform.python_version(),
+                    implementation=platform.python_implementation(),
+                    platform=platform.platform(), size=args.size, number=args.number,
+                    repeat=args.repeat, time=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        with open(args.output, "w") as f:
+            json.dump(dict(meta=meta, results=results), f, indent=2, sort_keys=True)
+        print("Saved results to %s" % args.output)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
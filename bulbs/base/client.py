@@ -52,7 +52,15 @@ class Result(object):
     :ivar raw: The raw result.
     :ivar data: The data in the result.
 
+    .. note:: Results are slotted because there's one per element and large
+              responses create lots of them. Subclasses should define 
+              __slots__ too, or they'll get a __dict__ back.
+
     """
+    __slots__ = ("config", "raw", "data")
+
+    #: Raw keys kept when the result is pickled. None keeps them all.
+    pickle_keys = None
 
     def __init__(self, result, config):
         self.config = config
@@ -63,6 +71,13 @@ class Result(object):
         # The data in the result.
         self.data = None
 
+    def __reduce__(self):
+        # Pickle compactly by rebuilding the result from the raw keys it uses.
+        raw = self.raw
+        if self.pickle_keys is not None and type(raw) is dict:
+            raw = dict((key, raw[key]) for key in self.pickle_keys if key in raw)
+        return (self.__class__, (raw, self.config))
+
     def get_id(self):
         """
         Returns the element ID.
@@ -174,10 +189,14 @@ class Response(object):
         or None, depending on the number of results returned.
     :ivar total_size: The number of results returned.
     :ivar raw: Raw HTTP response. Only set when log_level is DEBUG.
+    :ivar call_info: The request's CallInfo. Only set when metrics are enabled.
 
     """
     result_class = Result
 
+    #: Set to the request's CallInfo when Config.metrics is set.
+    call_info = None
+
     def __init__(self,  response, config):
         self.config = config
         self.handle_response(response)
@@ -240,6 +259,42 @@ class Response(object):
         """
         raise NotImplementedError
 
+    def get_multi_content(self):
+        """
+        Returns a dict of the per-call content in the response to a Multi's
+        combined Gremlin script, keyed by call.
+
+        :rtype: dict
+
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def from_content(cls, content, headers, config):
+        """
+        Returns a Response built from already-decoded content, e.g. one 
+        call's part of a Multi response.
+
+        :param content: Decoded response content.
+        :type content: Depends on Client.
+
+        :param headers: Response headers.
+        :type headers: Depends on Client.
+
+        :param config: Config object.
+        :type config: bulbs.config.Config
+
+        :rtype: Response
+
+        """
+        resp = cls.__new__(cls)
+        resp.config = config
+        resp.headers = headers
+        resp.content = content
+        resp.results, resp.total_size = resp.get_results()
+        resp.raw = None
+        return resp
+
     def get(self, attribute):
         """Return a client-specific attribute."""
         return self.content[attribute]
@@ -527,6 +582,31 @@ class Client(object):
         """
         raise NotImplementedError 
 
+    def neighbourhood(self, _id, depth, labels=None, direction="both", max_nodes=None):
+        """
+        Returns the vertices and edges within depth hops of the vertex, 
+        deduplicated, in one response: the vertices, then the edges.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param depth: Number of hops from the vertex.
+        :type depth: int
+
+        :param labels: Optional edge labels to follow. Defaults to None (all).
+        :type labels: list or None
+
+        :param direction: Edge direction: "out", "in", or "both".
+        :type direction: str
+
+        :param max_nodes: Optional maximum number of vertices. 
+        :type max_nodes: int or None
+
+        :rtype: Response
+
+        """
+        raise NotImplementedError 
+
     # Index Proxy - Vertex
 
     def create_vertex_index(self, params):
@@ -765,6 +845,28 @@ class Client(object):
         """
         raise NotImplementedError 
 
+    def patch_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Updates only the given properties of an indexed vertex, and only 
+        their index entries, and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Changed property data. None values remove the property.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: Response
+
+        """
+        raise NotImplementedError 
+
     # Model Proxy - Edge
 
     def create_indexed_edge(self, data, index_name, keys=None):
@@ -816,3 +918,25 @@ class Client(object):
         raise NotImplementedError 
     
         
+
+    def patch_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Updates only the given properties of an indexed edge, and only 
+        their index entries, and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Changed property data. None values remove the property.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: Response
+
+        """
+        raise NotImplementedError
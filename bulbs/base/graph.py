@@ -8,6 +8,8 @@ from bulbs.factory import Factory
 from bulbs.element import Vertex, Edge
 from bulbs.model import Relationship
 from bulbs.utils import initialize_elements
+from bulbs.traversal import Traversal
+from bulbs.multi import Multi
 
 from bulbs.base.client import Client
 from bulbs.base.index import Index
@@ -123,6 +125,29 @@ class Graph(object):
             index_class = self.default_index
         return self.factory.build_element_proxy(element_class, index_class)
 
+    def traverse(self, start):
+        """
+        Returns a Traversal that starts at the element(s) and compiles to a 
+        single Gremlin script.
+
+        :param start: Start element(s) or ID(s). IDs are assumed to be vertices.
+        :type start: Element, int, str, or list
+
+        :rtype: Traversal
+
+        """
+        return Traversal(self.client, start)
+
+    def multi(self):
+        """
+        Returns a Multi that runs the calls gathered in its with block in one
+        Gremlin request.
+
+        :rtype: Multi
+
+        """
+        return Multi(self.client)
+
     def load_graphml(self, uri):
         """
         Loads a GraphML file into the database and returns the response.
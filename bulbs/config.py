@@ -35,6 +35,24 @@ class Config(object):
     :ivar vertex_index: Name of the vertex index. Defaults to "vertex". 
     :ivar edge_index: Name of the edge index. Defaults to "edge". 
     :ivar autoindex: Enable auto indexing. Defaults to True.
+    :ivar metrics: Optional metrics Collector that every request is reported 
+        to, e.g. bulbs.metrics.HistogramCollector. Defaults to None.
+    :ivar compress_responses: Ask the server to gzip or deflate its responses.
+        Worth it on slow links, for large responses. Defaults to False.
+    :ivar compress_threshold: Minimum size in bytes of a request body to gzip,
+        or None to never compress them. The server has to accept gzipped
+        request bodies. Defaults to None.
+    :ivar router: Optional bulbs.routing.Router that sends reads to replicas
+        and writes to the master, instead of everything to root_uri.
+        Defaults to None.
+    :ivar coalesce_reads: Have identical reads that are in flight at the same
+        time share one request, e.g. when many threads get the same vertex.
+        Defaults to False.
+    :ivar timeout: Seconds to wait for the server on an HTTP request before 
+        it fails, or None to wait indefinitely. Defaults to None.
+    :ivar cypher_transactions: Send Neo4j Cypher queries to the transactional
+        endpoint, which needs Neo4j 2.0, instead of the CypherPlugin.
+        Defaults to False.
 
     Example:
 
@@ -45,6 +63,15 @@ class Config(object):
     >>> g = Graph(config)
 
     """
+    # Class-level defaults for the options added since the first release,
+    # so configs pickled before them, which lack them, still work.
+    metrics = None
+    compress_responses = False
+    compress_threshold = None
+    router = None
+    coalesce_reads = False
+    timeout = None
+    cypher_transactions = False
 
     def __init__(self, root_uri, username=None, password=None):
         self.root_uri = root_uri
@@ -59,6 +86,13 @@ class Config(object):
         self.vertex_index = "vertex"
         self.edge_index = "edge"
         self.autoindex = True
+        self.metrics = None
+        self.compress_responses = False
+        self.compress_threshold = None
+        self.router = None
+        self.coalesce_reads = False
+        self.timeout = None
+        self.cypher_transactions = False
         
         # Set the default log level and log handler
         self.set_logger(self.log_level, self.log_handler)
@@ -7,8 +7,11 @@
 Vertex and Edge container classes and associated proxy classes.
 
 """
+import six  # Python 3
+
 from .utils import u  # Python 3 unicode
 from .utils import initialize_element, initialize_elements, coerce_id, get_logger
+from .pool import client_pool
 
 log = get_logger(__name__)
 
@@ -27,14 +30,13 @@ class Element(object):
         # Property data
         self._data = {}
 
+        # True while _data is the Result's dict; it's copied on first write.
+        self._data_shared = False
+
         # Result object.
         self._result = None
 
-        # Vertex Proxy Object
-        self._vertices = None
-
-        # Edge Proxy Object
-        self._edges = None
+        # Vertex and Edge Proxy Objects are created lazily, see _vertices.
 
         # Initialized Flag
         # Initialize all non-database properties here because when _initialized
@@ -54,18 +56,46 @@ class Element(object):
         """
         self._result = result
 
-        # TODO: Do we really need to make a copy?
-        self._data = result.get_data().copy() 
+        # Share the Result's data instead of copying it; __setattr__ makes 
+        # a private copy the first time a data property is set.
+        self._data = result.get_data()
+        self._data_shared = True
 
         # Sets the element ID to the var defined in Config. Defaults to eid.
         self._set_pretty_id(self._client)
 
-        # These vertex and edge proxies are primarily used for gets; 
-        # all mutable methods that use these are overloaded in Model.
-        self._vertices = VertexProxy(Vertex,self._client)
-        self._edges = EdgeProxy(Edge,self._client)
+    @property
+    def _vertices(self):
+        """
+        Returns the element's Vertex proxy, creating it on first use.
+
+        :rtype: VertexProxy
+
+        .. note:: These vertex and edge proxies are primarily used for gets; 
+                  all mutable methods that use these are overloaded in Model.
+
+        """
+        # Use __dict__ directly; __getattr__/__setattr__ are overloaded.
+        proxy = self.__dict__.get("_vertex_proxy")
+        if proxy is None:
+            proxy = VertexProxy(Vertex, self._client)
+            self.__dict__["_vertex_proxy"] = proxy
+        return proxy
+
+    @property
+    def _edges(self):
+        """
+        Returns the element's Edge proxy, creating it on first use.
+
+        :rtype: EdgeProxy
+
+        """
+        proxy = self.__dict__.get("_edge_proxy")
+        if proxy is None:
+            proxy = EdgeProxy(Edge, self._client)
+            self.__dict__["_edge_proxy"] = proxy
+        return proxy
 
-       
     @classmethod
     def get_base_type(cls):
         """
@@ -158,9 +188,11 @@ class Element(object):
                   those when you define the Models.
 
         """
+        # The _id property is shared, so only install it once per id_var.
         pretty_var = client.config.id_var
-        fget = lambda self: self._result.get_id()
-        setattr(Element, pretty_var, property(fget))                    
+        id_property = Element.__dict__['_id']
+        if Element.__dict__.get(pretty_var) is not id_property:
+            setattr(Element, pretty_var, id_property)
 
     def __setattr__(self, key, value):
         """
@@ -189,7 +221,12 @@ class Element(object):
             object.__setattr__(self, key, value)
         else:
             # set the attribute as a data property
-            self._data[key] = value
+            data = dict_["_data"]
+            if dict_.get("_data_shared") is True:
+                # copy on write so the Result's data isn't changed
+                data = dict_["_data"] = data.copy()
+                dict_["_data_shared"] = False
+            data[key] = value
 
     def __getattr__(self, name):
         """
@@ -289,10 +326,9 @@ class Element(object):
     def __setstate__(self, state):
         config = state['_config']
         client_class = state['_client_class']
-        client = client_class(config)
+        # Attach to a shared client rather than building one per element.
+        client = client_pool.get(client_class, config)
         state['_client'] = client
-        state['_vertices'] = VertexProxy(Vertex, client)
-        state['_edges'] = EdgeProxy(Edge, client)
         del state['_client_class']
         del state['_config']
         self.__dict__ = state
@@ -302,8 +338,8 @@ class Element(object):
         state['_config'] = self._client.config
         state['_client_class'] = self._client.__class__
         del state['_client']
-        del state['_vertices']
-        del state['_edges']
+        state.pop('_vertex_proxy', None)
+        state.pop('_edge_proxy', None)
         return state
         
     def get(self, name, default_value=None):
@@ -330,6 +366,10 @@ class Element(object):
         :rtype: dict
 
         """
+        if self._data_shared:
+            # Callers may change the dict, so stop sharing the Result's.
+            self._data = self._data.copy()
+            self._data_shared = False
         return self._data
 
     def map(self):
@@ -463,6 +503,46 @@ class Vertex(Element):
         resp = self._client.bothE(self._id, label, start, limit)
         return initialize_elements(self._client,resp)
 
+    def neighbourhood(self, depth=2, labels=None, direction="both", max_nodes=None):
+        """
+        Returns the vertices and edges within depth hops of this vertex,
+        fetched in one request.
+
+        :param depth: Number of hops from the vertex. Defaults to 2.
+        :type depth: int
+
+        :param labels: Optional edge label(s) to follow. Defaults to None (all).
+        :type labels: str, list, or None
+
+        :param direction: Edge direction: "out", "in", or "both". 
+            Defaults to "both".
+        :type direction: str
+
+        :param max_nodes: Optional maximum number of vertices. 
+        :type max_nodes: int or None
+
+        :rtype: Subgraph
+
+        """
+        # Imported here because the subgraph module imports this one.
+        from .subgraph import Subgraph
+        if isinstance(labels, six.string_types):
+            labels = [labels]
+        resp = self._client.neighbourhood(self._id, depth, labels, direction, max_nodes)
+        return Subgraph(initialize_elements(self._client, resp))
+
+    def traverse(self):
+        """
+        Returns a Traversal that starts at this vertex and compiles to a 
+        single Gremlin script.
+
+        :rtype: Traversal
+
+        """
+        # Imported here because the traversal module imports this one.
+        from .traversal import Traversal
+        return Traversal(self._client, self)
+
     def outV(self, label=None, start=None, limit=None):
         """
         Returns the out-adjacent vertices.
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Columnar frames of query results, with one typed array per column.
+
+"""
+from array import array
+
+from .property import Integer, Long, Float, Bool, String
+from .utils import get_logger
+
+try:
+    import numpy
+except ImportError:
+    # NumPy is optional; columns are array.array objects without it.
+    numpy = None
+
+log = get_logger(__name__)
+
+# array.array only has the 64-bit "q" typecode on Python 3.3+.
+try:
+    INTEGER_TYPECODE = array("q").typecode
+except ValueError:
+    INTEGER_TYPECODE = "l"
+
+#: Maps Property classes to array typecodes.
+TYPECODES = {Integer: INTEGER_TYPECODE, Long: INTEGER_TYPECODE, Float: "d", Bool: "B"}
+
+#: NumPy dtypes for the array typecodes; bools are stored as bytes.
+DTYPES = {INTEGER_TYPECODE: INTEGER_TYPECODE, "d": "d", "B": "?"}
+
+
+class Frame(object):
+    """
+    Query results stored by column, one typed array per column.
+
+    Integer, Long, Float, and Bool columns are NumPy arrays when NumPy is
+    installed and array.array objects otherwise. String columns are
+    DictionaryColumns, and everything else is a list.
+
+    :param columns: Column names, in order.
+    :type columns: list
+
+    :param data: Dict of columns keyed by name.
+    :type data: dict
+
+    Example:
+
+    >>> from bulbs.neo4jserver import Graph
+    >>> from bulbs.property import Integer
+    >>> g = Graph()
+    >>> query = "START n=node(*) RETURN n.name?, n.age?"
+    >>> frame = g.cypher.table(query, columnar=True, types={"n.age?": Integer()})
+    >>> frame["n.age?"].mean()
+
+    """
+    def __init__(self, columns, data):
+        self.columns = list(columns)
+        self.data = data
+
+    def __len__(self):
+        if not self.columns:
+            return 0
+        return len(self.data[self.columns[0]])
+
+    def __getitem__(self, column):
+        return self.data[column]
+
+    def __contains__(self, column):
+        return column in self.data
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def to_dict(self):
+        """
+        Returns a dict of the columns as lists, keyed by name.
+
+        :rtype: dict
+
+        """
+        return dict((column, list(self.data[column])) for column in self.columns)
+
+    def to_pandas(self):
+        """
+        Returns the frame as a pandas DataFrame, with String columns as
+        Categoricals.
+
+        :rtype: pandas.DataFrame
+
+        """
+        import pandas
+        data = dict()
+        for column in self.columns:
+            values = self.data[column]
+            if isinstance(values, DictionaryColumn):
+                values = pandas.Categorical.from_codes(values.codes, values.categories)
+            data[column] = values
+        return pandas.DataFrame(data, columns=self.columns)
+
+
+class DictionaryColumn(object):
+    """
+    A dictionary-encoded string column: each distinct string is stored
+    once in categories, and codes holds each row's index into it, or -1
+    for null.
+
+    :ivar codes: Array of codes, one per row.
+    :ivar categories: List of the distinct strings.
+
+    """
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        code = self.codes[index]
+        return self.categories[code] if code >= 0 else None
+
+    def __iter__(self):
+        categories = self.categories
+        for code in self.codes:
+            yield categories[code] if code >= 0 else None
+
+
+class ColumnBuilder(object):
+    """
+    Appends a column's values one at a time to a typed array.
+
+    :param prop: Optional Property object defining the column's type. If
+        it's None, the type is inferred from the first non-null value.
+    :type prop: Property
+
+    :param type_system: TypeSystem object used to convert the values with
+        the Property's python converter.
+    :type type_system: TypeSystem
+
+    """
+    def __init__(self, prop=None, type_system=None):
+        self.convert = None
+        self.kind = None
+        self.values = None
+        self.nulls = 0
+        if prop is not None:
+            if type_system is not None:
+                self.convert = prop.get_python_converter(type_system)
+            self._set_kind(type(prop))
+
+    def append(self, value):
+        """Converts and appends a value to the column."""
+        if self.convert is not None:
+            value = self.convert(value)
+        if self.kind is None:
+            if value is None:
+                self.nulls += 1
+                return
+            self._set_kind(self._infer_property(value))
+        self._append(value)
+
+    def build(self):
+        """
+        Returns the finished column.
+
+        :rtype: numpy.ndarray, array.array, DictionaryColumn, or list
+
+        """
+        if self.kind is None:
+            return [None] * self.nulls
+        if self.kind == "string":
+            return DictionaryColumn(self.values, self.categories)
+        if self.kind == "object":
+            return self.values
+        if numpy is not None:
+            # frombuffer shares the array's memory instead of copying it.
+            return numpy.frombuffer(self.values, dtype=DTYPES[self.values.typecode])
+        return self.values
+
+    def _infer_property(self, value):
+        if isinstance(value, bool):
+            return Bool
+        if isinstance(value, (int, Long.python_type)):
+            return Integer
+        if isinstance(value, float):
+            return Float
+        if isinstance(value, (String.python_type, str)):
+            return String
+        return None
+
+    def _set_kind(self, property_class):
+        typecode = TYPECODES.get(property_class)
+        if typecode is not None:
+            self.kind = "number"
+            self.values = array(typecode)
+        elif property_class is String:
+            self.kind = "string"
+            self.values = array(INTEGER_TYPECODE)
+            self.categories = []
+            self.category_codes = dict()
+        else:
+            self.kind = "object"
+            self.values = []
+        # Nulls seen before the type was known.
+        for i in range(self.nulls):
+            self._append(None)
+
+    def _append(self, value):
+        if self.kind == "string":
+            if value is None:
+                code = -1
+            else:
+                code = self.category_codes.get(value)
+                if code is None:
+                    code = self.category_codes[value] = len(self.categories)
+                    self.categories.append(value)
+            self.values.append(code)
+        elif self.kind == "number":
+            try:
+                self.values.append(value)
+            except (TypeError, OverflowError):
+                self._widen(value)
+        else:
+            self.values.append(value)
+
+    def _widen(self, value):
+        # A null or float in an integer column makes it a float column
+        # (nulls are NaN); anything else makes it an object column.
+        typecode = self.values.typecode
+        if typecode == "d" and value is None:
+            self.values.append(float("nan"))
+        elif typecode == INTEGER_TYPECODE and (value is None or isinstance(value, float)):
+            self.values = array("d", self.values)
+            self.values.append(float("nan") if value is None else value)
+        else:
+            log.debug("Storing column with %r as objects", value)
+            values = list(self.values)
+            if typecode == "B":
+                values = [bool(item) for item in values]
+            self.kind = "object"
+            self.values = values + [value]
+
+
+def build_frame(columns, rows, types=None, type_system=None):
+    """
+    Decodes rows straight into a columnar Frame.
+
+    :param columns: Column names, in order.
+    :type columns: list
+
+    :param rows: Iterable of rows, each a list of values in column order.
+        It's only iterated once, so it can be a stream.
+    :type rows: iterable
+
+    :param types: Optional dict of Property objects keyed by column name,
+        e.g. dict(age=Integer()). Other columns' types are inferred.
+    :type types: dict
+
+    :param type_system: TypeSystem object used to convert values in the
+        typed columns. If it's None, values aren't converted.
+    :type type_system: TypeSystem
+
+    :rtype: Frame
+
+    """
+    types = types or {}
+    builders = [ColumnBuilder(types.get(column), type_system) for column in columns]
+    appends = [builder.append for builder in builders]
+    for row in rows:
+        for append, value in zip(appends, row):
+            append(value)
+    data = dict((column, builder.build()) for column, builder in zip(columns, builders))
+    return Frame(columns, data)
@@ -25,6 +25,24 @@ def get_edges() {
   g.getEdges()
 }
 
+// Elements and index lookups as scripts, so they can be batched by Multi
+
+def get_vertex(_id) {
+  g.v(_id)
+}
+
+def get_edge(_id) {
+  g.e(_id)
+}
+
+def lookup_vertex(index_name, key, value) {
+  g.idx(index_name).get(key, value)
+}
+
+def lookup_edge(index_name, key, value) {
+  g.idx(index_name).get(key, value)
+}
+
 // Vertices
 
 // These edge-label conditionals are a messy hack until Gremin allows null labels. 
@@ -105,6 +123,43 @@ def bothV(_id, label, start, limit) {
   return pipe
 }
 
+// Returns the deduplicated vertices and edges within depth hops of the 
+// vertex as one list: the vertices first, then the edges. direction is 
+// "out", "in" or "both"; labels and max_nodes are optional (null). Edges 
+// are only included when both of their vertices are.
+def neighbourhood(_id, depth, labels, direction, max_nodes) {
+  start = g.v(_id)
+  labelArray = (labels == null) ? new String[0] : (labels as String[])
+  vertices = new LinkedHashMap()
+  edges = new LinkedHashMap()
+  vertices.put(start.id, start)
+  frontier = [start]
+  for (hop = 0; hop < depth && !frontier.isEmpty(); hop++) {
+    next = []
+    for (vertex in frontier) {
+      pairs = []
+      if (direction != "in")
+        pairs.addAll(vertex.getOutEdges(labelArray).collect{ [it, it.getInVertex()] })
+      if (direction != "out")
+        pairs.addAll(vertex.getInEdges(labelArray).collect{ [it, it.getOutVertex()] })
+      for (pair in pairs) {
+        other = pair[1]
+        if (!vertices.containsKey(other.id)) {
+          if (max_nodes != null && vertices.size() >= max_nodes) continue;
+          vertices.put(other.id, other)
+          next.add(other)
+        }
+        edges.put(pair[0].id, pair[0])
+      }
+    }
+    frontier = next
+  }
+  results = []
+  results.addAll(vertices.values())
+  results.addAll(edges.values())
+  return results
+}
+
 // Neo4j requires you delete all adjacent edges first. 
 // Blueprints' removeVertex() method does that; the Neo4jServer DELETE URI does not.
 def delete_vertex(_id) {
@@ -112,6 +167,58 @@ def delete_vertex(_id) {
   g.removeVertex(vertex)
 }
 
+// Partial updates for backends with automatic key indices (e.g. Titan).
+// Only touches the keys in data; a null value removes the property.
+def patch_vertex(_id, data) {
+  vertex = g.v(_id)
+  for (entry in data.entrySet()) {
+    if (entry.value == null)
+      vertex.removeProperty(entry.key)
+    else
+      vertex.setProperty(entry.key,entry.value)
+  }
+  return vertex
+}
+
+def patch_edge(_id, data) {
+  edge = g.e(_id)
+  for (entry in data.entrySet()) {
+    if (entry.value == null)
+      edge.removeProperty(entry.key)
+    else
+      edge.setProperty(entry.key,entry.value)
+  }
+  return edge
+}
+
+// Replaces the properties but only writes keys whose value changed, so the
+// automatic key indices aren't churned for unchanged values.
+def update_vertex_properties(_id, data) {
+  vertex = g.v(_id)
+  for (String key in vertex.getPropertyKeys().toList()) {
+    if (data.get(key) == null)
+      vertex.removeProperty(key)
+  }
+  for (entry in data.entrySet()) {
+    if (entry.value == null || vertex.getProperty(entry.key) == entry.value) continue;
+    vertex.setProperty(entry.key,entry.value)
+  }
+  return vertex
+}
+
+def update_edge_properties(_id, data) {
+  edge = g.e(_id)
+  for (String key in edge.getPropertyKeys().toList()) {
+    if (data.get(key) == null)
+      edge.removeProperty(key)
+  }
+  for (entry in data.entrySet()) {
+    if (entry.value == null || edge.getProperty(entry.key) == entry.value) continue;
+    edge.setProperty(entry.key,entry.value)
+  }
+  return edge
+}
+
 // Indices
 
 def index_count(index_name, key, value) {
@@ -7,6 +7,9 @@
 An interface for executing Gremlin scripts on the client.
 
 """
+import inspect
+
+from .frame import build_frame
 from .utils import initialize_elements, get_one_result
 
 
@@ -80,4 +83,53 @@ class Gremlin(object):
 
         """
         return self.client.gremlin(script, params)
-        
+
+    def table(self, script, params=None, columnar=False, types=None):
+        """
+        Returns the columns and rows from a Gremlin script that returns a
+        list of maps or lists, e.g. g.V.map(), or a columnar Frame.
+
+        :param script: Gremlin script to execute on the client.
+        :type script: str
+ 
+        :param params: Optional paramaters to bind to the Gremlin script. 
+        :type params: dict or None
+
+        :param columnar: Return a Frame with one typed array per column.
+        :type columnar: bool
+
+        :param types: Optional dict of Property objects keyed by column, 
+            used to convert and type the Frame's columns.
+        :type types: dict
+
+        :rtype: tuple of (columns, rows), or Frame if columnar is True
+
+        .. note:: The columns are the first map's keys, or the positions 
+                  as strings if the script returns lists.
+
+        """
+        resp = self.client.gremlin(script, params)
+        raw_rows = [result.raw for result in self._get_results(resp)]
+        columns = self._get_columns(raw_rows)
+        if raw_rows and isinstance(raw_rows[0], dict):
+            rows = ([raw.get(column) for column in columns] for raw in raw_rows)
+        else:
+            rows = iter(raw_rows)
+        if columnar:
+            return build_frame(columns, rows, types, self.client.type_system)
+        return columns, list(rows)
+
+    def _get_results(self, resp):
+        if resp.total_size == 0:
+            return []
+        if inspect.isgenerator(resp.results):
+            return resp.results
+        return [resp.results]
+
+    def _get_columns(self, raw_rows):
+        if not raw_rows:
+            return []
+        first = raw_rows[0]
+        if isinstance(first, dict):
+            return list(first)
+        return [str(position) for position in range(len(first))]
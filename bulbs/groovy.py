@@ -40,6 +40,9 @@ class GroovyScripts(object):
         # methods format: methods[method_name] = method_body
         self.methods = dict()
 
+        # reverse index of methods, built by get_name() when needed
+        self._names = None
+
         if file_path is None:
             file_path = self._get_default_file()
         self.update(file_path)
@@ -58,6 +61,21 @@ class GroovyScripts(object):
         #script = self._build_script(method_definition, method_signature)
         #return script
 
+    def get_name(self, script):
+        """
+        Returns the method name of a Groovy script, or None if the script 
+        isn't in the index.
+
+        :param script: Groovy script, as returned by get().
+        :type script: str
+
+        :rtype: str or None
+
+        """
+        if self._names is None:
+            self._names = dict((body, name) for name, body in self.methods.items())
+        return self._names.get(script)
+
     def update(self, file_path):
         """
         Updates the script index with the Groovy methods in the script file.
@@ -69,6 +87,7 @@ class GroovyScripts(object):
         methods = self._get_methods(file_path)
         self._add_source_file(file_path)
         self.methods.update(methods)
+        self._names = None
 
     def refresh(self):
         """
@@ -80,6 +99,7 @@ class GroovyScripts(object):
         for file_path in self.source_files:
             methods = self._get_methods(file_path)
             self.methods.update(methods)
+        self._names = None
 
     def _add_source_file(self,file_path):
         # order matters (last in takes precedence if it overrides a method)
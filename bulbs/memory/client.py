@@ -0,0 +1,1170 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Bulbs supports pluggable clients. This is the in-memory client.
+
+"""
+from bulbs.config import Config
+from bulbs.registry import Registry
+from bulbs.utils import get_logger, coerce_id
+
+# specific to this client
+from bulbs.json import JSONTypeSystem
+from bulbs.base import Client, Response, Result
+from bulbs.base.client import Request
+
+from .store import MemoryGraph, MemoryElement, MemoryIndex
+
+
+# The default URI, used to build element URIs
+MEMORY_URI = "memory://localhost/graph"
+
+# The logger defined in Config
+log = get_logger(__name__)
+
+
+class MemoryResult(Result):
+    """
+    Container class for a single result, not a list of results.
+
+    :param result: The element or index in the store.
+    :type result: MemoryElement or MemoryIndex
+
+    :param config: The client Config object.
+    :type config: Config
+
+    :ivar raw: The element or index in the store.
+    :ivar data: A copy of the element's properties, or the index info.
+
+    """
+    __slots__ = ()
+
+    def __init__(self, result, config):
+        self.config = config
+
+        # The raw result.
+        self.raw = result
+
+        # Copied so changes to the element don't write through to the store.
+        if isinstance(result, MemoryIndex):
+            self.data = result.to_json()
+        else:
+            self.data = dict(result.data)
+
+    def get_id(self):
+        """
+        Returns the element ID.
+
+        :rtype: int
+
+        """
+        return coerce_id(self.raw._id)
+
+    def get_type(self):
+        """
+        Returns the element's base type, either "vertex" or "edge".
+
+        :rtype: str
+
+        """
+        return self.raw._type
+
+    def get_data(self):
+        """
+        Returns the element's property data.
+
+        :rtype: dict
+
+        """
+        return self.data
+
+    def get_uri(self):
+        """
+        Returns the element URI.
+
+        :rtype: str
+
+        """
+        path_map = dict(vertex="vertices", edge="edges")
+        return "%s/%s/%s" % (self.config.root_uri.rstrip("/"), path_map[self.raw._type],
+                             self.raw._id)
+
+    def get_outV(self):
+        """
+        Returns the ID of the edge's outgoing vertex (start node).
+
+        :rtype: int
+
+        """
+        return coerce_id(self.raw._outV)
+
+    def get_inV(self):
+        """
+        Returns the ID of the edge's incoming vertex (end node).
+
+        :rtype: int
+
+        """
+        return coerce_id(self.raw._inV)
+
+    def get_label(self):
+        """
+        Returns the edge label (relationship type).
+
+        :rtype: str
+
+        """
+        return self.raw._label
+
+    def get_index_name(self):
+        """
+        Returns the index name.
+
+        :rtype: str
+
+        """
+        return self.data['name']
+
+    def get_index_class(self):
+        """
+        Returns the index class, either "vertex" or "edge".
+
+        :rtype: str
+
+        """
+        return self.data['class']
+
+    def get(self, attribute):
+        """
+        Returns the value of a client-specific attribute.
+
+        :param attribute: Name of the attribute.
+        :type attribute: str
+
+        :rtype: str
+
+        """
+        return self.data[attribute]
+
+
+class MemoryResponse(Response):
+    """
+    Container class for the store's response.
+
+    :param response: An element, index, list of elements, or other value.
+    :type response: object
+
+    :param config: Config object.
+    :type config: bulbs.config.Config
+
+    :ivar config: Config object.
+    :ivar headers: Always an empty dict.
+    :ivar content: The response as it came from the store.
+    :ivar results: A generator of MemoryResult objects, a single MemoryResult
+        object, or None, depending on the number of results returned.
+    :ivar total_size: The number of results returned.
+    :ivar raw: Always None.
+
+    """
+    result_class = MemoryResult
+
+    def __init__(self, response, config):
+        self.config = config
+        self.headers = dict()
+        self.content = response
+        self.results, self.total_size = self.get_results()
+        self.raw = None
+
+    def handle_response(self, response):
+        pass
+
+    def get_headers(self, response):
+        return dict()
+
+    def get_content(self, response):
+        return response
+
+    def get_results(self):
+        """
+        Returns the results contained in the response.
+
+        :return:  A tuple containing two items: 1. Either a generator of MemoryResult objects,
+                  a single MemoryResult object, or None, depending on the number of results
+                  returned; 2. An int representing the number results returned.
+        :rtype: tuple
+
+        """
+        content = self.content
+        if type(content) == list:
+            results = (self.result_class(result, self.config) for result in content)
+            total_size = len(content)
+        elif isinstance(content, (MemoryElement, MemoryIndex)):
+            results = self.result_class(content, self.config)
+            total_size = 1
+        else:
+            results = None
+            total_size = 0
+        return results, total_size
+
+
+class MemoryRequest(Request):
+    """There are no requests; this only holds the Config."""
+
+    response_class = MemoryResponse
+
+
+class MemoryClient(Client):
+    """
+    Low-level client that keeps the graph in memory, in Python dicts and
+    adjacency lists, with manual indices. There's no HTTP and no Gremlin;
+    the methods the other clients implement with Gremlin scripts are
+    implemented natively, with the same semantics.
+
+    Data is converted with the JSONTypeSystem, like the server clients, so
+    Models round trip the same way they do with a real database.
+
+    :param config: Optional Config object. Defaults to default Config.
+    :type config: bulbs.config.Config
+
+    :param graph: Optional MemoryGraph store, so several clients can share
+        one. Defaults to a new, empty store.
+    :type graph: MemoryGraph
+
+    :cvar default_uri: Default URI for the database.
+    :cvar request_class: Request class for the Client.
+
+    :ivar config: Config object.
+    :ivar registry: Registry object.
+    :ivar type_system: JSONTypeSystem object.
+    :ivar request: MemoryRequest object.
+    :ivar graph: MemoryGraph store.
+
+    Example:
+
+    >>> from bulbs.memory import MemoryClient
+    >>> client = MemoryClient()
+    >>> response = client.create_vertex(dict(name="James"))
+    >>> result = response.results
+
+    """
+    #: Default URI for the database.
+    default_uri = MEMORY_URI
+
+    #: Request class for the Client.
+    request_class = MemoryRequest
+
+    def __init__(self, config=None, graph=None):
+        self.config = config or Config(self.default_uri)
+        self.registry = Registry(self.config)
+        self.type_system = JSONTypeSystem()
+        self.request = self.request_class(self.config, self.type_system.content_type)
+        self.graph = graph if graph is not None else MemoryGraph()
+
+    def gremlin(self, script, params=None):
+        """
+        Not supported: the memory client doesn't run Gremlin scripts.
+
+        :raises: NotImplementedError
+
+        """
+        raise NotImplementedError("The memory client doesn't run Gremlin scripts")
+
+    # Vertex Proxy
+
+    def create_vertex(self, data):
+        """
+        Creates a vertex and returns the Response.
+
+        :param data: Property data.
+        :type data: dict
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self.graph.add_vertex(data))
+
+    def get_vertex(self, _id):
+        """
+        Gets the vertex with the _id and returns the Response.
+
+        :param data: Vertex ID.
+        :type data: int
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self._get_vertex(_id))
+
+    def get_all_vertices(self):
+        """
+        Returns a Response containing all the vertices in the Graph.
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(list(self.graph.vertices.values()))
+
+    def update_vertex(self, _id, data):
+        """
+        Replaces the vertex's properties and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Property data.
+        :type data: dict
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self.graph.update_properties(self._get_vertex(_id), data))
+
+    def delete_vertex(self, _id):
+        """
+        Deletes a vertex with the _id and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :rtype: MemoryResponse
+
+        """
+        self._get_vertex(_id)
+        self.graph.remove_vertex(_id)
+        return self._respond(None)
+
+    def remove_vertex_properties(self, _id):
+        """
+        Removes all the vertex's properties and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self.graph.update_properties(self._get_vertex(_id), None))
+
+    # Edge Proxy
+
+    def create_edge(self, outV, label, inV, data=None):
+        """
+        Creates a edge and returns the Response.
+
+        :param outV: Outgoing vertex ID.
+        :type outV: int
+
+        :param label: Edge label.
+        :type label: str
+
+        :param inV: Incoming vertex ID.
+        :type inV: int
+
+        :param data: Property data.
+        :type data: dict or None
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self.graph.add_edge(outV, label, inV, data))
+
+    def get_edge(self, _id):
+        """
+        Gets the edge with the _id and returns the Response.
+
+        :param data: Edge ID.
+        :type data: int
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self._get_edge(_id))
+
+    def get_all_edges(self):
+        """
+        Returns a Response containing all the edges in the Graph.
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(list(self.graph.edges.values()))
+
+    def update_edge(self, _id, data):
+        """
+        Replaces the edge's properties and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Property data.
+        :type data: dict
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self.graph.update_properties(self._get_edge(_id), data))
+
+    def delete_edge(self, _id):
+        """
+        Deletes a edge with the _id and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :rtype: MemoryResponse
+
+        """
+        self._get_edge(_id)
+        self.graph.remove_edge(_id)
+        return self._respond(None)
+
+    def remove_edge_properties(self, _id):
+        """
+        Removes all the edge's properties and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self.graph.update_properties(self._get_edge(_id), None))
+
+    # Vertex Container
+
+    def outE(self, _id, label=None, start=None, limit=None):
+        """
+        Returns the outgoing edges of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param label: Optional edge label.
+        :type label: str
+
+        :param start: Optional offset of the first edge.
+        :type start: int
+
+        :param limit: Optional maximum number of edges.
+        :type limit: int
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond_range(self.graph.get_edges(_id, "out", _labels(label)),
+                                   start, limit)
+
+    def inE(self, _id, label=None, start=None, limit=None):
+        """
+        Returns the incoming edges of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param label: Optional edge label.
+        :type label: str
+
+        :param start: Optional offset of the first edge.
+        :type start: int
+
+        :param limit: Optional maximum number of edges.
+        :type limit: int
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond_range(self.graph.get_edges(_id, "in", _labels(label)),
+                                   start, limit)
+
+    def bothE(self, _id, label=None, start=None, limit=None):
+        """
+        Returns the incoming and outgoing edges of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param label: Optional edge label.
+        :type label: str
+
+        :param start: Optional offset of the first edge.
+        :type start: int
+
+        :param limit: Optional maximum number of edges.
+        :type limit: int
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond_range(self.graph.get_edges(_id, "both", _labels(label)),
+                                   start, limit)
+
+    def outV(self, _id, label=None, start=None, limit=None):
+        """
+        Returns the out-adjacent vertices of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param label: Optional edge label.
+        :type label: str
+
+        :param start: Optional offset of the first vertex.
+        :type start: int
+
+        :param limit: Optional maximum number of vertices.
+        :type limit: int
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond_range(self.graph.get_adjacent(_id, "out", _labels(label)),
+                                   start, limit)
+
+    def inV(self, _id, label=None, start=None, limit=None):
+        """
+        Returns the in-adjacent vertices of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param label: Optional edge label.
+        :type label: str
+
+        :param start: Optional offset of the first vertex.
+        :type start: int
+
+        :param limit: Optional maximum number of vertices.
+        :type limit: int
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond_range(self.graph.get_adjacent(_id, "in", _labels(label)),
+                                   start, limit)
+
+    def bothV(self, _id, label=None, start=None, limit=None):
+        """
+        Returns the incoming- and outgoing-adjacent vertices of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param label: Optional edge label.
+        :type label: str
+
+        :param start: Optional offset of the first vertex.
+        :type start: int
+
+        :param limit: Optional maximum number of vertices.
+        :type limit: int
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond_range(self.graph.get_adjacent(_id, "both", _labels(label)),
+                                   start, limit)
+
+    def neighbourhood(self, _id, depth, labels=None, direction="both", max_nodes=None):
+        """
+        Returns the vertices and edges within depth hops of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param depth: Number of hops.
+        :type depth: int
+
+        :param labels: Optional list of edge labels to follow.
+        :type labels: list
+
+        :param direction: "out", "in", or "both". Defaults to "both".
+        :type direction: str
+
+        :param max_nodes: Optional maximum number of vertices.
+        :type max_nodes: int
+
+        :rtype: MemoryResponse
+
+        """
+        elements = self.graph.get_neighbourhood(_id, depth, labels, direction, max_nodes)
+        return self._respond(elements)
+
+    # Index Proxy
+
+    def get_all_indices(self):
+        """
+        Returns a Response containing all the indices.
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(list(self.graph.indices.values()))
+
+    def get_index(self, name):
+        """
+        Returns a Response containing the index, or no results.
+
+        :param name: Index name.
+        :type name: str
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self.graph.get_index(name))
+
+    def delete_index(self, name):
+        """
+        Deletes the index and returns the Response.
+
+        :param name: Index name.
+        :type name: str
+
+        :rtype: MemoryResponse
+
+        """
+        self._get_index(name)
+        self.graph.remove_index(name)
+        return self._respond(None)
+
+    # Index Proxy - Vertex
+
+    def create_vertex_index(self, index_name, *args, **kwds):
+        """
+        Creates a vertex index and returns the Response.
+
+        :param index_name: Index name.
+        :type index_name: str
+
+        :rtype: MemoryResponse
+
+        """
+        return self._create_index(index_name, "vertex", kwds)
+
+    def get_vertex_index(self, index_name):
+        """
+        Returns a Response containing the vertex index, or no results.
+
+        :param index_name: Index name.
+        :type index_name: str
+
+        :rtype: MemoryResponse
+
+        """
+        return self.get_index(index_name)
+
+    def get_or_create_vertex_index(self, index_name, index_params=None):
+        """
+        Returns a Response containing the vertex index, creating it if needed.
+
+        :param index_name: Index name.
+        :type index_name: str
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self.graph.get_or_create_index(index_name, "vertex"))
+
+    def delete_vertex_index(self, name):
+        """
+        Deletes the vertex index and returns the Response.
+
+        :param name: Index name.
+        :type name: str
+
+        :rtype: MemoryResponse
+
+        """
+        return self.delete_index(name)
+
+    # Index Proxy - Edge
+
+    def create_edge_index(self, name, *args, **kwds):
+        """
+        Creates an edge index and returns the Response.
+
+        :param name: Index name.
+        :type name: str
+
+        :rtype: MemoryResponse
+
+        """
+        return self._create_index(name, "edge", kwds)
+
+    def get_edge_index(self, name):
+        """
+        Returns a Response containing the edge index, or no results.
+
+        :param name: Index name.
+        :type name: str
+
+        :rtype: MemoryResponse
+
+        """
+        return self.get_index(name)
+
+    def get_or_create_edge_index(self, index_name, index_params=None):
+        """
+        Returns a Response containing the edge index, creating it if needed.
+
+        :param index_name: Index name.
+        :type index_name: str
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self.graph.get_or_create_index(index_name, "edge"))
+
+    def delete_edge_index(self, name):
+        """
+        Deletes the edge index and returns the Response.
+
+        :param name: Index name.
+        :type name: str
+
+        :rtype: MemoryResponse
+
+        """
+        return self.delete_index(name)
+
+    # Index Container - General
+
+    def index_count(self, index_name, key, value):
+        """
+        Returns a Response whose content's totalSize is the number of
+        elements at the key/value pair.
+
+        :rtype: MemoryResponse
+
+        """
+        count = self._get_index(index_name).count(key, value)
+        return self._respond(dict(totalSize=count))
+
+    def index_keys(self, index_name):
+        """
+        Returns a Response whose content is the list of the index's keys.
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(dict(results=self._get_index(index_name).keys()))
+
+    # Index Container - Vertex
+
+    def put_vertex(self, index_name, key, value, _id):
+        """
+        Adds a vertex to the index with the index_name.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Name of the key.
+        :type key: str
+
+        :param value: Value of the key.
+        :type value: str
+
+        :param _id: Vertex ID
+        :type _id: int
+
+        :rtype: MemoryResponse
+
+        """
+        vertex = self._get_vertex(_id)
+        self._get_index(index_name).put(key, value, vertex._id)
+        return self._respond(None)
+
+    def lookup_vertex(self, index_name, key, value):
+        """
+        Returns the vertices indexed with the key and value.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Name of the key.
+        :type key: str
+
+        :param value: Value of the key.
+        :type value: str
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self._lookup(index_name, key, value))
+
+    def remove_vertex(self, index_name, _id, key=None, value=None):
+        """
+        Removes a vertex from the index and returns the Response.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Optional. Name of the key.
+        :type key: str
+
+        :param value: Optional. Value of the key.
+        :type value: str
+
+        :rtype: MemoryResponse
+
+        """
+        self._get_index(index_name).remove(str(_id), key, value)
+        return self._respond(None)
+
+    # Index Container - Edge
+
+    def put_edge(self, index_name, key, value, _id):
+        """
+        Adds an edge to the index and returns the Response.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Name of the key.
+        :type key: str
+
+        :param value: Value of the key.
+        :type value: str
+
+        :param _id: Edge ID
+        :type _id: int
+
+        :rtype: MemoryResponse
+
+        """
+        edge = self._get_edge(_id)
+        self._get_index(index_name).put(key, value, edge._id)
+        return self._respond(None)
+
+    def lookup_edge(self, index_name, key, value):
+        """
+        Returns the edges indexed with the key and value.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Name of the key.
+        :type key: str
+
+        :param value: Value of the key.
+        :type value: str
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self._lookup(index_name, key, value))
+
+    def remove_edge(self, index_name, _id, key=None, value=None):
+        """
+        Removes an edge from the index and returns the Response.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param _id: Edge ID
+        :type _id: int
+
+        :param key: Optional. Name of the key.
+        :type key: str
+
+        :param value: Optional. Value of the key.
+        :type value: str
+
+        :rtype: MemoryResponse
+
+        """
+        self._get_index(index_name).remove(str(_id), key, value)
+        return self._respond(None)
+
+    # Model Proxy - Vertex
+
+    def create_indexed_vertex(self, data, index_name, keys=None):
+        """
+        Creates a vertex, indexes it, and returns the Response.
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: MemoryResponse
+
+        """
+        graph = self.graph
+        with graph.lock:
+            index = self._get_index(index_name)
+            vertex = graph.add_vertex(data)
+            graph.index_properties(vertex, index, keys)
+        return self._respond(vertex)
+
+    def update_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Replaces an indexed vertex's properties, only rewriting the index
+        entries for the changed keys, and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: MemoryResponse
+
+        """
+        index = self._get_index(index_name)
+        vertex = self.graph.update_properties(self._get_vertex(_id), data, index, keys)
+        return self._respond(vertex)
+
+    def patch_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Updates only the given properties of an indexed vertex, and only
+        their index entries, and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Changed property data. None values remove the property.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: MemoryResponse
+
+        """
+        index = self._get_index(index_name)
+        vertex = self.graph.patch_properties(self._get_vertex(_id), data, index, keys)
+        return self._respond(vertex)
+
+    # Model Proxy - Edge
+
+    def create_indexed_edge(self, outV, label, inV, data, index_name, keys=None):
+        """
+        Creates a edge, indexes it, and returns the Response.
+
+        :param outV: Outgoing vertex ID.
+        :type outV: int
+
+        :param label: Edge label.
+        :type label: str
+
+        :param inV: Incoming vertex ID.
+        :type inV: int
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: MemoryResponse
+
+        """
+        graph = self.graph
+        with graph.lock:
+            index = self._get_index(index_name)
+            edge = graph.add_edge(outV, label, inV, data)
+            graph.index_properties(edge, index, keys)
+            # Like the scripts, index the label so edges can be found by it.
+            index.put(self.config.label_var, label, edge._id)
+        return self._respond(edge)
+
+    def update_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Replaces an indexed edge's properties, only rewriting the index
+        entries for the changed keys, and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: MemoryResponse
+
+        """
+        index = self._get_index(index_name)
+        edge = self.graph.update_properties(self._get_edge(_id), data, index, keys)
+        return self._respond(edge)
+
+    def patch_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Updates only the given properties of an indexed edge, and only
+        their index entries, and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Changed property data. None values remove the property.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: MemoryResponse
+
+        """
+        index = self._get_index(index_name)
+        edge = self.graph.patch_properties(self._get_edge(_id), data, index, keys)
+        return self._respond(edge)
+
+    # Metadata
+
+    def set_metadata(self, key, value):
+        """
+        Sets the metadata key to the supplied value.
+
+        :param key: Metadata key
+        :type key: str
+
+        :param value: Metadata value.
+        :type value: str, int, or list
+
+        :rtype: MemoryResponse
+
+        """
+        self.graph.metadata[key] = value
+        return self._respond(None)
+
+    def get_metadata(self, key, default_value=None):
+        """
+        Returns a Response whose content is the metadata value for the key.
+
+        :param key: Metadata key
+        :type key: str
+
+        :param default_value: Default value to return if the key is not found.
+        :type default_value: str, int, or list
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(self.graph.metadata.get(key, default_value))
+
+    def remove_metadata(self, key):
+        """
+        Removes the metadata key and value.
+
+        :param key: Metadata key
+        :type key: str
+
+        :rtype: MemoryResponse
+
+        """
+        self.graph.metadata.pop(key, None)
+        return self._respond(None)
+
+    # Utils
+
+    def warm_cache(self):
+        """
+        Does nothing; everything is already in memory.
+
+        :rtype: MemoryResponse
+
+        """
+        return self._respond(None)
+
+    def clear(self):
+        """
+        Deletes all the elements, indices, and metadata.
+
+        :rtype: MemoryResponse
+
+        """
+        self.graph.clear()
+        return self._respond(None)
+
+    def multi_get_vertices(self, id_list):
+        """
+        Returns a Response containing the vertices with the IDs that exist.
+
+        :rtype: MemoryResponse
+
+        """
+        vertices = (self.graph.get_vertex(_id) for _id in id_list)
+        return self._respond([vertex for vertex in vertices if vertex is not None])
+
+    def multi_get_edges(self, id_list):
+        """
+        Returns a Response containing the edges with the IDs that exist.
+
+        :rtype: MemoryResponse
+
+        """
+        edges = (self.graph.get_edge(_id) for _id in id_list)
+        return self._respond([edge for edge in edges if edge is not None])
+
+    # Private
+
+    def _respond(self, content):
+        return self.request.response_class(content, self.config)
+
+    def _respond_range(self, elements, start, limit):
+        # Like the scripts' [start..start+limit-1] range.
+        if start is not None and limit is not None:
+            elements = elements[start:start + limit]
+        return self._respond(elements)
+
+    def _get_vertex(self, _id):
+        vertex = self.graph.get_vertex(_id)
+        if vertex is None:
+            raise LookupError("Vertex not found: %s" % _id)
+        return vertex
+
+    def _get_edge(self, _id):
+        edge = self.graph.get_edge(_id)
+        if edge is None:
+            raise LookupError("Edge not found: %s" % _id)
+        return edge
+
+    def _get_index(self, index_name):
+        index = self.graph.get_index(index_name)
+        if index is None:
+            raise LookupError("Index not found: %s" % index_name)
+        return index
+
+    def _create_index(self, index_name, index_class, kwds):
+        index_type = kwds.get('index_type', "manual")
+        try:
+            index = self.graph.create_index(index_name, index_class, index_type)
+        except ValueError:
+            # Like a 409 Conflict from the server.
+            raise SystemError("Index already exists: %s" % index_name)
+        return self._respond(index)
+
+    def _lookup(self, index_name, key, value):
+        index = self._get_index(index_name)
+        elements = self.graph.vertices if index.index_class == "vertex" else self.graph.edges
+        return [elements[_id] for _id in index.get(key, value) if _id in elements]
+
+
+def _labels(label):
+    return [label] if label is not None else None
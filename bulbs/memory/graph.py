@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Interface for interacting with a graph kept in memory.
+
+"""
+from bulbs.base.graph import Graph as BaseGraph
+
+# Memory-specific imports
+from .client import MemoryClient
+from .index import ManualIndex
+
+
+class Graph(BaseGraph):
+    """
+    An in-memory graph, for tests and prototyping without a database.
+
+    Instantiates the :class:`~bulbs.memory.client.MemoryClient` object using 
+    the specified Config and sets up proxy objects to the graph. There's no
+    Gremlin, so there's no gremlin attribute.
+
+    :param config: Optional. Defaults to the default config.
+    :type config: bulbs.config.Config
+
+    :cvar client_class: MemoryClient class.
+    :cvar default_index: Default index class.
+
+    :ivar client: MemoryClient object.
+    :ivar vertices: VertexProxy object.
+    :ivar edges: EdgeProxy object.
+    :ivar config: Config object.
+    
+    Example:
+
+    >>> from bulbs.memory import Graph
+    >>> g = Graph()
+    >>> james = g.vertices.create(name="James")
+    >>> julie = g.vertices.create(name="Julie")
+    >>> g.edges.create(james, "knows", julie)
+
+    """
+    client_class = MemoryClient
+    default_index = ManualIndex
+
+    def warm_cache(self):
+        """
+        Does nothing; everything is already in memory.
+
+        :rtype: MemoryResponse
+
+        """
+        return self.client.warm_cache()
+
+    def clear(self):
+        """
+        Deletes all the elements, indices, and metadata in the graph.
+
+        :rtype: MemoryResponse
+
+        """
+        return self.client.clear()
@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+In-memory property graph with manual indices, used by the memory backend
+and the fake server.
+
+"""
+import threading
+
+
+class MemoryElement(object):
+    """
+    A vertex or edge held in a MemoryGraph.
+
+    :ivar _id: Element ID, a string like TinkerGraph's IDs.
+    :ivar _type: "vertex" or "edge".
+    :ivar data: Dict of property data.
+
+    """
+    __slots__ = ("_id", "_type", "data", "_outV", "_inV", "_label")
+
+    def __init__(self, _id, _type, data, outV=None, inV=None, label=None):
+        self._id = _id
+        self._type = _type
+        self.data = data
+        self._outV = outV
+        self._inV = inV
+        self._label = label
+
+    def __getstate__(self):
+        # Slotted classes can't be pickled with protocols 0 and 1 otherwise.
+        return dict((key, getattr(self, key)) for key in self.__slots__)
+
+    def __setstate__(self, state):
+        for key in self.__slots__:
+            setattr(self, key, state[key])
+
+    def to_json(self):
+        """
+        Returns the element as Rexster represents it in JSON.
+
+        :rtype: dict
+
+        """
+        json_data = dict(self.data)
+        json_data.update(_id=self._id, _type=self._type)
+        if self._type == "edge":
+            json_data.update(_outV=self._outV, _inV=self._inV, _label=self._label)
+        return json_data
+
+
+class MemoryIndex(object):
+    """
+    A manual index that maps key/value pairs to element IDs.
+
+    Values are stored as strings, like the Gremlin scripts store them.
+
+    :param name: Index name.
+    :type name: str
+
+    :param index_class: "vertex" or "edge".
+    :type index_class: str
+
+    :param index_type: Index type. Defaults to "manual".
+    :type index_type: str
+
+    """
+    def __init__(self, name, index_class, index_type="manual"):
+        self.name = name
+        self.index_class = index_class
+        self.index_type = index_type
+        self.entries = dict()
+
+    def to_json(self):
+        """Returns the index as Rexster represents it in JSON."""
+        return {'name': self.name, 'class': self.index_class, 'type': self.index_type}
+
+    def put(self, key, value, _id):
+        """Adds the element ID at the key/value pair."""
+        ids = self.entries.setdefault(key, dict()).setdefault(to_index_value(value), [])
+        if _id not in ids:
+            ids.append(_id)
+
+    def get(self, key, value):
+        """Returns a list of the element IDs at the key/value pair."""
+        return list(self.entries.get(key, {}).get(to_index_value(value), []))
+
+    def count(self, key, value):
+        """Returns the number of element IDs at the key/value pair."""
+        return len(self.entries.get(key, {}).get(to_index_value(value), []))
+
+    def keys(self):
+        """Returns a list of the index's keys."""
+        return [key for key in self.entries if any(self.entries[key].values())]
+
+    def remove(self, _id, key=None, value=None):
+        """
+        Removes the element ID at the key/value pair, from every value of
+        the key if value is None, or from every key if key is None.
+
+        """
+        keys = [key] if key is not None else list(self.entries)
+        for key in keys:
+            values = self.entries.get(key, {})
+            targets = [to_index_value(value)] if value is not None else list(values)
+            for target in targets:
+                ids = values.get(target, [])
+                if _id in ids:
+                    ids.remove(_id)
+
+
+class MemoryGraph(object):
+    """
+    A thread-safe in-memory property graph with manual indices.
+
+    :ivar vertices: Dict of vertex MemoryElements keyed by ID.
+    :ivar edges: Dict of edge MemoryElements keyed by ID.
+    :ivar indices: Dict of MemoryIndex objects keyed by name.
+
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """Removes all the elements and indices."""
+        with self.lock:
+            self.vertices = dict()
+            self.edges = dict()
+            self.indices = dict()
+            self.out_edges = dict()
+            self.in_edges = dict()
+            self.metadata = dict()
+            self.last_id = 0
+
+    # Vertices
+
+    def add_vertex(self, data=None):
+        """Adds a vertex with the property data and returns it."""
+        with self.lock:
+            vertex = MemoryElement(self._next_id(), "vertex", clean_data(data))
+            self.vertices[vertex._id] = vertex
+            self.out_edges[vertex._id] = []
+            self.in_edges[vertex._id] = []
+            return vertex
+
+    def get_vertex(self, _id):
+        """Returns the vertex with the ID, or None."""
+        return self.vertices.get(to_id(_id))
+
+    def remove_vertex(self, _id):
+        """Removes the vertex, its edges, and its index entries."""
+        with self.lock:
+            _id = to_id(_id)
+            for edge_id in self.out_edges.get(_id, []) + self.in_edges.get(_id, []):
+                self.remove_edge(edge_id)
+            self._remove_from_indices("vertex", _id)
+            self.out_edges.pop(_id, None)
+            self.in_edges.pop(_id, None)
+            return self.vertices.pop(_id, None)
+
+    # Edges
+
+    def add_edge(self, outV, label, inV, data=None):
+        """Adds an edge between the vertices and returns it."""
+        with self.lock:
+            outV, inV = to_id(outV), to_id(inV)
+            if outV not in self.vertices or inV not in self.vertices:
+                raise LookupError("Edge vertex not found: %s -> %s" % (outV, inV))
+            edge = MemoryElement(self._next_id(), "edge", clean_data(data), outV, inV, label)
+            self.edges[edge._id] = edge
+            self.out_edges[outV].append(edge._id)
+            self.in_edges[inV].append(edge._id)
+            return edge
+
+    def get_edge(self, _id):
+        """Returns the edge with the ID, or None."""
+        return self.edges.get(to_id(_id))
+
+    def remove_edge(self, _id):
+        """Removes the edge and its index entries."""
+        with self.lock:
+            edge = self.edges.pop(to_id(_id), None)
+            if edge is not None:
+                self.out_edges[edge._outV].remove(edge._id)
+                self.in_edges[edge._inV].remove(edge._id)
+                self._remove_from_indices("edge", edge._id)
+            return edge
+
+    def get_edges(self, _id, direction, labels=None):
+        """
+        Returns the vertex's edges in the direction ("out", "in", or
+        "both"), optionally only those with one of the labels.
+
+        """
+        _id = to_id(_id)
+        edge_ids = []
+        if direction in ("out", "both"):
+            edge_ids.extend(self.out_edges.get(_id, []))
+        if direction in ("in", "both"):
+            edge_ids.extend(self.in_edges.get(_id, []))
+        edges = [self.edges[edge_id] for edge_id in edge_ids]
+        if labels:
+            edges = [edge for edge in edges if edge._label in labels]
+        return edges
+
+    def get_adjacent(self, _id, direction, labels=None):
+        """Returns the vertices adjacent to the vertex in the direction."""
+        _id = to_id(_id)
+        vertices = []
+        for edge in self.get_edges(_id, direction, labels):
+            if direction == "out" or (direction == "both" and edge._outV == _id):
+                vertices.append(self.vertices[edge._inV])
+            else:
+                vertices.append(self.vertices[edge._outV])
+        return vertices
+
+    def get_neighbourhood(self, _id, depth, labels=None, direction="both", max_nodes=None):
+        """
+        Returns the vertices and then the edges within depth hops of the
+        vertex, breadth first, following edges in the direction with one of
+        the labels, and stopping at max_nodes vertices.
+
+        """
+        start = self.vertices.get(to_id(_id))
+        if start is None:
+            raise LookupError("Vertex not found: %s" % _id)
+        vertices = {start._id: start}
+        order = [start]
+        edges = dict()
+        edge_order = []
+        frontier = [start]
+        for hop in range(depth):
+            if not frontier:
+                break
+            next_frontier = []
+            for vertex in frontier:
+                pairs = []
+                if direction != "in":
+                    pairs.extend((edge, edge._inV) for edge in
+                                 self.get_edges(vertex._id, "out", labels))
+                if direction != "out":
+                    pairs.extend((edge, edge._outV) for edge in
+                                 self.get_edges(vertex._id, "in", labels))
+                for edge, other_id in pairs:
+                    if other_id not in vertices:
+                        if max_nodes is not None and len(vertices) >= max_nodes:
+                            continue
+                        other = self.vertices[other_id]
+                        vertices[other_id] = other
+                        order.append(other)
+                        next_frontier.append(other)
+                    if edge._id not in edges:
+                        edges[edge._id] = edge
+                        edge_order.append(edge)
+            frontier = next_frontier
+        return order + edge_order
+
+    # Properties
+
+    def index_properties(self, element, index, keys=None):
+        """Puts the element's properties in the index, only the keys if given."""
+        for key, value in element.data.items():
+            if keys is None or key in keys:
+                index.put(key, value, element._id)
+
+    def update_properties(self, element, data, index=None, keys=None):
+        """
+        Replaces the element's properties, like the update_indexed_* Gremlin
+        scripts: only the index entries for changed keys are rewritten.
+
+        """
+        with self.lock:
+            data = data or {}
+            for key in list(element.data):
+                if data.get(key) is None:
+                    if index is not None and (keys is None or key in keys):
+                        index.remove(element._id, key, element.data[key])
+                    del element.data[key]
+            for key, value in data.items():
+                if value is None or element.data.get(key) == value:
+                    continue
+                indexed = index is not None and (keys is None or key in keys)
+                if indexed and key in element.data:
+                    index.remove(element._id, key, element.data[key])
+                element.data[key] = value
+                if indexed:
+                    index.put(key, value, element._id)
+            return element
+
+    def patch_properties(self, element, data, index=None, keys=None):
+        """
+        Sets only the given properties, removing those set to None, like the
+        patch_indexed_* Gremlin scripts.
+
+        """
+        with self.lock:
+            for key, value in (data or {}).items():
+                if element.data.get(key) == value:
+                    continue
+                indexed = index is not None and (keys is None or key in keys)
+                if indexed and key in element.data:
+                    index.remove(element._id, key, element.data[key])
+                if value is None:
+                    element.data.pop(key, None)
+                    continue
+                element.data[key] = value
+                if indexed:
+                    index.put(key, value, element._id)
+            return element
+
+    # Indices
+
+    def create_index(self, name, index_class, index_type="manual"):
+        """Creates an index and returns it; raises ValueError if it exists."""
+        with self.lock:
+            if name in self.indices:
+                raise ValueError("Index already exists: %s" % name)
+            index = self.indices[name] = MemoryIndex(name, index_class, index_type)
+            return index
+
+    def get_index(self, name):
+        """Returns the index with the name, or None."""
+        return self.indices.get(name)
+
+    def get_or_create_index(self, name, index_class):
+        """Returns the index with the name, creating it if needed."""
+        with self.lock:
+            index = self.indices.get(name)
+            if index is None:
+                index = self.create_index(name, index_class)
+            return index
+
+    def remove_index(self, name):
+        """Removes the index and returns it, or None."""
+        with self.lock:
+            return self.indices.pop(name, None)
+
+    def _remove_from_indices(self, index_class, _id):
+        for index in self.indices.values():
+            if index.index_class == index_class:
+                index.remove(_id)
+
+    def _next_id(self):
+        self.last_id += 1
+        return str(self.last_id)
+
+
+def to_id(_id):
+    """Returns the element ID as a string, like TinkerGraph's IDs."""
+    return None if _id is None else str(_id)
+
+
+def to_index_value(value):
+    """Returns the value as the Gremlin scripts index it, with String.valueOf."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value if hasattr(value, "encode") else str(value)
+
+
+def clean_data(data):
+    """Returns a copy of the property data without the null values."""
+    return dict((key, value) for key, value in (data or {}).items() if value is not None)
@@ -0,0 +1,10 @@
+import unittest
+from .memory_tests import memory_suite
+
+def test_suite():
+    suite = unittest.TestSuite()
+    suite.addTest(memory_suite())
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
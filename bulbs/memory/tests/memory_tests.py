@@ -0,0 +1,106 @@
+import unittest
+
+from bulbs.tests import BulbsTestCase, BulbsTestSuite, bulbs_test_suite
+from bulbs.tests.client_tests import ClientTestCase
+from bulbs.tests.client_index_tests import ClientIndexTestCase
+from bulbs.memory import Graph, MemoryClient, \
+    VertexIndexProxy, EdgeIndexProxy, ManualIndex
+from bulbs.memory.store import MemoryGraph
+
+# Runs the client and Bulbs suites against the in-memory client. The tests
+# expect the data to outlive each client, like a database's, so the clients
+# share a store. GremlinTestCase and the Bulbs tests that send Gremlin are
+# left out because there's no Gremlin.
+store = MemoryGraph()
+
+GREMLIN_TESTS = ["test_traverse", "test_traverse_limit", "test_multi"]
+
+
+def get_client():
+    return MemoryClient(graph=store)
+
+class MemoryClientTestCase(ClientTestCase):
+
+    def setUp(self):
+        self.client = get_client()
+
+
+class MemoryClientIndexTestCase(ClientIndexTestCase):
+
+    def setUp(self):
+        self.client = get_client()
+
+
+class MemoryGraphTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Graph()
+
+    def test_neighbourhood(self):
+        james = self.g.vertices.create(name="James")
+        julie = self.g.vertices.create(name="Julie")
+        jack = self.g.vertices.create(name="Jack")
+        self.g.edges.create(james, "knows", julie)
+        self.g.edges.create(julie, "knows", jack)
+        resp = self.g.client.neighbourhood(james.eid, 1)
+        names = [result.get_data().get('name') for result in resp.results]
+        assert names == ["James", "Julie", None]
+        resp = self.g.client.neighbourhood(james.eid, 2, direction="in")
+        assert resp.total_size == 1
+
+    def test_update_indexed_vertex_only_reindexes_changed_keys(self):
+        self.g.client.get_or_create_vertex_index("people")
+        resp = self.g.client.create_indexed_vertex(dict(name="James", age=34), "people")
+        _id = resp.results.get_id()
+        self.g.client.update_indexed_vertex(_id, dict(name="Jim", age=34), "people")
+        assert self.g.client.lookup_vertex("people", "name", "James").total_size == 0
+        assert self.g.client.lookup_vertex("people", "name", "Jim").total_size == 1
+        assert self.g.client.lookup_vertex("people", "age", 34).total_size == 1
+
+    def test_results_are_copies(self):
+        james = self.g.vertices.create(name="James")
+        resp = self.g.client.get_vertex(james.eid)
+        resp.results.get_data()['name'] = "Julie"
+        assert self.g.vertices.get(james.eid).name == "James"
+
+    def test_metadata(self):
+        client = self.g.client
+        client.set_metadata("version", 2)
+        assert client.get_metadata("version").content == 2
+        client.remove_metadata("version")
+        assert client.get_metadata("version", 1).content == 1
+
+    def test_clear(self):
+        self.g.vertices.create(name="James")
+        self.g.clear()
+        assert self.g.V is None
+
+
+def without_tests(suite, names):
+    filtered = unittest.TestSuite()
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            filtered.addTest(without_tests(test, names))
+        elif test._testMethodName not in names:
+            filtered.addTest(test)
+    return filtered
+
+
+def memory_suite():
+    client = get_client()
+    BulbsTestCase.client = client
+    BulbsTestCase.vertex_index_proxy = VertexIndexProxy
+    BulbsTestCase.edge_index_proxy = EdgeIndexProxy
+    BulbsTestCase.index_class = ManualIndex
+    BulbsTestCase.graph = Graph(client.config)
+
+    suite = without_tests(bulbs_test_suite(), GREMLIN_TESTS)
+    suite.addTest(unittest.makeSuite(MemoryClientTestCase))
+    suite.addTest(unittest.makeSuite(MemoryClientIndexTestCase))
+    suite.addTest(unittest.makeSuite(MemoryGraphTestCase))
+    return BulbsTestSuite([suite], client=client, graph=BulbsTestCase.graph,
+                          vertex_index_proxy=VertexIndexProxy,
+                          edge_index_proxy=EdgeIndexProxy, index_class=ManualIndex)
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='memory_suite')
@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Per-request metrics: collectors, an in-process histogram collector, and a
+Prometheus text exporter.
+
+"""
+import bisect
+import hashlib
+import numbers
+import re
+import threading
+import time
+
+from .utils import get_logger
+
+log = get_logger(__name__)
+
+#: The most precise wall-clock timer available (perf_counter is Python 3.3+).
+timer = getattr(time, "perf_counter", time.time)
+
+#: Histogram bucket upper bounds for times, in seconds.
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+#: Histogram bucket upper bounds for sizes, in bytes.
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+#: The names of calls that aren't in the client's library, whose scripts
+#: are fingerprinted.
+AD_HOC_NAMES = ("gremlin", "cypher")
+
+# Quoted strings and numbers that aren't part of an identifier.
+LITERAL_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\b\d+(?:\.\d+)?\b")
+
+
+class CallInfo(object):
+    """
+    The metrics for one request.
+
+    :ivar method: HTTP method.
+    :ivar path: Path to the server resource, relative to the root URI.
+    :ivar name: The Gremlin script or Cypher query's name in the client's
+        library, "gremlin" or "cypher" for other scripts, "multi" for a
+        Multi's combined script, or the path with the IDs replaced by "{id}".
+    :ivar status: HTTP status code.
+    :ivar bytes_sent: Size of the request body.
+    :ivar bytes_received: Size of the response body.
+    :ivar server_time: Seconds from sending the request to reading the
+        response, including the network.
+    :ivar decode_time: Seconds spent building the Response, mostly JSON
+        decoding.
+    :ivar init_time: Seconds spent initializing the response's elements,
+        or None until they've all been initialized.
+    :ivar element_count: Number of elements initialized.
+    :ivar params_shape: The shape of the request's params, from 
+        get_params_shape().
+    :ivar script_fingerprint: For "gremlin" and "cypher" calls, the
+        fingerprint of the script, from get_script_fingerprint(); otherwise "".
+    :ivar hedge: True if the request duplicated a slow read, i.e. it was a
+        hedged request.
+
+    """
+    __slots__ = ("method", "path", "name", "status", "bytes_sent", "bytes_received",
+                 "server_time", "decode_time", "init_time", "element_count", 
+                 "params_shape", "script_fingerprint", "hedge")
+
+    def __init__(self, method, path, name, params_shape="", script_fingerprint=""):
+        self.method = method
+        self.path = path
+        self.name = name
+        self.params_shape = params_shape
+        self.script_fingerprint = script_fingerprint
+        self.status = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.server_time = 0.0
+        self.decode_time = 0.0
+        self.init_time = None
+        self.element_count = 0
+        self.hedge = False
+
+    def __repr__(self):
+        return "<CallInfo: %s %s (%s) server=%.4fs decode=%.4fs>" % \
+            (self.method, self.path, self.name, self.server_time, self.decode_time)
+
+
+class Collector(object):
+    """
+    Abstract base class for metrics collectors.
+
+    Set a collector on the Config to have every request reported to it.
+
+    Example:
+
+    >>> from bulbs.config import Config
+    >>> from bulbs.metrics import HistogramCollector, prometheus_text
+    >>> from bulbs.neo4jserver import Graph, NEO4J_URI
+    >>> config = Config(NEO4J_URI)
+    >>> config.metrics = HistogramCollector()
+    >>> g = Graph(config)
+    >>> james = g.vertices.get(3)
+    >>> print(prometheus_text(config.metrics))
+
+    """
+    def record_request(self, info):
+        """
+        Called after each request's Response is built.
+
+        :param info: The request's metrics; init_time is still None.
+        :type info: CallInfo
+
+        :rtype: None
+
+        """
+        raise NotImplementedError
+
+    def record_initialization(self, info):
+        """
+        Called when all of a response's elements have been initialized.
+
+        Elements are initialized lazily as the results are iterated, so
+        this is called later than record_request, or not at all if the
+        results aren't elements or aren't fully iterated.
+
+        :param info: The request's metrics, with init_time set.
+        :type info: CallInfo
+
+        :rtype: None
+
+        """
+        raise NotImplementedError
+
+
+class CollectorGroup(Collector):
+    """
+    Reports to several collectors, e.g. a HistogramCollector and a 
+    SlowQueryLog.
+
+    :param collectors: Collector objects.
+    :type collectors: Collector
+
+    """
+    def __init__(self, *collectors):
+        self.collectors = list(collectors)
+
+    def record_request(self, info):
+        for collector in self.collectors:
+            collector.record_request(info)
+
+    def record_initialization(self, info):
+        for collector in self.collectors:
+            collector.record_initialization(info)
+
+
+class Histogram(object):
+    """
+    Counts observations in cumulative buckets.
+
+    :param buckets: Sorted bucket upper bounds.
+    :type buckets: tuple
+
+    """
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        """Adds an observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def get_cumulative_counts(self):
+        """
+        Returns a list of (upper bound, count) tuples, where each count
+        includes the lower buckets, ending with ("+Inf", count).
+
+        :rtype: list
+
+        """
+        counts = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            counts.append((bound, total))
+        counts.append(("+Inf", self.count))
+        return counts
+
+
+class HistogramCollector(Collector):
+    """
+    Keeps in-process histograms of each metric by HTTP method and name.
+
+    :param time_buckets: Bucket upper bounds for times, in seconds.
+    :type time_buckets: tuple
+
+    :param size_buckets: Bucket upper bounds for sizes, in bytes.
+    :type size_buckets: tuple
+
+    :ivar histograms: Dict of Histograms keyed by (metric, method, name).
+
+    Hedged requests are also observed in hedge_server_seconds, so the hedge
+    rate of a call is its hedge_server_seconds count over its
+    server_seconds count.
+
+    """
+    #: Maps each metric to its CallInfo attribute and bucket kind.
+    metrics = (("server_seconds", "server_time", "time"),
+               ("decode_seconds", "decode_time", "time"),
+               ("sent_bytes", "bytes_sent", "size"),
+               ("received_bytes", "bytes_received", "size"))
+
+    def __init__(self, time_buckets=TIME_BUCKETS, size_buckets=SIZE_BUCKETS):
+        self.buckets = dict(time=tuple(time_buckets), size=tuple(size_buckets))
+        self.histograms = dict()
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        # Configs are pickled with elements, and locks can't be pickled.
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self.lock = threading.Lock()
+
+    def record_request(self, info):
+        with self.lock:
+            for metric, attribute, kind in self.metrics:
+                self._observe(metric, kind, info, getattr(info, attribute))
+            if info.hedge:
+                self._observe("hedge_server_seconds", "time", info, info.server_time)
+
+    def record_initialization(self, info):
+        with self.lock:
+            self._observe("init_seconds", "time", info, info.init_time)
+
+    def get(self, metric, method, name):
+        """
+        Returns the Histogram for the metric, HTTP method, and name, or None.
+
+        :rtype: Histogram or None
+
+        """
+        return self.histograms.get((metric, method, name))
+
+    def clear(self):
+        """
+        Removes all the histograms.
+
+        :rtype: None
+
+        """
+        with self.lock:
+            self.histograms.clear()
+
+    def _observe(self, metric, kind, info, value):
+        key = (metric, info.method, info.name)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.buckets[kind])
+        histogram.observe(value)
+
+
+#: Help text for the Prometheus metrics.
+METRIC_HELP = dict(
+    server_seconds="Seconds from sending a request to reading its response.",
+    decode_seconds="Seconds spent decoding a response.",
+    hedge_server_seconds="Seconds from sending a hedged request to reading its response.",
+    init_seconds="Seconds spent initializing a response's elements.",
+    sent_bytes="Size of the request body in bytes.",
+    received_bytes="Size of the response body in bytes.")
+
+
+def prometheus_text(collector, prefix="bulbs"):
+    """
+    Returns the collector's histograms in the Prometheus text format.
+
+    :param collector: The HistogramCollector to export.
+    :type collector: HistogramCollector
+
+    :param prefix: Prefix for the metric names. Defaults to "bulbs".
+    :type prefix: str
+
+    :rtype: str
+
+    """
+    with collector.lock:
+        items = sorted(collector.histograms.items(), key=lambda item: item[0])
+        lines = []
+        current_metric = None
+        for (metric, method, name), histogram in items:
+            full_name = "%s_%s" % (prefix, metric)
+            if metric != current_metric:
+                current_metric = metric
+                lines.append("# HELP %s %s" % (full_name, METRIC_HELP.get(metric, metric)))
+                lines.append("# TYPE %s histogram" % full_name)
+            labels = 'method="%s",name="%s"' % (_escape(method), _escape(name))
+            for bound, count in histogram.get_cumulative_counts():
+                lines.append('%s_bucket{%s,le="%s"} %d' % (full_name, labels, bound, count))
+            lines.append("%s_sum{%s} %r" % (full_name, labels, float(histogram.sum)))
+            lines.append("%s_count{%s} %d" % (full_name, labels, histogram.count))
+    return "\n".join(lines) + "\n"
+
+
+def get_params_shape(params):
+    """
+    Returns the shape of a request's params: the keys and value types, 
+    without the values, so calls that differ only by value match.
+
+    For Gremlin and Cypher requests it's the shape of the script's or 
+    statement's params, e.g. "{_id:int,data:{age:int,name:str}}".
+
+    :param params: Request params.
+    :type params: dict
+
+    :rtype: str
+
+    """
+    if isinstance(params, dict):
+        if "script" in params:
+            params = params.get('params')
+        elif "statements" in params:
+            params = [statement.get('parameters') for statement in params['statements']]
+    return _get_shape(params)
+
+
+def get_script_fingerprint(params):
+    """
+    Returns the fingerprint of a request's Gremlin script or Cypher query:
+    a short hash of the text with its literals replaced by "?" and its 
+    whitespace collapsed, so scripts that differ only by value match, e.g.
+    "g.v(1).out('knows')" and "g.v(2).out('likes')".
+
+    :param params: Request params.
+    :type params: dict
+
+    :rtype: str
+
+    """
+    script = None
+    if isinstance(params, dict):
+        if "script" in params:
+            script = params['script']
+        elif "statements" in params:
+            script = "\n".join(statement.get('statement', "") 
+                               for statement in params['statements'])
+        elif "query" in params:
+            script = params['query']
+    if not script:
+        return ""
+    script = " ".join(LITERAL_PATTERN.sub("?", script).split())
+    return hashlib.sha1(script.encode("utf-8")).hexdigest()[:12]
+
+
+def timed_elements(elements, info, collector):
+    """
+    Yields the elements, timing their initialization, and reports the
+    total to the collector once they've all been yielded.
+
+    :param elements: Generator that initializes elements.
+    :type elements: generator
+
+    :param info: The metrics for the request that returned the elements.
+    :type info: CallInfo
+
+    :param collector: Collector to report to.
+    :type collector: Collector
+
+    :rtype: generator
+
+    """
+    elapsed = 0.0
+    count = 0
+    while True:
+        start = timer()
+        try:
+            element = next(elements)
+        except StopIteration:
+            break
+        finally:
+            elapsed += timer() - start
+        count += 1
+        yield element
+    info.init_time = elapsed
+    info.element_count = count
+    try:
+        collector.record_initialization(info)
+    except Exception:
+        log.exception("Metrics collector failed")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _get_shape(value):
+    if isinstance(value, dict):
+        items = ",".join("%s:%s" % (key, _get_shape(value[key])) for key in sorted(value))
+        return "{%s}" % items
+    if isinstance(value, (list, tuple)):
+        # Lists are shaped by their distinct item shapes, not their length.
+        shapes = sorted(set(_get_shape(item) for item in value))
+        return "[%s]" % "|".join(shapes)
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, numbers.Integral):
+        return "int"
+    if isinstance(value, numbers.Real):
+        return "float"
+    if hasattr(value, "encode"):
+        return "str"
+    return type(value).__name__
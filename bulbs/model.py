@@ -8,6 +8,7 @@ Base classes for modeling domain objects that wrap vertices and edges.
 
 """
 import six  # Python 3
+import copy
 import inspect
 import types
 from collections import Callable
@@ -15,7 +16,7 @@ from collections import Callable
 from bulbs.property import Property
 from bulbs.element import Element, Vertex, VertexProxy, Edge, EdgeProxy, \
     coerce_vertices, build_data
-from bulbs.utils import initialize_element, get_logger
+from bulbs.utils import initialize_element, get_logger, get_defining_class
 
 
 # Model Modes
@@ -37,6 +38,10 @@ class ModelMeta(type):
         # Add new Properties
         cls._register_properties(namespace)
 
+        # Precompute the per-Property steps for the encoder/decoder
+        cls._codec_fields = cls._get_codec_fields()
+        cls._codecs = {}
+
     def _get_initial_properties(cls):
         """
         Get Properties defined in the parent and inherit them.
@@ -118,10 +123,242 @@ class ModelMeta(type):
             fdel = None
             property_value = property(fget, fset, fdel)
         else:
-            property_value = None
+            # Converted from the element's data on first access.
+            property_value = LazyProperty(key)
         setattr(cls, key, property_value)
 
 
+    def _get_codec_fields(cls):
+        """
+        Returns the (key, Property, is_calculated) steps for the codec.
+
+        :rtype: tuple
+
+        """
+        fields = []
+        for key in cls._properties:  # Python 3
+            property_instance = cls._properties[key]
+            is_calculated = (property_instance.fget is not None)
+            fields.append((key, property_instance, is_calculated))
+        return tuple(fields)
+
+    def get_codec(cls, type_system):
+        """
+        Returns the Model's (encoder, decoder) functions for the type system.
+
+        The functions are built once per type system and cached on the class
+        so save and load don't have to look up each Property's converters.
+
+        :param type_system: TypeSystem object.
+        :type type_system: TypeSystem
+
+        :rtype: tuple
+
+        """
+        encoder, decoder, converters = cls._get_codec(type_system)
+        return encoder, decoder
+
+    def get_python_converters(cls, type_system):
+        """
+        Returns a dict that maps each stored Property key to the function 
+        that converts its database value to its Python type.
+
+        :param type_system: TypeSystem object.
+        :type type_system: TypeSystem
+
+        :rtype: dict
+
+        """
+        encoder, decoder, converters = cls._get_codec(type_system)
+        return converters
+
+    def _get_codec(cls, type_system):
+        # Converters are class-level singletons on the type system.
+        codec_key = (type_system.database, type_system.python)
+        codec = cls._codecs.get(codec_key)
+        if codec is None:
+            converters = build_python_converters(cls._codec_fields, type_system)
+            encoder = build_encoder(cls._codec_fields, type_system)
+            decoder = build_decoder(converters)
+            codec = cls._codecs[codec_key] = (encoder, decoder, converters)
+        return codec
+
+
+class LazyProperty(object):
+    """
+    Model class attribute for a stored Property. 
+
+    The first time the attribute is read on an element, the value is 
+    converted from the element's data and cached on the element, so loading 
+    large results doesn't pay for converting properties that are never used.
+
+    :param key: Property key.
+    :type key: str
+
+    .. note:: This is a non-data descriptor, so values set on the element 
+              (and the cached value) take precedence over it.
+
+    """
+    def __init__(self, key):
+        self.key = key
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            # Model class attributes for Properties have always been None.
+            return None
+        dict_ = instance.__dict__
+        data = dict_.get("_data")
+        client = dict_.get("_client")
+        if data is None or client is None:
+            return None
+        convert = owner.get_python_converters(client.type_system)[self.key]
+        value = data.get(self.key, None)
+        if isinstance(value, (list, dict)):
+            # Copy it so in-place changes don't alter the loaded data, 
+            # which save() compares the value against.
+            value = copy.deepcopy(value)
+        value = decode_value(convert, self.key, value)
+        # Cache it directly; Model.__setattr__ would mark it as dirty.
+        dict_[self.key] = value
+        return value
+
+
+def build_encoder(fields, type_system):
+    """
+    Returns a function that validates and converts a Model's Property values
+    to their database values. 
+
+    :param fields: The Model's (key, Property, is_calculated) steps.
+    :type fields: tuple
+
+    :param type_system: TypeSystem object.
+    :type type_system: TypeSystem
+
+    :rtype: function
+
+    """
+    steps = []
+    for key, property_instance, is_calculated in fields:
+        property_class = type(property_instance)
+        if get_defining_class(property_class, "convert_to_db") is Property:
+            convert = property_instance.get_db_converter(type_system)
+        else:
+            convert = _bind_key(property_instance.convert_to_db, type_system, key)
+        # Inline the null/type checks unless validation is customized.
+        python_type = property_instance.python_type
+        inline_checks = python_type is not None and \
+            get_defining_class(property_class, "validate") is Property and \
+            get_defining_class(property_class, "_check_null") is Property and \
+            get_defining_class(property_class, "_check_datatype") is Property
+        steps.append((key, is_calculated, inline_checks, property_instance.nullable,
+                      python_type, property_instance.validate, convert))
+    steps = tuple(steps)
+    getattribute = object.__getattribute__
+
+    def encode(model, data, keys=None):
+        for key, is_calculated, inline_checks, nullable, python_type, \
+                validate, convert in steps:
+            if keys is not None and is_calculated is False and key not in keys:
+                continue
+            # Notice that __getattr__ is overloaded in Element.
+            value = getattribute(model, key)
+            # callable() is much cheaper than the Callable ABC check
+            if callable(value):
+                value = value()
+            if inline_checks is False:
+                validate(key, value)
+            elif value is None:
+                if nullable is False:
+                    validate(key, value)
+            elif isinstance(value, python_type) is False:
+                validate(key, value)
+            data[key] = convert(value)
+        return data
+
+    return encode
+
+
+def build_python_converters(fields, type_system):
+    """
+    Returns a dict that maps each stored Property key to the function that 
+    converts its database value to its Python type.
+
+    :param fields: The Model's (key, Property, is_calculated) steps.
+    :type fields: tuple
+
+    :param type_system: TypeSystem object.
+    :type type_system: TypeSystem
+
+    :rtype: dict
+
+    """
+    converters = dict()
+    for key, property_instance, is_calculated in fields:
+        # Don't set calculated property values, i.e. those with fget defined.
+        if is_calculated: 
+            continue
+        property_class = type(property_instance)
+        if get_defining_class(property_class, "convert_to_python") is Property:
+            convert = property_instance.get_python_converter(type_system)
+        else:
+            convert = _bind_key(property_instance.convert_to_python, type_system, key)
+        converters[key] = convert
+    return converters
+
+
+def build_decoder(converters):
+    """
+    Returns a function that converts a Model's database values to their
+    Python types and sets them on the Model. 
+
+    :param converters: Maps the stored Property keys to their converters.
+    :type converters: dict
+
+    :rtype: function
+
+    .. note:: Sets the value to None if it's an invalid type.
+
+    """
+    steps = tuple(converters.items())
+    setattribute = object.__setattr__
+
+    def decode(model, data):
+        for key, convert in steps:
+            value = decode_value(convert, key, data.get(key, None))
+            # Notice that __setattr__ is overloaded. No need to coerce it twice.
+            setattribute(model, key, value)
+
+    return decode
+
+
+def decode_value(convert, key, value):
+    """
+    Returns the converted database value, or None if it's an invalid type.
+
+    :param convert: Python converter function for the Property.
+    :type convert: function
+
+    :param key: Property key.
+    :type key: str
+
+    :param value: Database value.
+    :type value: object
+
+    :rtype: object
+
+    """
+    try:
+        return convert(value)
+    except Exception as e:
+        log.exception("Property Type Mismatch: '%s' with value '%s': %s", 
+                      key, value, e)
+
+
+def _bind_key(method, type_system, key):
+    # Binds a convert_to_db/convert_to_python method to a single-arg function.
+    return lambda value: method(type_system, key, value)
+
+
 class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
     """Abstract base class for Node and Relationship container classes."""
     
@@ -136,6 +373,12 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
     _properties = None
     
 
+    def __init__(self, client):
+        # Keys of the database attributes changed since the element was 
+        # loaded or saved. Set before Element.__init__ so it's a normal attr.
+        self._dirty_keys = set()
+        super(Model, self).__init__(client)
+
     def __setattr__(self, key, value):
         """
         Set model attributes, possibly coercing database Properties to the 
@@ -177,6 +420,7 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
         if not self._is_calculated_property(key):
             value = self._coerce_property_value(key, value)
             object.__setattr__(self, key, value)
+            self._mark_dirty(key)
 
     def _set_normal_attribute(self, key, value):
         """
@@ -196,7 +440,66 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
             object.__setattr__(self, key, value)
         else:
             # Store the attribute in self._data, which are saved to database.
+            dict_ = self.__dict__
+            is_data = key not in dict_ and dict_.get("_initialized", False)
             Element.__setattr__(self, key, value)        
+            if is_data:
+                self._mark_dirty(key)
+
+    def _mark_dirty(self, key):
+        """
+        Records that a database attribute changed since the last load/save.
+
+        :param key: Attribute key
+        :type key: str
+
+        :rtype: None
+
+        """
+        # Attributes set before the element is initialized aren't DB data.
+        if self.__dict__.get("_initialized", False) is True:
+            self._dirty_keys.add(key)
+
+    def _clear_dirty(self):
+        """
+        Resets dirty tracking; called after the element is loaded or saved.
+
+        :rtype: None
+
+        """
+        self._dirty_keys.clear()
+
+    def _set_saved_data(self, data):
+        """
+        Updates the loaded data with the data that was saved, so the next 
+        save() compares the values with what's in the database.
+
+        :param data: The saved data, from _get_changed_property_data().
+        :type data: dict
+
+        :rtype: None
+
+        """
+        dict_ = self.__dict__
+        if dict_.get("_data_shared") is True:
+            # copy on write so the Result's data isn't changed
+            dict_["_data"] = dict_["_data"].copy()
+            dict_["_data_shared"] = False
+        for key, value in data.items():
+            if value is None:
+                dict_["_data"].pop(key, None)
+            else:
+                # Copy it so in-place changes to the value still differ.
+                dict_["_data"][key] = copy.deepcopy(value)
+
+    def get_dirty_keys(self):
+        """
+        Returns the keys of the attributes changed since the last load/save.
+
+        :rtype: set
+
+        """
+        return set(self._dirty_keys)
 
     def _is_calculated_property(self, key):
         """
@@ -290,21 +593,22 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
         .. note:: Sets the value to None if it's an invalid type.
 
         """
-        type_system = self._client.type_system
-        for key in self._properties:   # Python 3
+        encode, decode = self.__class__.get_codec(self._client.type_system)
+        decode(self, self._data)
             
-            # Don't set calculted property values, i.e. those with fset defined.
-            if self._is_calculated_property(key): continue
+    def _clear_property_data(self):
+        """
+        Clears the Property values set on the element so they're converted
+        lazily from the new element data on first access.
 
-            property_instance = self._properties[key]
-            #name = property_instance.name
-            value = self._data.get(key, None)
-            value = property_instance.convert_to_python(type_system, key, value)
+        :rtype: None
+
+        """
+        dict_ = self.__dict__
+        for key, property_instance, is_calculated in self._codec_fields:
+            if not is_calculated:
+                dict_.pop(key, None)
 
-            # TODO: Maybe need to wrap this in try/catch too.
-            # Notice that __setattr__ is overloaded. No need to coerce it twice.
-            object.__setattr__(self, key, value)
-            
     def _get_property_data(self):
         """
         Returns validated Property data, ready to be saved in the DB.
@@ -324,13 +628,39 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
             data[type_var] = object.__getattribute__(self, type_var)
 
         # Convert database Property values to their database types.
-        for key in self._properties:  # Python 3
-            property_instance = self._properties[key]
-            value = self._get_property_value(key)
-            property_instance.validate(key, value)
-            #name = property_instance.name
-            db_value = property_instance.convert_to_db(type_system, key, value)
-            data[key] = db_value
+        encode, decode = self.__class__.get_codec(type_system)
+        return encode(self, data)
+
+    def _get_changed_property_data(self):
+        """
+        Returns validated data for the attributes changed since the last 
+        load/save, ready to be saved in the DB. 
+
+        :rtype: dict
+
+        .. note:: Calculated Properties are recalculated because they may
+                  depend on other attributes, and included if they differ 
+                  from the saved data. None values mean "remove".
+                  Properties that were read are compared with the loaded 
+                  data too, so in-place changes to List and Dictionary 
+                  values are saved.
+
+        """
+        encode, decode = self.__class__.get_codec(self._client.type_system)
+        dict_ = self.__dict__
+        unchanged = set()
+        for key, property_instance, is_calculated in self._codec_fields:
+            if is_calculated or (key in dict_ and key not in self._dirty_keys):
+                unchanged.add(key)
+        data = encode(self, dict(), self._dirty_keys | unchanged)
+        for key in unchanged:
+            if data.get(key) == self._data.get(key):
+                data.pop(key, None)
+
+        if self.__mode__ == NORMAL:
+            for key in self._dirty_keys:
+                if key not in self._properties:
+                    data[key] = self._data.get(key)
 
         return data
 
@@ -408,7 +738,8 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
         """
         data = dict()
         if self.__mode__ == NORMAL:
-            data = self._data
+            # Copy it; the element's data may be shared with its Result.
+            data = self._data.copy()
 
         for key in self._properties: 
             # TODO: make this work for calculated values.
@@ -542,7 +873,25 @@ class Node(Model, Vertex):
 
     def save(self):
         """
-        Saves/updates the element's data in the database.
+        Saves the attributes changed since the element was loaded.
+
+        :rtype: None
+
+        .. note:: Only the changed properties and their index entries are 
+                  sent to the database. Use save_all() to rewrite everything.
+
+        """
+        data = self._get_changed_property_data()
+        if data:
+            index_name = self.get_index_name(self._client.config)
+            keys = self.get_index_keys()
+            self._client.patch_indexed_vertex(self._id, data, index_name, keys)
+            self._set_saved_data(data)
+        self._clear_dirty()
+
+    def save_all(self):
+        """
+        Saves/updates all of the element's data in the database.
 
         :rtype: None
 
@@ -551,6 +900,7 @@ class Node(Model, Vertex):
         index_name = self.get_index_name(self._client.config)
         keys = self.get_index_keys()
         self._client.update_indexed_vertex(self._id, data, index_name, keys)
+        self._clear_dirty()
         
     #
     # Override the _create and _update methods to cusomize behavior.
@@ -609,9 +959,8 @@ class Node(Model, Vertex):
 
         """
         Vertex._initialize(self,result)
-        self._initialized = False
-        self._set_property_data()
-        self._initialized = True
+        self._clear_property_data()
+        self._clear_dirty()
 
 
 class Relationship(Model, Edge):
@@ -717,7 +1066,25 @@ class Relationship(Model, Edge):
 
     def save(self):
         """
-        Saves/updates the element's data in the database.
+        Saves the attributes changed since the element was loaded.
+
+        :rtype: None
+
+        .. note:: Only the changed properties and their index entries are 
+                  sent to the database. Use save_all() to rewrite everything.
+
+        """
+        data = self._get_changed_property_data()
+        if data:
+            index_name = self.get_index_name(self._client.config)
+            keys = self.get_index_keys()
+            self._client.patch_indexed_edge(self._id, data, index_name, keys)
+            self._set_saved_data(data)
+        self._clear_dirty()
+
+    def save_all(self):
+        """
+        Saves/updates all of the element's data in the database.
 
         :rtype: None
 
@@ -726,6 +1093,7 @@ class Relationship(Model, Edge):
         index_name = self.get_index_name(self._client.config)
         keys = self.get_index_keys()
         self._client.update_indexed_edge(self._id, data, index_name, keys)
+        self._clear_dirty()
 
     #
     # Override the _create and _update methods to customize behavior.
@@ -785,9 +1153,8 @@ class Relationship(Model, Edge):
 
         """
         Edge._initialize(self,result)
-        self._initialized = False
-        self._set_property_data()
-        self._initialized = True
+        self._clear_property_data()
+        self._clear_dirty()
 
 
 class NodeProxy(VertexProxy):
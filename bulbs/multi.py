@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Runs many independent Gremlin script calls in one request.
+
+"""
+from .utils import initialize_elements, get_one_result, initialize_element, \
+    get_logger
+
+log = get_logger(__name__)
+
+
+class Call(object):
+    """
+    A script call gathered by Multi. Its response is set when the Multi runs.
+
+    :param key: Key of the call's result in the combined script.
+    :type key: str
+
+    :param method_name: Name of the Gremlin library method, or None.
+    :type method_name: str
+
+    :param script: Gremlin script body.
+    :type script: str
+
+    :param params: Parameters bound to the script.
+    :type params: dict
+
+    :ivar response: The call's Response. None until the Multi has run.
+
+    """
+    def __init__(self, key, method_name, script, params):
+        self.key = key
+        self.method_name = method_name
+        self.script = script
+        self.params = params
+        self.response = None
+
+    def elements(self, client):
+        """
+        Returns the call's initialized elements.
+
+        :param client: Client object.
+        :type client: Client
+
+        :rtype: Generator of objects: Vertex, Edge, Node, or Relationship
+
+        """
+        return initialize_elements(client, self.response)
+
+    def element(self, client):
+        """
+        Returns the call's first initialized element, or None.
+
+        :param client: Client object.
+        :type client: Client
+
+        :rtype: Element or None
+
+        """
+        if self.response.total_size > 0:
+            result = get_one_result(self.response)
+            return initialize_element(client, result)
+
+
+class Multi(object):
+    """
+    Gathers independent script calls and runs them in one Gremlin request.
+
+    Each call's script is wrapped in a closure in one combined script that
+    returns a map keyed by call. The map is then split into one Response
+    per call. Use it as a context manager; the calls run when the block
+    exits without an error.
+
+    :param client: The Client object for the database.
+    :type client: Client
+
+    Example:
+
+    >>> from bulbs.neo4jserver import Graph
+    >>> g = Graph()
+    >>> with g.multi() as multi:
+    ...     james = multi.get_vertex(3)
+    ...     friends = multi.outV(3, "knows")
+    ...     people = multi.lookup_vertex("person", "name", "Julie")
+    >>> james.element(g.client)
+    >>> list(friends.elements(g.client))
+
+    .. note:: Only use it for reads; the calls aren't run in a transaction.
+
+    """
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+
+    def add(self, method_name, **params):
+        """
+        Adds a call to a Gremlin library method and returns the Call.
+
+        :param method_name: Name of the method in the client's scripts.
+        :type method_name: str
+
+        :param params: Parameters for the method, named as in its signature.
+        :type params: dict
+
+        :rtype: Call
+
+        """
+        script = self.client.scripts.get(method_name)
+        return self._add_call(method_name, script, params)
+
+    def gremlin(self, script, params=None):
+        """
+        Adds a call to an arbitrary Gremlin script and returns the Call.
+
+        :param script: Gremlin script.
+        :type script: str
+
+        :param params: Optional parameters to bind to the script.
+        :type params: dict or None
+
+        :rtype: Call
+
+        """
+        return self._add_call(None, script, params or {})
+
+    def get_vertex(self, _id):
+        """Adds a call that gets the vertex and returns the Call."""
+        return self.add("get_vertex", _id=_id)
+
+    def get_edge(self, _id):
+        """Adds a call that gets the edge and returns the Call."""
+        return self.add("get_edge", _id=_id)
+
+    def lookup_vertex(self, index_name, key, value):
+        """Adds a call that looks up vertices in the index and returns the Call."""
+        return self.add("lookup_vertex", index_name=index_name, key=key, value=value)
+
+    def lookup_edge(self, index_name, key, value):
+        """Adds a call that looks up edges in the index and returns the Call."""
+        return self.add("lookup_edge", index_name=index_name, key=key, value=value)
+
+    def outE(self, _id, label=None, start=None, limit=None):
+        """Adds a call that gets the outgoing edges and returns the Call."""
+        return self.add("outE", _id=_id, label=label, start=start, limit=limit)
+
+    def inE(self, _id, label=None, start=None, limit=None):
+        """Adds a call that gets the incoming edges and returns the Call."""
+        return self.add("inE", _id=_id, label=label, start=start, limit=limit)
+
+    def bothE(self, _id, label=None, start=None, limit=None):
+        """Adds a call that gets the incoming and outgoing edges and returns the Call."""
+        return self.add("bothE", _id=_id, label=label, start=start, limit=limit)
+
+    def outV(self, _id, label=None, start=None, limit=None):
+        """Adds a call that gets the out-adjacent vertices and returns the Call."""
+        return self.add("outV", _id=_id, label=label, start=start, limit=limit)
+
+    def inV(self, _id, label=None, start=None, limit=None):
+        """Adds a call that gets the in-adjacent vertices and returns the Call."""
+        return self.add("inV", _id=_id, label=label, start=start, limit=limit)
+
+    def bothV(self, _id, label=None, start=None, limit=None):
+        """Adds a call that gets the both-adjacent vertices and returns the Call."""
+        return self.add("bothV", _id=_id, label=label, start=start, limit=limit)
+
+    def get_script(self):
+        """
+        Returns the combined Gremlin script and its parameters.
+
+        :rtype: tuple
+
+        """
+        # The header lists the calls, e.g. "// multi: c0=get_vertex c1=outV"
+        header = " ".join("%s=%s" % (call.key, call.method_name or "script")
+                          for call in self.calls)
+        lines = ["// multi: %s" % header, "multi_results = [:]"]
+        params = dict()
+        for call in self.calls:
+            names = sorted(call.params)
+            args = []
+            for name in names:
+                # Prefix the params so they don't clash across calls.
+                arg = "%s_%s" % (call.key, name)
+                params[arg] = call.params[name]
+                args.append(arg)
+            lines.append("def %s = { %s -> \n%s\n}" %
+                         (call.key, ", ".join(names), call.script))
+            lines.append("multi_results.put('%s', multi_toList(%s(%s)))" %
+                         (call.key, call.key, ", ".join(args)))
+        lines.append("return multi_results")
+        prelude = ("multi_toList = { r -> (r instanceof Iterator || "
+                   "(r instanceof Iterable && !(r instanceof Collection))) "
+                   "? r.toList() : r }")
+        script = "\n".join(lines[:1] + [prelude] + lines[1:])
+        return script, params
+
+    def execute(self):
+        """
+        Runs the gathered calls in one request and sets each Call's response.
+
+        :rtype: list
+
+        """
+        if not self.calls:
+            return []
+        script, params = self.get_script()
+        log.debug("Running %d calls in one Gremlin request", len(self.calls))
+        resp = self.client.gremlin(script, params)
+        contents = resp.get_multi_content()
+        for call in self.calls:
+            content = contents.get(call.key)
+            call.response = resp.from_content(content, resp.headers, resp.config)
+        calls, self.calls = self.calls, []
+        return calls
+
+    def _add_call(self, method_name, script, params):
+        key = "c%d" % len(self.calls)
+        call = Call(key, method_name, script, params)
+        self.calls.append(call)
+        return call
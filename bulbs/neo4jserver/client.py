@@ -16,12 +16,13 @@ from bulbs.utils import get_logger
 # specific to this client
 from bulbs.json import JSONTypeSystem
 from bulbs.base import Client, Response, Result
-from bulbs.rest import Request, RESPONSE_HANDLERS, server_error
+from bulbs.rest import Request, RESPONSE_HANDLERS, POST, server_error, bad_request
+from bulbs.stream import JSONStream
+from bulbs.frame import build_frame
 from bulbs.utils import json, build_path, get_file_path, urlsplit
 from bulbs.groovy import GroovyScripts
 
-# TODO: Clean up and generalize Yaml
-from .cypher import Cypher, Yaml
+from .cypher import CypherQueries
 
 
 # The default URI
@@ -37,6 +38,8 @@ edge_path = "relationship"
 index_path = "index"
 gremlin_path = "ext/GremlinPlugin/graphdb/execute_script"
 cypher_path = "ext/CypherPlugin/graphdb/execute_query"
+transaction_path = "transaction"
+batch_path = "batch"
 
 
 class Neo4jResult(Result):
@@ -53,6 +56,14 @@ class Neo4jResult(Result):
     :ivar data: The data in the result.
 
     """
+    __slots__ = ()
+
+    #: Maps Neo4j types to element base types; shared by all results.
+    type_map = dict(node="vertex",relationship="edge")
+
+    #: Raw keys kept when pickled; drops the REST URIs that aren't used.
+    pickle_keys = ("self", "start", "end", "type", "data", "name", "template")
+
     def __init__(self, result, config):
         self.config = config
 
@@ -62,8 +73,6 @@ class Neo4jResult(Result):
         # The data in the result.
         self.data = self._get_data(result)
 
-        self.type_map = dict(node="vertex",relationship="edge")
-
     def get_id(self):
         """
         Returns the element ID.
@@ -307,6 +316,17 @@ class Neo4jResponse(Response):
             total_size = 0
         return results, total_size
 
+    def get_multi_content(self):
+        """
+        Returns a dict of the per-call content in the response to a Multi's
+        combined Gremlin script, keyed by call.
+
+        :rtype: dict
+
+        """
+        # The Gremlin Plugin returns the script's map as the content.
+        return self.content or {}
+
     def _set_index_name(self, index_name):
         """Sets the index name to the raw result."""
         # this is pretty much a hack becuase neo4j doesn't include the index name in response
@@ -319,6 +339,304 @@ class Neo4jRequest(Request):
     response_class = Neo4jResponse
 
 
+class Neo4jCypherResponse(Neo4jResponse):
+    """
+    Container class for a response from the CypherPlugin, Neo4j 1.x's
+    Cypher endpoint.
+
+    The content holds the query's columns, and its rows in "data". The
+    results are the nodes and relationships in every column of every row,
+    so multi-column queries aren't cut down to the first column.
+
+    """
+    def get_results(self):
+        """
+        Returns the nodes and relationships contained in the rows.
+
+        :return:  A tuple containing two items: 1. A generator of Neo4jResult
+                  objects; 2. An int representing the number results returned.
+        :rtype: tuple
+
+        """
+        raw_results = [value for columns, rows in self.get_tables()
+                             for row in rows
+                             for value in row if self._is_element(value)]
+        results = (self.result_class(raw, self.config) for raw in raw_results)
+        return results, len(raw_results)
+
+    def get_tables(self):
+        """
+        Returns a list containing a (columns, rows) tuple for each statement.
+
+        :rtype: list
+
+        """
+        content = self.content or dict()
+        return [(content.get('columns', []), content.get('data', []))]
+
+    def to_frame(self, types=None, type_system=None):
+        """
+        Returns the first statement's rows as a columnar Frame.
+
+        :param types: Optional dict of Property objects keyed by column.
+        :type types: dict
+
+        :param type_system: TypeSystem used to convert the typed columns.
+        :type type_system: TypeSystem
+
+        :rtype: Frame
+
+        """
+        columns, rows = self.get_tables()[0]
+        return build_frame(columns, rows, types, type_system)
+
+    def _is_element(self, value):
+        # Nodes and relationships are the only values with a "self" URI.
+        return isinstance(value, dict) and "self" in value
+
+
+class Neo4jBatchCypherResponse(Neo4jCypherResponse):
+    """
+    Container class for a response to a batch of CypherPlugin queries. The
+    content holds one job per query, with the query's result in its body.
+
+    """
+    def get_tables(self):
+        """
+        Returns a list containing a (columns, rows) tuple for each statement.
+
+        :rtype: list
+
+        """
+        return [(job['body']['columns'], job['body']['data'])
+                for job in self.content or []]
+
+
+class Neo4jTransactionResponse(Neo4jCypherResponse):
+    """
+    Container class for a response from the transactional Cypher endpoint,
+    which Neo4j 2.0 added.
+
+    The content holds one result per statement, each with its columns and
+    rows. The results are the nodes and relationships in every column of
+    every row.
+
+    :ivar transaction_id: The ID of the open transaction, or None if the
+        request committed or rolled back the transaction.
+
+    """
+    def __init__(self, response, config):
+        super(Neo4jTransactionResponse, self).__init__(response, config)
+        self.transaction_id = self._get_transaction_id()
+
+    def get_content(self, response):
+        """
+        Returns a dict containing the content from the response, and raises
+        an error if any of the statements failed.
+
+        :param response: httplib2 response: (headers, content).
+        :type response: tuple
+
+        :rtype: dict
+
+        """
+        content = super(Neo4jTransactionResponse, self).get_content(response)
+        content = content or dict(results=[], errors=[])
+        # The endpoint returns 200 even when a statement fails.
+        raise_cypher_errors(content.get('errors'), response)
+        return content
+
+    def get_tables(self):
+        """
+        Returns a list containing a (columns, rows) tuple for each statement.
+
+        :rtype: list
+
+        """
+        return [(result['columns'], [item['rest'] for item in result['data']])
+                for result in self.content.get('results', [])]
+
+    def _get_transaction_id(self):
+        # An open transaction's commit URI is ".../transaction/<id>/commit"
+        commit_uri = self.content.get('commit')
+        if commit_uri and self.content.get('transaction'):
+            return int(commit_uri.rstrip("/").split("/")[-2])
+
+
+class Neo4jStream(object):
+    """
+    The rows of a streamed Cypher response, decoded as they're iterated.
+
+    Only the first statement's rows are returned. The rows are read as
+    they arrive, so the statement's "columns" have to come before its 
+    "data", as Neo4j sends them; a ValueError is raised otherwise.
+
+    :param chunks: Iterable of the response body's byte chunks.
+    :type chunks: iterable
+
+    :param config: Config object.
+    :type config: bulbs.config.Config
+
+    :param transactional: The response is from the transactional endpoint,
+        not the CypherPlugin. Defaults to True.
+    :type transactional: bool
+
+    """
+    def __init__(self, chunks, config, transactional=True):
+        self.config = config
+        self.stream = JSONStream(chunks)
+        self.transactional = transactional
+        self.columns = None
+        # True while the stream is inside the statement's result object.
+        self.in_result = False
+
+    def __iter__(self):
+        return self.get_rows()
+
+    def get_columns(self):
+        """
+        Returns the statement's columns, reading the stream up to them.
+
+        :rtype: list
+
+        """
+        if self.columns is None:
+            self.columns = self._read_columns()
+        return self.columns
+
+    def get_rows(self):
+        """
+        Returns a generator of the statement's rows, decoded one at a time.
+
+        :rtype: Generator of lists
+
+        """
+        stream = self.stream
+        self.get_columns()
+        if self.in_result is False:
+            return
+        if self._next_key("data") is None:
+            raise ValueError('Cypher response has no "data" after its "columns"')
+        stream.expect("[")
+        while stream.peek() != "]":
+            if stream.peek() == ",":
+                stream.skip()
+            row = stream.decode()
+            yield row['rest'] if self.transactional else row
+        stream.expect("]")
+        self._read_errors()
+
+    def to_frame(self, types=None, type_system=None):
+        """
+        Decodes the rows straight into a columnar Frame.
+
+        :param types: Optional dict of Property objects keyed by column.
+        :type types: dict
+
+        :param type_system: TypeSystem used to convert the typed columns.
+        :type type_system: TypeSystem
+
+        :rtype: Frame
+
+        """
+        return build_frame(self.get_columns(), self.get_rows(), types, type_system)
+
+    def _read_columns(self):
+        stream = self.stream
+        stream.expect("{")
+        if self.transactional:
+            if self._next_key("results") is None:
+                return []
+            stream.expect("[")
+            if stream.peek() != "{":
+                # The statement failed before returning any rows.
+                self._read_errors()
+                return []
+            stream.expect("{")
+        key = self._next_key("columns", "data")
+        if key is None:
+            raise ValueError('Cypher response has no "columns"')
+        if key != "columns":
+            raise ValueError('Cypher response has "data" before "columns", '
+                             'which the stream needs first')
+        self.in_result = True
+        return stream.decode()
+
+    def _read_errors(self):
+        # The CypherPlugin reports errors with the response status instead.
+        if self.transactional is False:
+            return
+        stream = self.stream
+        if self.in_result:
+            # The rest of the statement's result, then the other statements'.
+            self.in_result = False
+            self._next_key()
+        while stream.peek() == ",":
+            stream.skip()
+            stream.decode()
+        stream.expect("]")
+        # The rest of the response, which raises its errors.
+        self._next_key()
+
+    def _next_key(self, *keys):
+        # Moves to the next of the keys in the current object, skipping the
+        # other values, and returns it, or None at the end of the object.
+        stream = self.stream
+        while True:
+            key = stream.next_key()
+            if key is None or key in keys:
+                return key
+            value = stream.decode()
+            if key == "errors" and self.transactional:
+                raise_cypher_errors(value, None)
+
+
+def raise_cypher_errors(errors, response):
+    """
+    Raises an error if the transactional endpoint returned any errors.
+
+    :param errors: The errors in the response content.
+    :type errors: list
+
+    :param response: httplib2 response: (headers, content).
+    :type response: tuple
+
+    :rtype: None
+
+    """
+    if errors:
+        log.error("Cypher errors: %s", errors)
+        if all(".ClientError." in error.get('code', '') for error in errors):
+            bad_request(response or errors)
+        server_error(response or errors)
+
+
+class Neo4jCypherRequest(Neo4jRequest):
+    """
+    Makes HTTP requests to the CypherPlugin and returns a Neo4jCypherResponse.
+
+    """
+    response_class = Neo4jCypherResponse
+
+
+class Neo4jBatchCypherRequest(Neo4jRequest):
+    """
+    Makes HTTP requests to the batch endpoint and returns a 
+    Neo4jBatchCypherResponse.
+
+    """
+    response_class = Neo4jBatchCypherResponse
+
+
+class Neo4jTransactionRequest(Neo4jRequest):
+    """
+    Makes HTTP requests to the transactional Cypher endpoint and returns a 
+    Neo4jTransactionResponse.
+
+    """
+    response_class = Neo4jTransactionResponse
+
+
 class Neo4jClient(Client):
     """
     Low-level client that sends a request to Neo4j Server and returns a response.
@@ -329,6 +647,7 @@ class Neo4jClient(Client):
     :ivar config: Config object.
     :ivar registry: Registry object.
     :ivar scripts: GroovyScripts object.  
+    :ivar queries: CypherQueries object.
     :ivar type_system: JSONTypeSystem object.
     :ivar request: Neo4jRequest object.
 
@@ -346,12 +665,27 @@ class Neo4jClient(Client):
     #: Request class for the Client.
     request_class = Neo4jRequest
 
+    #: Request class for the CypherPlugin.
+    cypher_request_class = Neo4jCypherRequest
+
+    #: Request class for batches of CypherPlugin queries.
+    batch_request_class = Neo4jBatchCypherRequest
+
+    #: Request class for the transactional Cypher endpoint.
+    transaction_request_class = Neo4jTransactionRequest
+
 
     def __init__(self, config=None):
         self.config = config or Config(self.default_uri)
         self.registry = Registry(self.config)
         self.type_system = JSONTypeSystem()
         self.request = self.request_class(self.config, self.type_system.content_type)
+        self.cypher_request = self.cypher_request_class(
+            self.config, self.type_system.content_type)
+        self.batch_request = self.batch_request_class(
+            self.config, self.type_system.content_type)
+        self.transaction_request = self.transaction_request_class(
+            self.config, self.type_system.content_type)
 
         # Neo4j supports Gremlin so include the Gremlin-Groovy script library
         self.scripts = GroovyScripts()
@@ -362,6 +696,13 @@ class Neo4jClient(Client):
 
         # Add it to the registry. This allows you to have more than one scripts namespace.
         self.registry.add_scripts("gremlin", self.scripts)
+        self.request.scripts = self.scripts
+
+        # The named Cypher queries library
+        self.queries = CypherQueries()
+        self.registry.add_scripts("cypher", self.queries)
+        self.cypher_request.scripts = self.queries
+        self.transaction_request.scripts = self.queries
         
 
     # Gremlin
@@ -387,7 +728,7 @@ class Neo4jClient(Client):
 
     def cypher(self, query, params=None):
         """
-        Executes a Cypher query and returns the Response.
+        Executes a Cypher query in its own transaction and returns the Response.
 
         :param query: Cypher query to execute.
         :type query: str
@@ -395,17 +736,135 @@ class Neo4jClient(Client):
         :param params: Param bindings for the query.
         :type params: dict
 
-        :rtype: Neo4jResponse
+        :rtype: Neo4jCypherResponse, or Neo4jTransactionResponse if 
+                config.cypher_transactions is True
 
         """
+        if self.config.cypher_transactions is True:
+            return self.cypher_statements([(query, params)])
         path = cypher_path
-        params = dict(query=query,params=params)
-        resp = self.request.post(path, params)
+        params = dict(query=query, params=params)
+        return self.cypher_request.post(path, params)
 
-        # Cypher data hack
-        resp.total_size = len(resp.results.data)
-        resp.results = (Neo4jResult(result[0], self.config) for result in resp.results.data)
-        return resp
+    def cypher_statements(self, statements):
+        """
+        Executes the Cypher statements in one transaction and one request, 
+        and returns the Response.
+
+        :param statements: List of (query, params) tuples.
+        :type statements: list
+
+        :rtype: Neo4jBatchCypherResponse, or Neo4jTransactionResponse if 
+                config.cypher_transactions is True
+
+        .. note:: Without the transactional endpoint the queries are sent
+                  to the CypherPlugin as a batch, which Neo4j runs in one
+                  transaction.
+
+        """
+        if self.config.cypher_transactions is not True:
+            path = batch_path
+            params = self._build_batch_jobs(statements)
+            return self.batch_request.post(path, params)
+        path = build_path(transaction_path, "commit")
+        params = self._build_statements(statements)
+        return self.transaction_request.post(path, params)
+
+    def cypher_stream(self, query, params=None):
+        """
+        Executes a Cypher query in its own transaction and returns its rows
+        as a Neo4jStream, which decodes them as the response arrives.
+
+        :param query: Cypher query to execute.
+        :type query: str
+
+        :param params: Param bindings for the query.
+        :type params: dict
+
+        :rtype: Neo4jStream
+
+        """
+        headers = {'X-Stream': "true"}
+        if self.config.cypher_transactions is not True:
+            path = cypher_path
+            params = dict(query=query, params=params)
+            chunks = self.cypher_request.stream(POST, path, params, headers)
+            return Neo4jStream(chunks, self.config, transactional=False)
+        path = build_path(transaction_path, "commit")
+        params = self._build_statements([(query, params)])
+        chunks = self.transaction_request.stream(POST, path, params, headers)
+        return Neo4jStream(chunks, self.config)
+
+    def begin_transaction(self, statements=None):
+        """
+        Opens a transaction, executes any statements in it, and returns the 
+        Response. The transaction ID is in resp.transaction_id.
+
+        :param statements: Optional list of (query, params) tuples.
+        :type statements: list
+
+        :rtype: Neo4jTransactionResponse
+
+        .. note:: Needs Neo4j 2.0 or later.
+
+        """
+        path = transaction_path
+        params = self._build_statements(statements)
+        return self.transaction_request.post(path, params)
+
+    def execute_transaction(self, transaction_id, statements):
+        """
+        Executes the statements in the open transaction and returns the Response.
+
+        :param transaction_id: Transaction ID.
+        :type transaction_id: int
+
+        :param statements: List of (query, params) tuples.
+        :type statements: list
+
+        :rtype: Neo4jTransactionResponse
+
+        .. note:: Needs Neo4j 2.0 or later.
+
+        """
+        path = build_path(transaction_path, transaction_id)
+        params = self._build_statements(statements)
+        return self.transaction_request.post(path, params)
+
+    def commit_transaction(self, transaction_id, statements=None):
+        """
+        Executes any statements in the open transaction, commits it, and 
+        returns the Response.
+
+        :param transaction_id: Transaction ID.
+        :type transaction_id: int
+
+        :param statements: Optional list of (query, params) tuples.
+        :type statements: list
+
+        :rtype: Neo4jTransactionResponse
+
+        .. note:: Needs Neo4j 2.0 or later.
+
+        """
+        path = build_path(transaction_path, transaction_id, "commit")
+        params = self._build_statements(statements)
+        return self.transaction_request.post(path, params)
+
+    def rollback_transaction(self, transaction_id):
+        """
+        Rolls back the open transaction and returns the Response.
+
+        :param transaction_id: Transaction ID.
+        :type transaction_id: int
+
+        :rtype: Neo4jTransactionResponse
+
+        .. note:: Needs Neo4j 2.0 or later.
+
+        """
+        path = build_path(transaction_path, transaction_id)
+        return self.transaction_request.delete(path, params=None)
 
     # Vertex Proxy
 
@@ -678,6 +1137,34 @@ class Neo4jClient(Client):
         params = dict(_id=_id,label=label,start=start,limit=limit)
         return self.gremlin(script,params)
 
+    def neighbourhood(self, _id, depth, labels=None, direction="both", max_nodes=None):
+        """
+        Returns the vertices and edges within depth hops of the vertex, 
+        deduplicated, in one response: the vertices, then the edges.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param depth: Number of hops from the vertex.
+        :type depth: int
+
+        :param labels: Optional edge labels to follow. Defaults to None (all).
+        :type labels: list or None
+
+        :param direction: Edge direction: "out", "in", or "both".
+        :type direction: str
+
+        :param max_nodes: Optional maximum number of vertices. 
+        :type max_nodes: int or None
+
+        :rtype: Neo4jResponse
+
+        """
+        script = self.scripts.get('neighbourhood')
+        params = dict(_id=_id,depth=depth,labels=labels,direction=direction,
+                      max_nodes=max_nodes)
+        return self.gremlin(script,params)
+
     #: Index Proxy - Vertex
 
     def create_vertex_index(self, index_name, *args, **kwds):
@@ -1050,6 +1537,31 @@ class Neo4jClient(Client):
         script = self.scripts.get("update_indexed_vertex")
         return self.gremlin(script,params)
 
+    def patch_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Updates only the given properties of an indexed vertex, and only 
+        their index entries, and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Changed property data. None values remove the property.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: Neo4jResponse
+
+        """
+        # Don't remove null values here; they mark properties to remove.
+        params = dict(_id=_id,data=data,index_name=index_name,keys=keys)
+        script = self.scripts.get("patch_indexed_vertex")
+        return self.gremlin(script,params)
+
     # Model Proxy - Edge
 
     def create_indexed_edge(self, outV, label, inV, data, index_name, keys=None):
@@ -1109,6 +1621,31 @@ class Neo4jClient(Client):
         script = self.scripts.get("update_indexed_edge")
         return self.gremlin(script,params)
 
+    def patch_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Updates only the given properties of an indexed edge, and only 
+        their index entries, and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Changed property data. None values remove the property.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: Neo4jResponse
+
+        """
+        # Don't remove null values here; they mark properties to remove.
+        params = dict(_id=_id,data=data,index_name=index_name,keys=keys)
+        script = self.scripts.get("patch_indexed_edge")
+        return self.gremlin(script,params)
+
 
     # Metadata
 
@@ -1163,6 +1700,21 @@ class Neo4jClient(Client):
 
     # Private 
 
+    def _build_statements(self, statements):
+        # "rest" returns nodes and relationships with their URIs so they can
+        # be initialized as elements; other values are returned as they are.
+        statements = [dict(statement=query, parameters=params or {}, 
+                           resultDataContents=["rest"]) 
+                      for query, params in statements or []]
+        return dict(statements=statements)
+
+    def _build_batch_jobs(self, statements):
+        # Batch jobs are sent to paths relative to the root URI.
+        to = "/%s" % cypher_path
+        jobs = [dict(method=POST, to=to, body=dict(query=query, params=params), id=i)
+                for i, (query, params) in enumerate(statements or [])]
+        return jobs
+
     def _remove_null_values(self,data):
         """Removes null property values because they aren't valid in Neo4j."""
         # Neo4j Server uses PUTs to overwrite all properties so no need
@@ -5,14 +5,30 @@
 #
 
 import os
-import re
 import yaml 
-from string import Template
+import six  # Python 3
 
-from bulbs.utils import initialize_elements
+from bulbs.element import Element
+from bulbs.utils import initialize_elements, initialize_element, get_file_path
 
 class Cypher(object):
+    """
+    Runs Cypher queries on the CypherPlugin, or on the transactional Cypher
+    endpoint if config.cypher_transactions is True.
 
+    :param client: The Neo4jClient object.
+    :type client: Neo4jClient
+
+    Example:
+
+    >>> from bulbs.neo4jserver import Graph
+    >>> g = Graph()
+    >>> resp = g.cypher.run("root_node")
+    >>> with g.cypher.transaction() as tx:
+    ...     tx.add("CREATE (n {name: {name}}) RETURN n", dict(name="James"))
+    ...     tx.add("CREATE (n {name: {name}}) RETURN n", dict(name="Julie"))
+
+    """
     def __init__(self, client):
         self.client = client
 
@@ -21,77 +37,311 @@ class Cypher(object):
         resp = self.client.cypher(query, params)
         return initialize_elements(self.client, resp)
 
-    def table(self, query, params=None):
+    def table(self, query, params=None, columnar=False, types=None):
+        """
+        Returns the query's columns and rows, or a columnar Frame.
+
+        :param query: Cypher query.
+        :type query: str
+
+        :param params: Param bindings for the query.
+        :type params: dict
+
+        :param columnar: Return a Frame with one typed array per column, 
+            decoded from the streamed response without building the rows.
+        :type columnar: bool
+
+        :param types: Optional dict of Property objects keyed by column, 
+            used to convert and type the Frame's columns.
+        :type types: dict
+
+        :rtype: tuple of (columns, rows), or Frame if columnar is True
+
+        """
+        if columnar:
+            stream = self.client.cypher_stream(query, params)
+            return stream.to_frame(types, self.client.type_system)
         resp = self.client.cypher(query,params)
-        columns = resp.content['columns']
-        data = resp.content['data']
-        return columns, data
+        columns, rows = resp.get_tables()[0]
+        return columns, rows
 
     def execute(self, query, params=None):
         return self.client.cypher(query, params)
+
+    def stream(self, query, params=None, elements=False):
+        """
+        Runs the query and yields its rows as the server streams them back.
+
+        Rows are decoded one at a time as they're iterated, so a large 
+        result never has to fit in memory.
+
+        :param query: Cypher query.
+        :type query: str
+
+        :param params: Param bindings for the query.
+        :type params: dict
+
+        :param elements: Yield the nodes and relationships in each row, 
+            like query(), instead of a tuple per row, like table().
+        :type elements: bool
+
+        :rtype: Generator of tuples, or of elements if elements is True
+
+        """
+        result_class = self.client.cypher_request.response_class.result_class
+        for row in self.client.cypher_stream(query, params):
+            values = [self._initialize_value(value, result_class) for value in row]
+            if elements:
+                for value in values:
+                    if isinstance(value, Element):
+                        yield value
+            else:
+                yield tuple(values)
+
+    def run(self, name, **params):
+        """
+        Runs the named query from the client's query library with the 
+        params bound, and returns the Response.
+
+        :param name: Name of the query in the client's CypherQueries.
+        :type name: str
+
+        :param params: Param bindings for the query.
+        :type params: dict
+
+        :rtype: Neo4jCypherResponse
+
+        """
+        query = self.client.queries.get(name)
+        return self.client.cypher(query, params)
+
+    def execute_all(self, statements):
+        """
+        Executes the statements in one transaction and one request, and 
+        returns the Response.
+
+        :param statements: List of (query, params) tuples.
+        :type statements: list
+
+        :rtype: Neo4jCypherResponse
+
+        """
+        return self.client.cypher_statements(statements)
+
+    def transaction(self):
+        """
+        Returns a Transaction for running statements across several requests.
+        Statements that are only queued and committed don't need the 
+        transactional endpoint; execute() does.
+
+        :rtype: Transaction
+
+        """
+        return Transaction(self.client)
+
+    def _initialize_value(self, value, result_class):
+        # Nodes and relationships are the only values with a "self" URI.
+        if isinstance(value, dict) and "self" in value:
+            result = result_class(value, self.client.config)
+            return initialize_element(self.client, result)
+        return value
+
+
+class Transaction(object):
+    """
+    A transaction on the transactional Cypher endpoint.
+
+    Statements are queued by add() and sent with the next execute() or 
+    commit(), so statements that don't need each other's results commit 
+    in one request. Use it as a context manager to commit when the block 
+    exits, or roll back if it raises.
+
+    :param client: The Neo4jClient object.
+    :type client: Neo4jClient
+
+    :ivar transaction_id: The open transaction's ID, or None.
+    :ivar statements: The queued (query, params) tuples.
+
+    """
+    def __init__(self, client):
+        self.client = client
+        self.transaction_id = None
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def add(self, query, params=None):
+        """
+        Queues a statement to be sent with the next execute() or commit().
+
+        :param query: Cypher query.
+        :type query: str
+
+        :param params: Param bindings for the query.
+        :type params: dict
+
+        :rtype: None
+
+        """
+        self.statements.append((query, params))
+
+    def execute(self, query=None, params=None):
+        """
+        Sends the queued statements, and the query if given, in the 
+        transaction without committing it, and returns the Response.
+
+        :param query: Optional Cypher query.
+        :type query: str
+
+        :param params: Param bindings for the query.
+        :type params: dict
+
+        :rtype: Neo4jTransactionResponse
+
+        """
+        if query is not None:
+            self.add(query, params)
+        statements = self._pop_statements()
+        if self.transaction_id is None:
+            resp = self.client.begin_transaction(statements)
+            self.transaction_id = resp.transaction_id
+        else:
+            resp = self.client.execute_transaction(self.transaction_id, statements)
+        return resp
+
+    def commit(self):
+        """
+        Sends the queued statements, commits the transaction, and returns 
+        the Response.
+
+        :rtype: Neo4jTransactionResponse
+
+        """
+        statements = self._pop_statements()
+        if self.transaction_id is None:
+            # Nothing is open on the server, so it's one request.
+            return self.client.cypher_statements(statements)
+        transaction_id, self.transaction_id = self.transaction_id, None
+        return self.client.commit_transaction(transaction_id, statements)
+
+    def rollback(self):
+        """
+        Drops the queued statements and rolls back the transaction.
+
+        :rtype: Neo4jTransactionResponse or None
+
+        """
+        self.statements = []
+        if self.transaction_id is not None:
+            transaction_id, self.transaction_id = self.transaction_id, None
+            return self.client.rollback_transaction(transaction_id)
+
+    def _pop_statements(self):
+        statements, self.statements = self.statements, []
+        return statements
         
 
-class ScriptError(Exception):
-    pass
+class CypherQueries(object):
+    """
+    Store and manage an index of named Cypher queries.
 
+    Queries are loaded once from YAML files that map names to queries, 
+    and they're always run with their params bound, never templated, so 
+    the server can reuse the query plan.
 
-class Yaml(object):
-    """Load Gremlin scripts from a YAML source file."""
+    :param file_path: Path to the base Cypher queries file.
+    :type file_path: str
 
-    def __init__(self,file_name=None):
-        self.file_name = self._get_file_name(file_name)
-        self.templates = self._get_templates(self.file_name)
+    :ivar source_files: List containing the absolute paths to the query files,
+                        in the order they were added.
+    :ivar queries: Dict mapping query names to the actual queries.
 
-    def get(self,name,params={}):
-        """Return a Gremlin script, generated from the params."""
-        template = self.templates.get(name)
-        #params = self._quote_params(params)
-        return template.substitute(params)
+    .. note:: Use the update() method to add subsequent query files. 
+              Order matters. Queries are overridden if subsequently added
+              files contain the same name as a previously added file.
+
+    """
+    #: Relative path to the default query file
+    default_file = "cypher.yaml"
+
+    def __init__(self, file_path=None):
+        self.source_files = list()
+        self.queries = dict()
+
+        # reverse index of queries, built by get_name() when needed
+        self._names = None
+
+        if file_path is None:
+            file_path = get_file_path(__file__, self.default_file)
+        self.update(file_path)
+
+    def get(self, name):
+        """
+        Returns the Cypher query with the name.
         
+        :param name: Query name.
+        :type name: str
+
+        :rtype: str
+
+        """
+        return self.queries[name]
+
+    def get_name(self, query):
+        """
+        Returns the name of a Cypher query, or None if the query isn't in 
+        the index.
+
+        :param query: Cypher query, as returned by get().
+        :type query: str
+
+        :rtype: str or None
+
+        """
+        if self._names is None:
+            self._names = dict((query, name) for name, query in self.queries.items())
+        return self._names.get(query)
+
+    def update(self, file_path):
+        """
+        Updates the query index with the queries in the YAML file.
+
+        :rtype: None
+
+        """
+        file_path = os.path.abspath(file_path)
+        queries = self._get_queries(file_path)
+        self.source_files.append(file_path)
+        self.queries.update(queries)
+        self._names = None
+
     def refresh(self):
-        """Refresh the stored templates from the YAML source."""
-        self.templates = self._get_templates()
-
-    def override(self,file_name):
-        new_templates = self._get_templates(file_name)
-        self.templates.update(new_templates)
-
-    def _get_file_name(self,file_name):
-        if file_name is None:
-            dir_name = os.path.dirname(__file__)
-            file_name = utils.get_file_path(dir_name,"gremlin.yaml")
-        return file_name
-
-    def _get_templates(self,file_name):
-        templates = dict()
-        f = open(file_name)
-        yaml_map = yaml.load(f)    
+        """
+        Refreshes the query index by re-reading the YAML source files.
+
+        :rtype: None
+
+        """
+        for file_path in self.source_files:
+            queries = self._get_queries(file_path)
+            self.queries.update(queries)
+        self._names = None
+
+    def _get_queries(self, file_path):
+        with open(file_path) as f:
+            yaml_map = yaml.safe_load(f) or {}
+        queries = dict()
         for name in yaml_map: # Python 3
-            template = yaml_map[name]
-            #template = ';'.join(lines.split('\n'))
-            method_signature = self._get_method_signature(template)
-            templates[name] = Template(template)
-        return templates
-
-    def _get_method_signature(self,template):
-        lines = template.split('\n')
-        first_line = lines[0]
-        pattern = 'def(.*){'
-        try:
-            method_signature = re.search(pattern,first_line).group(1).strip()
-            return method_signature
-        except AttributeError:
-            raise ScriptError("Each Gremln script in the YAML file must be defined as a Groovy method.")
-
-    def _quote_params(self,params):
-        for key in params:   # Python 3
-            value = params[key]
-            params[key] = self._quote(value)
-        return params
-
-    def _quote(self, value):
-        if type(value) == str:
-            value = "'%s'" % value
-        elif value is None:
-            value = ""
-        return value
+            query = yaml_map[name]
+            if not isinstance(query, six.string_types):
+                raise ValueError("Cypher query '%s' in %s must be a string." 
+                                 % (name, file_path))
+            queries[name] = query.strip()
+        return queries
@@ -58,7 +58,7 @@ class Graph(BaseGraph):
         self.gremlin = Gremlin(self.client)
         self.scripts = self.client.scripts    # for convienience 
 
-        # Cypher; TODO: Cypher Queries library object
+        # Cypher, with the named queries library in self.cypher.run()
         self.cypher = Cypher(self.client)
 
     def set_metadata(self, key, value):
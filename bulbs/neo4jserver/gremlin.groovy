@@ -31,6 +31,8 @@ def create_indexed_vertex(data,index_name,keys) {
 }
 
 
+// Diffs the old and new values so only the index entries of changed keys
+// are removed and re-added; unchanged keys aren't touched.
 def update_indexed_vertex(_id, data, index_name, keys) {
   vertex = g.getRawGraph().getNodeById(_id)
   manager = g.getRawGraph().index()
@@ -38,13 +40,51 @@ def update_indexed_vertex(_id, data, index_name, keys) {
   g.startTransaction()
   try {
     index = manager.forNodes(index_name)
-    index.remove(vertex)
-    for (String key in vertex.getPropertyKeys())
+    for (String key in vertex.getPropertyKeys().toList()) {
+      if (data.get(key) != null) continue;
+      if (keys == null || keys.contains(key))
+	index.remove(vertex,key,String.valueOf(vertex.getProperty(key)))
       vertex.removeProperty(key)
+    }
     for (entry in data.entrySet()) {
       if (entry.value == null) continue;
+      old = vertex.hasProperty(entry.key) ? vertex.getProperty(entry.key) : null
+      if (old == entry.value) continue;
+      indexed = (keys == null || keys.contains(entry.key))
+      if (indexed && old != null)
+	index.remove(vertex,entry.key,String.valueOf(old))
       vertex.setProperty(entry.key,entry.value)
-      if (keys == null || keys.contains(entry.key))
+      if (indexed)
+	index.add(vertex,entry.key,String.valueOf(entry.value))
+    }
+    g.stopTransaction(TransactionalGraph.Conclusion.SUCCESS)
+    return vertex 
+  } catch (e) {
+    g.stopTransaction(TransactionalGraph.Conclusion.FAILURE)
+    return e
+  }
+}
+
+// Only touches the keys in data; a null value removes the property.
+def patch_indexed_vertex(_id, data, index_name, keys) {
+  vertex = g.getRawGraph().getNodeById(_id)
+  manager = g.getRawGraph().index()
+  g.setMaxBufferSize(0)
+  g.startTransaction()
+  try {
+    index = manager.forNodes(index_name)
+    for (entry in data.entrySet()) {
+      old = vertex.hasProperty(entry.key) ? vertex.getProperty(entry.key) : null
+      if (old == entry.value) continue;
+      indexed = (keys == null || keys.contains(entry.key))
+      if (indexed && old != null)
+	index.remove(vertex,entry.key)
+      if (entry.value == null) {
+	vertex.removeProperty(entry.key)
+	continue;
+      }
+      vertex.setProperty(entry.key,entry.value)
+      if (indexed)
 	index.add(vertex,entry.key,String.valueOf(entry.value))
     }
     g.stopTransaction(TransactionalGraph.Conclusion.SUCCESS)
@@ -92,13 +132,51 @@ def update_indexed_edge(_id, data, index_name, keys) {
   g.startTransaction()
   try {
     index = manager.forRelationships(index_name)
-    index.remove(edge)
-    for (String key in edge.getPropertyKeys())
+    for (String key in edge.getPropertyKeys().toList()) {
+      if (data.get(key) != null) continue;
+      if (keys == null || keys.contains(key))
+	index.remove(edge,key,String.valueOf(edge.getProperty(key)))
       edge.removeProperty(key)
+    }
     for (entry in data.entrySet()) {
       if (entry.value == null) continue;
+      old = edge.hasProperty(entry.key) ? edge.getProperty(entry.key) : null
+      if (old == entry.value) continue;
+      indexed = (keys == null || keys.contains(entry.key))
+      if (indexed && old != null)
+	index.remove(edge,entry.key,String.valueOf(old))
       edge.setProperty(entry.key,entry.value)
-      if (keys == null || keys.contains(entry.key))
+      if (indexed)
+	index.add(edge,entry.key,String.valueOf(entry.value))
+    }
+    g.stopTransaction(TransactionalGraph.Conclusion.SUCCESS)
+    return edge
+  } catch (e) { 
+    g.stopTransaction(TransactionalGraph.Conclusion.FAILURE)
+    return e
+  }
+}
+
+def patch_indexed_edge(_id, data, index_name, keys) {
+  neo4j = g.getRawGraph()
+  manager = neo4j.index()
+  edge = neo4j.getRelationshipById(_id)
+  g.setMaxBufferSize(0)
+  g.startTransaction()
+  try {
+    index = manager.forRelationships(index_name)
+    for (entry in data.entrySet()) {
+      old = edge.hasProperty(entry.key) ? edge.getProperty(entry.key) : null
+      if (old == entry.value) continue;
+      indexed = (keys == null || keys.contains(entry.key))
+      if (indexed && old != null)
+	index.remove(edge,entry.key)
+      if (entry.value == null) {
+	edge.removeProperty(entry.key)
+	continue;
+      }
+      edge.setProperty(entry.key,entry.value)
+      if (indexed)
 	index.add(edge,entry.key,String.valueOf(entry.value))
     }
     g.stopTransaction(TransactionalGraph.Conclusion.SUCCESS)
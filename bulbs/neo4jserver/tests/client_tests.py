@@ -8,6 +8,7 @@ from bulbs.tests.client_index_tests import ClientIndexTestCase
 from bulbs.factory import Factory
 from bulbs.element import Vertex, Edge
 from bulbs.neo4jserver.index import ExactIndex
+from bulbs.neo4jserver.cypher import Cypher
 
 import time
 
@@ -66,6 +67,51 @@ class CypherTestCase(unittest.TestCase):
         resp = self.client.cypher(query,params)
         #print resp.raw
 
+    def test_cypher_run(self):
+        resp = self.client.cypher("CREATE (n {name: {name}}) RETURN n", dict(name="James"))
+        _id = next(resp.results).get_id()
+        cypher = Cypher(self.client)
+        resp = cypher.run("get_vertex", _id=_id)
+        assert next(resp.results).get_id() == _id
+
+    def test_cypher_statements(self):
+        query = "CREATE (n {name: {name}}) RETURN n, n.name"
+        statements = [(query, dict(name="James")), (query, dict(name="Julie"))]
+        resp = self.client.cypher_statements(statements)
+        tables = resp.get_tables()
+        assert len(tables) == 2
+        assert tables[0][0] == ["n", "n.name"]
+        assert tables[1][1][0][1] == "Julie"
+        assert resp.total_size == 2
+
+    def test_cypher_stream(self):
+        query = "START n=node(*) RETURN n, id(n) LIMIT 10"
+        stream = self.client.cypher_stream(query)
+        assert stream.get_columns() == ["n", "id(n)"]
+        for node, _id in stream:
+            assert node['self'].endswith("/%d" % _id)
+
+
+class TransactionalCypherTestCase(CypherTestCase):
+    """Runs the Cypher tests on the transactional endpoint (Neo4j 2.0)."""
+
+    def setUp(self):
+        config = Config(NEO4J_URI)
+        config.cypher_transactions = True
+        self.client = Neo4jClient(config)
+
+    def test_transaction(self):
+        query = "CREATE (n {name: {name}}) RETURN n"
+        resp = self.client.begin_transaction([(query, dict(name="James"))])
+        assert resp.transaction_id is not None
+        _id = next(resp.results).get_id()
+
+        resp = self.client.rollback_transaction(resp.transaction_id)
+        resp = self.client.cypher("START n=node(*) WHERE id(n) = {_id} RETURN n", 
+                                  dict(_id=_id))
+        assert resp.total_size == 0
+
+
 def neo4j_client_suite():
     suite = unittest.TestSuite()
     suite.addTest(unittest.makeSuite(Neo4jClientTestCase))
@@ -73,6 +119,7 @@ def neo4j_client_suite():
     suite.addTest(unittest.makeSuite(Neo4jIndexTestCase))
     #suite.addTest(unittest.makeSuite(GremlinTestCase))
     #suite.addTest(unittest.makeSuite(CypherTestCase))
+    #suite.addTest(unittest.makeSuite(TransactionalCypherTestCase))
     return suite
 
 if __name__ == '__main__':
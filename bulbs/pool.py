@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Process-wide pool of clients shared by unpickled elements.
+
+"""
+import threading
+
+from .utils import get_logger
+
+log = get_logger(__name__)
+
+
+class ClientPool(object):
+    """
+    Maps (client class, config) to a shared client object.
+
+    Building a client creates a Registry, an HTTP connection object and
+    parses the Gremlin scripts, so unpickled elements attach to a pooled
+    client instead of each building their own.
+
+    Example:
+
+    >>> from bulbs.pool import client_pool
+    >>> from bulbs.neo4jserver import Neo4jClient
+    >>> client = client_pool.get(Neo4jClient, config)
+
+    """
+    def __init__(self):
+        self.clients = dict()
+        self.lock = threading.Lock()
+
+    def get(self, client_class, config):
+        """
+        Returns the pooled client for the class and config, creating it if
+        there isn't one yet.
+
+        :param client_class: Client class.
+        :type client_class: class
+
+        :param config: Config object.
+        :type config: Config
+
+        :rtype: Client
+
+        """
+        key = self._get_key(client_class, config)
+        with self.lock:
+            client = self.clients.get(key)
+            if client is None:
+                log.debug("Creating pooled %s for %s",
+                          client_class.__name__, config.root_uri)
+                client = self.clients[key] = client_class(config)
+        return client
+
+    def add(self, client):
+        """
+        Adds an existing client to the pool unless its class and config
+        already have a pooled client.
+
+        :param client: Client object.
+        :type client: Client
+
+        :rtype: None
+
+        """
+        key = self._get_key(client.__class__, client.config)
+        with self.lock:
+            self.clients.setdefault(key, client)
+
+    def clear(self):
+        """
+        Removes all the clients from the pool.
+
+        :rtype: None
+
+        """
+        with self.lock:
+            self.clients.clear()
+
+    def _get_key(self, client_class, config):
+        # Unpickled configs are new objects, so key on the config's values.
+        return (client_class, get_config_fingerprint(config))
+
+
+def get_config_fingerprint(config):
+    """
+    Returns a hashable fingerprint of the config's settings.
+
+    :param config: Config object.
+    :type config: Config
+
+    :rtype: tuple
+
+    """
+    items = []
+    for key in sorted(config.__dict__):
+        value = config.__dict__[key]
+        try:
+            hash(value)
+        except TypeError:
+            value = repr(value)
+        items.append((key, value))
+    return tuple(items)
+
+
+#: The process-wide ClientPool used by Element.__setstate__.
+client_pool = ClientPool()
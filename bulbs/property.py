@@ -18,7 +18,7 @@ import datetime
 import dateutil.parser
 from numbers import Number
 
-from .utils import get_logger, to_datetime
+from .utils import get_logger, to_datetime, get_defining_class
 
 log = get_logger(__name__)
 
@@ -51,6 +51,12 @@ class Property(object):
     .. note:: If no Properties have index=True, all Properties are indexed. 
 
     """
+    #: Name of the type system's database Converter method used by to_db().
+    db_converter = None
+
+    #: Name of the type system's python Converter method used by to_python().
+    python_converter = None
+
     def __init__(self, fget=None, name=None, default=None, \
                      nullable=True, unique=False, indexed=False):
         self.fget = fget
@@ -138,6 +144,40 @@ class Property(object):
             value = None
         return value
 
+    def get_db_converter(self, type_system):
+        """
+        Returns a function that converts a Python value to its database type.
+
+        :param type_system: TypeSystem object.
+        :type type_system: TypeSystem
+
+        :rtype: function
+
+        .. note:: Binds straight to the Converter method named by db_converter
+                  unless a subclass customizes to_db().
+
+        """
+        if _uses_converter(type(self), "to_db", "db_converter"):
+            return getattr(type_system.database, self.db_converter)
+        return lambda value: self.to_db(type_system, value)
+
+    def get_python_converter(self, type_system):
+        """
+        Returns a function that converts a database value to its Python type.
+
+        :param type_system: TypeSystem object.
+        :type type_system: TypeSystem
+
+        :rtype: function
+
+        .. note:: Binds straight to the Converter method named by 
+                  python_converter unless a subclass customizes to_python().
+
+        """
+        if _uses_converter(type(self), "to_python", "python_converter"):
+            return getattr(type_system.python, self.python_converter)
+        return lambda value: self.to_python(type_system, value)
+
     def coerce(self, key, value):
         """
         Coerces a Property value to its Python type.
@@ -197,6 +237,10 @@ class String(Property):
     #: Python type
     python_type = unicode
 
+    #: Converter methods used by to_db() and to_python()
+    db_converter = "to_string"
+    python_converter = "to_string"
+
     def to_db(self,type_system,value):
         return type_system.database.to_string(value)
 
@@ -232,6 +276,10 @@ class Integer(Property):
     #: Python type
     python_type = int
 
+    #: Converter methods used by to_db() and to_python()
+    db_converter = "to_integer"
+    python_converter = "to_integer"
+
     def to_db(self,type_system,value):
         return type_system.database.to_integer(value)
     
@@ -267,6 +315,10 @@ class Long(Property):
     #: Python type
     python_type = long
 
+    #: Converter methods used by to_db() and to_python()
+    db_converter = "to_long"
+    python_converter = "to_long"
+
     def to_db(self,type_system,value):
         return type_system.database.to_long(value)
 
@@ -302,6 +354,10 @@ class Float(Property):
     #: Python type
     python_type = float
 
+    #: Converter methods used by to_db() and to_python()
+    db_converter = "to_float"
+    python_converter = "to_float"
+
     def to_db(self,type_system,value):
         return type_system.database.to_float(value)
     
@@ -337,6 +393,10 @@ class Bool(Property):
     #: Python type
     python_type = bool
 
+    #: Converter methods used by to_db() and to_python()
+    db_converter = "to_bool"
+    python_converter = "to_bool"
+
     def to_db(self,type_system,value):
         return type_system.database.to_bool(value)
 
@@ -372,6 +432,10 @@ class Null(Property):
     #: Python type
     python_type = None
 
+    #: Converter methods used by to_db() and to_python()
+    db_converter = "to_null"
+    python_converter = "to_null"
+
     def to_db(self,type_system,value):
         return type_system.database.to_null(value)
 
@@ -407,6 +471,10 @@ class List(Property):
     #: Python type
     python_type = list
 
+    #: Converter methods used by to_db() and to_python()
+    db_converter = "to_list"
+    python_converter = "to_list"
+
     def to_db(self,type_system,value):
         return type_system.database.to_list(value)
 
@@ -442,6 +510,10 @@ class Dictionary(Property):
     #: Python type
     python_type = dict
 
+    #: Converter methods used by to_db() and to_python()
+    db_converter = "to_dictionary"
+    python_converter = "to_dictionary"
+
     def to_db(self,type_system,value):
         return type_system.database.to_dictionary(value)
 
@@ -478,6 +550,10 @@ class Document(Property):
     #: Python type
     python_type = dict
 
+    #: Converter methods used by to_db() and to_python()
+    db_converter = "to_document"
+    python_converter = "to_dictionary"
+
     def to_db(self,type_system,value):
         return type_system.database.to_document(value)
 
@@ -514,6 +590,10 @@ class DateTime(Property):
     #: Python type
     python_type = datetime.datetime
 
+    #: Converter methods used by to_db() and to_python()
+    db_converter = "to_datetime"
+    python_converter = "to_datetime"
+
     def to_db(self, type_system, value):
         return type_system.database.to_datetime(value)
 
@@ -553,4 +633,13 @@ class DateTime(Property):
 
         return dt
 
-    
+
+# Utils
+
+def _uses_converter(cls, method_name, converter_name):
+    # True if method_name is the stock method that wraps the named Converter
+    # method, i.e. a subclass hasn't overridden one without the other.
+    if getattr(cls, converter_name, None) is None:
+        return False
+    method_class = get_defining_class(cls, method_name)
+    return method_class is get_defining_class(cls, converter_name)
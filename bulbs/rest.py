@@ -8,11 +8,20 @@ Low-level module for connecting to the Rexster REST server and
 returning a Response object.
 
 """
+import re
+import zlib
+import base64
+from contextlib import contextmanager
+
 import httplib2
+from six.moves import http_client, queue
 
 import bulbs
 from bulbs.base import Response
-from .utils import json, get_logger, quote, urlencode
+from .utils import json, get_logger, quote, urlencode, urlsplit
+from .metrics import CallInfo, timer, get_params_shape, get_script_fingerprint, \
+    AD_HOC_NAMES
+from .singleflight import SingleFlight, get_request_key
 
 
 log = get_logger(__name__)
@@ -22,6 +31,41 @@ PUT = "PUT"
 POST = "POST"
 DELETE = "DELETE"
 
+# Content codings, for the Accept-Encoding and Content-Encoding headers
+GZIP = "gzip"
+DEFLATE = "deflate"
+IDENTITY = "identity"
+
+def gzip_encode(data):
+    """
+    Returns the bytes compressed in the gzip format.
+
+    :rtype: bytes
+
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+def get_decoder(encoding):
+    """
+    Returns a zlib decompressor for a gzip or deflate Content-Encoding, or
+    None for any other encoding.
+
+    :rtype: zlib.Decompress
+
+    """
+    if encoding in (GZIP, DEFLATE):
+        # Detects the gzip or zlib header.
+        return zlib.decompressobj(32 + zlib.MAX_WBITS)
+    return None
+
+#: Gremlin library methods that don't write, so replicas can run them and
+#: identical concurrent calls can share one request.
+READ_SCRIPTS = frozenset(["get_vertices", "get_edges", "get_vertex", "get_edge",
+                          "lookup_vertex", "lookup_edge", "outE", "inE", "bothE",
+                          "outV", "inV", "bothV", "neighbourhood", "index_count",
+                          "query_exact_index", "get_metadata", "save_graphml"])
+
 # HTTP Response Handlers
 def ok(http_resp):
     return
@@ -65,6 +109,10 @@ class Request(object):
 
     response_class = Response
 
+    #: Script library used to name Gremlin or Cypher calls in the metrics.
+    #: The client sets it to its GroovyScripts or CypherQueries object.
+    scripts = None
+
     def __init__(self, config, content_type):
         """
         Initializes a client object.
@@ -75,8 +123,11 @@ class Request(object):
         self.config = config
         self.content_type = content_type
         self.user_agent = "bulbs/%s" % (bulbs.__version__)
-        self.http = httplib2.Http()    
+        self.http = httplib2.Http(timeout=config.timeout)
         self._add_credentials(config.username, config.password)
+        # Idle connections for requests sent alongside self.http's.
+        self.spare_http = queue.LifoQueue()
+        self.flights = SingleFlight()
         self._initialize()
 
     def _initialize(self):
@@ -174,25 +225,248 @@ class Request(object):
         :rtype: Response
 
         """
-        uri, method, body, headers = self._build_request_args(path, method, params)
+        if self.config.coalesce_reads and self.is_read(method, path, params):
+            key = get_request_key(method, path, params)
+            return self.flights.call(key, lambda: self._route(method, path, params))
+        return self._route(method, path, params)
+
+    def _route(self, method, path, params):
+        router = self.config.router
+        if router is not None:
+            return router.send(self, method, path, params)
+        return self.send_to(self.config.root_uri, method, path, params)
+
+    def send_to(self, root_uri, method, path, params, http=None, hedge=False):
+        """
+        Sends a request to the server at the root URI, instead of the one
+        the Router would pick.
+
+        :param root_uri: Root URI of the database on the server.
+        :type root_uri: str
+
+        :param method: HTTP method: GET, PUT, POST, or DELETE.
+        :type method: str
+
+        :param path: Path to the server resource, relative to the root URI.
+        :type path: str
+
+        :param params: Optional URI parameters for the resource.
+        :type params: dict
+
+        :param http: Optional httplib2.Http to send it with, for requests
+            sent concurrently. Defaults to self.http.
+        :type http: httplib2.Http
+
+        :param hedge: True if the request duplicates one that's slow, for
+            the metrics. Defaults to False.
+        :type hedge: bool
+
+        :rtype: Response
+
+        """
+        uri, method, body, headers = self._build_request_args(path, method, params, root_uri)
+        http = http or self.http
 
         self._display_debug(uri, method, body)
 
-        http_resp = self.http.request(uri, method, body, headers)
+        if self.config.metrics is not None:
+            return self._timed_request(http, uri, method, body, headers, path, params, hedge)
+
+        http_resp = http.request(uri, method, body, headers)
 
         return self.response_class(http_resp, self.config)
 
+    def get_call_name(self, path, params):
+        """
+        Returns the name a request is reported under in the metrics.
+
+        :param path: Path to the server resource, relative to the root URI.
+        :type path: str
+
+        :param params: Optional URI parameters for the resource.
+        :type params: dict
+
+        :rtype: str
+
+        """
+        script, kind = None, None
+        if isinstance(params, dict):
+            if "script" in params:
+                script, kind = params['script'], "gremlin"
+            elif "statements" in params:
+                statements, kind = params['statements'], "cypher"
+                if len(statements) == 1:
+                    script = statements[0].get('statement')
+            elif "query" in params and "params" in params:
+                # The CypherPlugin; index queries only have a query.
+                script, kind = params['query'], "cypher"
+        if kind is None:
+            # Keep the number of names bounded by dropping the IDs.
+            return re.sub(r"(^|/)\d+(?=/|$)", r"\1{id}", path)
+        name = None
+        if script and self.scripts is not None:
+            name = self.scripts.get_name(script)
+        if name is None and script and script.startswith("// multi:"):
+            name = "multi"
+        return name or kind
+
+    @contextmanager
+    def concurrent_http(self):
+        """
+        Context manager that yields an httplib2.Http that isn't in use, for
+        a request sent from another thread, and keeps it open for the next.
+
+        """
+        try:
+            http = self.spare_http.get_nowait()
+        except queue.Empty:
+            http = httplib2.Http(timeout=self.config.timeout)
+            username, password = self.config.username, self.config.password
+            if username and password:
+                http.add_credentials(username, password)
+        try:
+            yield http
+        finally:
+            self.spare_http.put(http)
+
+    def is_read(self, method, path, params):
+        """
+        Returns True if the request doesn't write: it's a GET or runs one of
+        the READ_SCRIPTS.
+
+        :param method: HTTP method.
+        :type method: str
+
+        :param path: Path to the server resource, relative to the root URI.
+        :type path: str
+
+        :param params: Optional URI parameters for the resource.
+        :type params: dict
+
+        :rtype: bool
+
+        """
+        if method == GET:
+            return True
+        if isinstance(params, dict) and "script" in params:
+            return self.get_call_name(path, params) in READ_SCRIPTS
+        return False
+
+    def _timed_request(self, http, uri, method, body, headers, path, params, hedge=False):
+        collector = self.config.metrics
+        name = self.get_call_name(path, params)
+        fingerprint = get_script_fingerprint(params) if name in AD_HOC_NAMES else ""
+        info = CallInfo(method, path, name, get_params_shape(params), fingerprint)
+        info.hedge = hedge
+        if body:
+            info.bytes_sent = len(body.encode("utf-8") if hasattr(body, "encode") else body)
+
+        start = timer()
+        http_resp = http.request(uri, method, body, headers)
+        info.server_time = timer() - start
+        info.status = http_resp[0].status
+        info.bytes_received = len(http_resp[1] or b"")
+
+        start = timer()
+        try:
+            resp = self.response_class(http_resp, self.config)
+        finally:
+            info.decode_time = timer() - start
+            try:
+                collector.record_request(info)
+            except Exception:
+                log.exception("Metrics collector failed")
+        resp.call_info = info
+        return resp
+
+
+    def stream(self, method, path, params, headers=None, chunk_size=8192):
+        """
+        Sends a request to the client and returns a generator of the raw
+        response body's chunks. 
+
+        The request is sent when the generator is first advanced, and each 
+        chunk is read from the socket when it's asked for, so a slow 
+        consumer slows the server down instead of buffering the response.
+
+        :param method: HTTP method: GET, PUT, POST, or DELETE.
+        :type method: str
+
+        :param path: Path to the server resource, relative to the root URI.
+        :type path: str
+
+        :param params: Optional URI parameters for the resource.
+        :type params: dict
+
+        :param headers: Optional extra request headers.
+        :type headers: dict
+
+        :param chunk_size: Maximum number of bytes in each chunk.
+        :type chunk_size: int
+
+        :rtype: Generator of bytes
+
+        """
+        # Streams are Cypher, which always goes to the master.
+        router = self.config.router
+        root_uri = router.master.uri if router is not None else self.config.root_uri
+        uri, method, body, request_headers = self._build_request_args(
+            path, method, params, root_uri)
+        request_headers.update(headers or {})
+        self._display_debug(uri, method, body)
+
+        # httplib2 reads the whole body, so this uses a plain connection.
+        parts = urlsplit(uri)
+        connection_class = http_client.HTTPConnection
+        if parts.scheme == "https":
+            connection_class = http_client.HTTPSConnection
+        connection = connection_class(parts.netloc, timeout=self.config.timeout)
+        request_path = parts.path + ("?%s" % parts.query if parts.query else "")
+        self._add_authorization(request_headers)
+        try:
+            connection.request(method, request_path, body, request_headers)
+            http_resp = connection.getresponse()
+            if http_resp.status not in (200, 201):
+                response_handler = RESPONSE_HANDLERS.get(http_resp.status, server_error)
+                response_handler((http_resp, http_resp.read()))
+            # httplib2 decompresses the other responses, so do it here too.
+            decoder = get_decoder(http_resp.getheader("Content-Encoding"))
+            while True:
+                chunk = http_resp.read(chunk_size)
+                if not chunk:
+                    break
+                if decoder is not None:
+                    chunk = decoder.decompress(chunk)
+                if chunk:
+                    yield chunk
+            if decoder is not None:
+                chunk = decoder.flush()
+                if chunk:
+                    yield chunk
+        finally:
+            connection.close()
+
+    def _add_authorization(self, headers):
+        username, password = self.config.username, self.config.password
+        if username and password:
+            credentials = ("%s:%s" % (username, password)).encode("utf-8")
+            headers['Authorization'] = "Basic %s" % base64.b64encode(credentials).decode("ascii")
 
     def _display_debug(self, uri, method, body):
         log.debug("%s url:  %s  ", method, uri)
         log.debug("%s body: %s ", method, body)
                     
-    def _build_request_args(self, path, method, params):
+    def _build_request_args(self, path, method, params, root_uri=None):
+        config = self.config
+        # httplib2 asks for gzip unless told otherwise, so always say which.
+        accept_encoding = "%s, %s" % (GZIP, DEFLATE) if config.compress_responses else IDENTITY
         headers = {'Accept': 'application/json',
+                   'Accept-Encoding': accept_encoding,
                    'User-Agent': self.user_agent}
         body = None
 
-        uri = "%s/%s" % (self.config.root_uri.rstrip("/"), path.lstrip("/"))
+        root_uri = root_uri or config.root_uri
+        uri = "%s/%s" % (root_uri.rstrip("/"), path.lstrip("/"))
 
         if params and method is GET:
             uri = "%s?%s" % (uri, urlencode(params))
@@ -201,6 +475,12 @@ class Request(object):
             body = json.dumps(params)
             post_headers = {'Content-Type': self.content_type}
             headers.update(post_headers)
+            threshold = config.compress_threshold
+            if threshold is not None:
+                body = body.encode("utf-8")
+                if len(body) >= threshold:
+                    body = gzip_encode(body)
+                    headers['Content-Encoding'] = GZIP
         
         return uri, method, body, headers 
 
@@ -9,6 +9,7 @@ from bulbs.model import Node, NodeProxy, Relationship, RelationshipProxy
 
 from .graph import Graph
 from .client import RexsterClient, REXSTER_URI
+from .rexpro import RexProClient, RexProError, REXPRO_URI
 from .index import ManualIndex, AutomaticIndex, \
     VertexIndexProxy, EdgeIndexProxy
 
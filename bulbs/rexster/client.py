@@ -51,6 +51,8 @@ class RexsterResult(Result):
     :ivar data: The data in the result.
 
     """
+    __slots__ = ()
+
     def __init__(self, result, config):
         self.config = config
 
@@ -274,6 +276,22 @@ class RexsterResponse(Response):
             total_size = 0
         return results, total_size
 
+    def get_multi_content(self):
+        """
+        Returns a dict of the per-call content in the response to a Multi's
+        combined Gremlin script, keyed by call.
+
+        :rtype: dict
+
+        """
+        # Rexster wraps the script's map in the results list.
+        results = self.content.get('results')
+        if type(results) == list:
+            results = results[0] if results else None
+        results = results or {}
+        # Shape each call's content like a Gremlin response for get_results().
+        return dict((key, dict(results=results[key])) for key in results)
+
 
 class RexsterRequest(Request):
     """Makes HTTP requests to Rexster and returns a RexsterResponse.""" 
@@ -329,6 +347,7 @@ class RexsterClient(Client):
 
         # Add it to the registry. This allows you to have more than one scripts namespace.
         self.registry.add_scripts("gremlin", self.scripts)
+        self.request.scripts = self.scripts
 
     def _get_uri(self, db_name):
         if db_name is not None:
@@ -607,6 +626,34 @@ class RexsterClient(Client):
         params = dict(_id=_id,label=label,start=start,limit=limit)
         return self.gremlin(script,params)
 
+    def neighbourhood(self, _id, depth, labels=None, direction="both", max_nodes=None):
+        """
+        Returns the vertices and edges within depth hops of the vertex, 
+        deduplicated, in one response: the vertices, then the edges.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param depth: Number of hops from the vertex.
+        :type depth: int
+
+        :param labels: Optional edge labels to follow. Defaults to None (all).
+        :type labels: list or None
+
+        :param direction: Edge direction: "out", "in", or "both".
+        :type direction: str
+
+        :param max_nodes: Optional maximum number of vertices. 
+        :type max_nodes: int or None
+
+        :rtype: RexsterResponse
+
+        """
+        script = self.scripts.get('neighbourhood')
+        params = dict(_id=_id,depth=depth,labels=labels,direction=direction,
+                      max_nodes=max_nodes)
+        return self.gremlin(script,params)
+
     # Index Proxy - General
 
     def get_all_indices(self):
@@ -945,6 +992,31 @@ class RexsterClient(Client):
         script = self.scripts.get("update_indexed_vertex")
         return self.gremlin(script,params)
 
+    def patch_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Updates only the given properties of an indexed vertex, and only 
+        their index entries, and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Changed property data. None values remove the property.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: RexsterResponse
+
+        """
+        # Don't remove null values here; they mark properties to remove.
+        params = dict(_id=_id,data=data,index_name=index_name,keys=keys)
+        script = self.scripts.get("patch_indexed_vertex")
+        return self.gremlin(script,params)
+
     # Model Proxy - Edge
 
     def create_indexed_edge(self, outV, label, inV, data, index_name, keys=None):
@@ -1003,6 +1075,31 @@ class RexsterClient(Client):
         script = self.scripts.get("update_indexed_edge")
         return self.gremlin(script,params)
 
+    def patch_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Updates only the given properties of an indexed edge, and only 
+        their index entries, and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Changed property data. None values remove the property.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: RexsterResponse
+
+        """
+        # Don't remove null values here; they mark properties to remove.
+        params = dict(_id=_id,data=data,index_name=index_name,keys=keys)
+        script = self.scripts.get("patch_indexed_edge")
+        return self.gremlin(script,params)
+
     # Utils
 
     def warm_cache(self):
@@ -35,25 +35,31 @@ def create_indexed_vertex(data,index_name,keys) {
 }
 
 
+// Diffs the old and new values so only the index entries of changed keys
+// are removed and re-added; unchanged keys aren't touched.
 def update_indexed_vertex(_id, data, index_name, keys) {
   def updateIndexedVertex = { 
     vertex = g.v(_id);
     index = g.idx(index_name);
-    // remove vertex from index
-    for (String key in vertex.getPropertyKeys()) {
-      if (keys == null || keys.contains(key)) {
-	value = vertex.getProperty(key);
-	index.remove(key, String.valueOf(value), vertex);
-      }
+    // remove the properties that aren't in the new data
+    for (String key in vertex.getPropertyKeys().toList()) {
+      if (data.get(key) != null) continue;
+      if (keys == null || keys.contains(key))
+	index.remove(key, String.valueOf(vertex.getProperty(key)), vertex);
+      vertex.removeProperty(key);
     }
-    ElementHelper.removeProperties([vertex]);
-    ElementHelper.setProperties(vertex,data);
-    // add vertex to index
+    // only re-index the keys whose value changed
     for (entry in data.entrySet()) {
       if (entry.value == null) continue;
-      if (keys == null || keys.contains(entry.key))
-	index.put(entry.key,String.valueOf(entry.value),vertex);
-    }    
+      old = vertex.getProperty(entry.key);
+      if (old == entry.value) continue;
+      indexed = (keys == null || keys.contains(entry.key));
+      if (indexed && old != null)
+	index.remove(entry.key, String.valueOf(old), vertex);
+      vertex.setProperty(entry.key, entry.value);
+      if (indexed)
+	index.put(entry.key, String.valueOf(entry.value), vertex);
+    }
     return vertex;
   }
   def transaction = { final Closure closure ->
@@ -70,6 +76,40 @@ def update_indexed_vertex(_id, data, index_name, keys) {
 }
 
 
+// Only touches the keys in data; a null value removes the property.
+def patch_indexed_vertex(_id, data, index_name, keys) {
+  def patchIndexedVertex = {
+    vertex = g.v(_id);
+    index = g.idx(index_name);
+    for (entry in data.entrySet()) {
+      indexed = (keys == null || keys.contains(entry.key));
+      old = vertex.getProperty(entry.key);
+      if (old == entry.value) continue;
+      if (indexed && old != null)
+	index.remove(entry.key, String.valueOf(old), vertex);
+      if (entry.value == null) {
+	vertex.removeProperty(entry.key);
+	continue;
+      }
+      vertex.setProperty(entry.key, entry.value);
+      if (indexed)
+	index.put(entry.key, String.valueOf(entry.value), vertex);
+    }
+    return vertex;
+  }
+  def transaction = { final Closure closure ->
+    try {
+      results = closure();
+      g.stopTransaction(TransactionalGraph.Conclusion.SUCCESS);
+      return results; 
+    } catch (e) {
+      g.stopTransaction(TransactionalGraph.Conclusion.FAILURE);
+      throw e;
+    }
+  }
+  return transaction(patchIndexedVertex);
+}
+
 // Model Proxy - Edge
 
 def create_indexed_edge(outV,label,inV,data,index_name,keys,label_var) {
@@ -100,23 +140,29 @@ def create_indexed_edge(outV,label,inV,data,index_name,keys,label_var) {
 
 // don't need to update indexed label, it can't change
 def update_indexed_edge(_id, data, index_name, keys) {
-  def updateIndexedEdge = {
+  def updateIndexedEdge = { 
     edge = g.e(_id);
     index = g.idx(index_name);
-    for (String key in edge.getPropertyKeys()) {
-      if (keys == null || keys.contains(key)) {
-	value = edge.getProperty(key)
-	index.remove(key, String.valueOf(value), edge);
-      }
+    // remove the properties that aren't in the new data
+    for (String key in edge.getPropertyKeys().toList()) {
+      if (data.get(key) != null) continue;
+      if (keys == null || keys.contains(key))
+	index.remove(key, String.valueOf(edge.getProperty(key)), edge);
+      edge.removeProperty(key);
     }
-    ElementHelper.removeProperties([edge]);
-    ElementHelper.setProperties(edge,data);
+    // only re-index the keys whose value changed
     for (entry in data.entrySet()) {
       if (entry.value == null) continue;
-      if (keys == null || keys.contains(entry.key))
-	index.put(entry.key,String.valueOf(entry.value),edge)
-    return edge;
+      old = edge.getProperty(entry.key);
+      if (old == entry.value) continue;
+      indexed = (keys == null || keys.contains(entry.key));
+      if (indexed && old != null)
+	index.remove(entry.key, String.valueOf(old), edge);
+      edge.setProperty(entry.key, entry.value);
+      if (indexed)
+	index.put(entry.key, String.valueOf(entry.value), edge);
     }
+    return edge;
   }
   def transaction = { final Closure closure ->
     try {
@@ -130,3 +176,37 @@ def update_indexed_edge(_id, data, index_name, keys) {
   }
   return transaction(updateIndexedEdge);
 }
+
+// Only touches the keys in data; a null value removes the property.
+def patch_indexed_edge(_id, data, index_name, keys) {
+  def patchIndexedEdge = {
+    edge = g.e(_id);
+    index = g.idx(index_name);
+    for (entry in data.entrySet()) {
+      indexed = (keys == null || keys.contains(entry.key));
+      old = edge.getProperty(entry.key);
+      if (old == entry.value) continue;
+      if (indexed && old != null)
+	index.remove(entry.key, String.valueOf(old), edge);
+      if (entry.value == null) {
+	edge.removeProperty(entry.key);
+	continue;
+      }
+      edge.setProperty(entry.key, entry.value);
+      if (indexed)
+	index.put(entry.key, String.valueOf(entry.value), edge);
+    }
+    return edge;
+  }
+  def transaction = { final Closure closure ->
+    try {
+      results = closure();
+      g.stopTransaction(TransactionalGraph.Conclusion.SUCCESS);
+      return results; 
+    } catch (e) {
+      g.stopTransaction(TransactionalGraph.Conclusion.FAILURE);
+      throw e;
+    }
+  }
+  return transaction(patchIndexedEdge);
+}
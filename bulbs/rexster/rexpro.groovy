@@ -0,0 +1,111 @@
+// Scripts for what Rexster serves over REST. RexPro only runs scripts, so
+// the RexProClient sends these instead of the REST requests.
+
+// Elements as RexPro serializes them have their properties in _properties;
+// the RexProResponse flattens them like Rexster's REST JSON.
+
+// Vertex Proxy
+
+def create_vertex(data) {
+  vertex = g.addVertex()
+  for (entry in data.entrySet()) {
+    if (entry.value == null) continue;
+    vertex.setProperty(entry.key,entry.value)
+  }
+  return vertex
+}
+
+// Returns false if there's no vertex, so the client can raise LookupError.
+def drop_vertex(_id) {
+  vertex = g.v(_id)
+  if (vertex == null) return false
+  g.removeVertex(vertex)
+  return true
+}
+
+// Edge Proxy
+
+def create_edge(outV, label, inV, data) {
+  edge = g.addEdge(g.v(outV),g.v(inV),label)
+  for (entry in data.entrySet()) {
+    if (entry.value == null) continue;
+    edge.setProperty(entry.key,entry.value)
+  }
+  return edge
+}
+
+def drop_edge(_id) {
+  edge = g.e(_id)
+  if (edge == null) return false
+  g.removeEdge(edge)
+  return true
+}
+
+// Index Proxy
+
+def get_indices() {
+  g.getIndices().collect{ ['name': it.getIndexName(), 'type': 'manual',
+    'class': it.getIndexClass().getSimpleName().toLowerCase()] }
+}
+
+def get_index(index_name) {
+  index = g.idx(index_name)
+  if (index == null) return null
+  ['name': index.getIndexName(), 'type': 'manual',
+   'class': index.getIndexClass().getSimpleName().toLowerCase()]
+}
+
+def create_index(index_name, index_class) {
+  element_class = index_class == 'vertex' ? Vertex.class : Edge.class
+  index = g.createIndex(index_name, element_class)
+  ['name': index.getIndexName(), 'type': 'manual', 'class': index_class]
+}
+
+def drop_index(index_name) {
+  if (g.idx(index_name) == null) return false
+  g.dropIndex(index_name)
+  return true
+}
+
+// Index Container
+
+def put_vertex(index_name, key, value, _id) {
+  g.idx(index_name).put(key,String.valueOf(value),g.v(_id))
+}
+
+def put_edge(index_name, key, value, _id) {
+  g.idx(index_name).put(key,String.valueOf(value),g.e(_id))
+}
+
+// Without a key and value, removes the entries for the element's properties.
+def remove_vertex(index_name, _id, key, value) {
+  index = g.idx(index_name)
+  vertex = g.v(_id)
+  if (key != null && value != null)
+    return index.remove(key,String.valueOf(value),vertex)
+  for (String k in vertex.getPropertyKeys().toList()) {
+    if (key != null && k != key) continue;
+    index.remove(k,String.valueOf(vertex.getProperty(k)),vertex)
+  }
+}
+
+def remove_edge(index_name, _id, key, value) {
+  index = g.idx(index_name)
+  edge = g.e(_id)
+  if (key != null && value != null)
+    return index.remove(key,String.valueOf(value),edge)
+  for (String k in edge.getPropertyKeys().toList()) {
+    if (key != null && k != key) continue;
+    index.remove(k,String.valueOf(edge.getProperty(k)),edge)
+  }
+}
+
+// Utils
+
+def multi_get_vertices(id_list) {
+  id_list.collect{ g.v(it) }.findAll{ it != null }
+}
+
+def multi_get_edges(id_list) {
+  id_list.collect{ g.e(it) }.findAll{ it != null }
+}
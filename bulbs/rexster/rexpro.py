@@ -0,0 +1,963 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Bulbs supports pluggable clients. This is the RexPro client, which sends
+Gremlin scripts to Rexster over RexPro, its binary socket protocol.
+
+"""
+import socket
+import struct
+import uuid
+from contextlib import contextmanager
+
+from six.moves import queue
+
+from bulbs.rest import POST
+from bulbs.utils import json, get_logger, get_file_path, urlsplit
+from bulbs.metrics import CallInfo, timer, get_params_shape, get_script_fingerprint, \
+    AD_HOC_NAMES
+
+from .client import RexsterClient, RexsterResponse, RexsterRequest, gremlin_path
+
+try:
+    import msgpack
+except ImportError:
+    # Falls back to RexPro's JSON serializer.
+    msgpack = None
+
+
+# The default URI: RexPro's port, and the graph's name as with REST
+REXPRO_URI = "rexpro://localhost:8184/graphs/tinkergraph"
+
+# The logger defined in Config
+log = get_logger(__name__)
+
+# RexPro protocol version 1 (Rexster 2.4+). Each message is a header,
+#   version (1 byte), serializer (1 byte), reserved (4 bytes),
+#   message type (1 byte), body length (4 bytes, big-endian),
+# followed by the body: a list of the message's fields.
+PROTOCOL_VERSION = 1
+HEADER = struct.Struct(">BB4xBI")
+
+# Serializer types
+MSGPACK = 0
+JSON = 1
+
+# Message types
+ERROR = 0
+SESSION_REQUEST = 1
+SESSION_RESPONSE = 2
+SCRIPT_REQUEST = 3
+SCRIPT_RESPONSE = 5
+
+# Error flags in the meta of ERROR messages
+INVALID_SESSION = 1
+
+# The session ID of requests without a session
+EMPTY_SESSION = uuid.UUID(int=0)
+
+# Element keys, besides the properties
+PRIVATE_KEYS = ("_id", "_type", "_outV", "_inV", "_label")
+
+
+class RexProError(SystemError):
+    """
+    Raised for an error message from the server. Like the REST client's
+    server errors, it's a SystemError.
+
+    :ivar flag: The error flag, e.g. INVALID_SESSION.
+
+    """
+    def __init__(self, message, flag=None):
+        super(RexProError, self).__init__(message)
+        self.flag = flag
+
+
+class MsgPackSerializer(object):
+    """Serializes message bodies with MessagePack. Requires msgpack."""
+
+    serializer_type = MSGPACK
+
+    def dumps(self, fields):
+        return msgpack.packb(fields, use_bin_type=True)
+
+    def loads(self, body):
+        return msgpack.unpackb(body, raw=False)
+
+    def encode_uuid(self, value):
+        return value.bytes
+
+
+class JSONSerializer(object):
+    """Serializes message bodies as JSON text."""
+
+    serializer_type = JSON
+
+    def dumps(self, fields):
+        return json.dumps(fields).encode("utf-8")
+
+    def loads(self, body):
+        return json.loads(body.decode("utf-8"))
+
+    def encode_uuid(self, value):
+        return str(value)
+
+
+def get_serializer():
+    """
+    Returns the MsgPackSerializer if msgpack is installed, else the
+    JSONSerializer.
+
+    :rtype: MsgPackSerializer or JSONSerializer
+
+    """
+    return MsgPackSerializer() if msgpack is not None else JSONSerializer()
+
+
+def pack_message(serializer, message_type, fields):
+    """
+    Returns the message as bytes, header and body.
+
+    :param serializer: Serializer for the body.
+    :type serializer: MsgPackSerializer or JSONSerializer
+
+    :param message_type: Message type, e.g. SCRIPT_REQUEST.
+    :type message_type: int
+
+    :param fields: The message's fields.
+    :type fields: list
+
+    :rtype: bytes
+
+    """
+    body = serializer.dumps(fields)
+    header = HEADER.pack(PROTOCOL_VERSION, serializer.serializer_type, message_type, len(body))
+    return header + body
+
+
+def read_message(rfile):
+    """
+    Reads a message and returns its (serializer type, message type, body)
+    tuple, with the body still serialized.
+
+    :param rfile: Buffered binary file object to read from.
+    :type rfile: file
+
+    :rtype: tuple
+
+    """
+    header = _read_exactly(rfile, HEADER.size)
+    version, serializer_type, message_type, length = HEADER.unpack(header)
+    if version != PROTOCOL_VERSION:
+        raise RexProError("Unsupported RexPro protocol version: %s" % version)
+    return serializer_type, message_type, _read_exactly(rfile, length)
+
+
+def _read_exactly(rfile, size):
+    data = rfile.read(size)
+    if len(data) != size:
+        raise socket.error("RexPro connection closed")
+    return data
+
+
+def parse_uri(uri):
+    """
+    Returns the (host, port, graph name) tuple from a RexPro URI, e.g.
+    "rexpro://localhost:8184/graphs/tinkergraph".
+
+    :param uri: RexPro URI.
+    :type uri: str
+
+    :rtype: tuple
+
+    """
+    parts = urlsplit(uri)
+    graph_name = parts.path.rstrip("/").split("/")[-1]
+    return parts.hostname, parts.port or 8184, graph_name
+
+
+class RexProConnection(object):
+    """
+    A socket connection to RexPro, with its own session on the graph.
+    Scripts in the session don't open a new graph context each time, and
+    isolate keeps their variables from leaking into the next script.
+
+    :param host: Server host.
+    :type host: str
+
+    :param port: Server port.
+    :type port: int
+
+    :param graph_name: Name of the graph the session is bound to.
+    :type graph_name: str
+
+    :param serializer: Serializer for the message bodies.
+    :type serializer: MsgPackSerializer or JSONSerializer
+
+    :param username: Optional username.
+    :type username: str
+
+    :param password: Optional password.
+    :type password: str
+
+    :param timeout: Optional socket timeout in seconds.
+    :type timeout: float
+
+    :ivar session: The session ID, or None until the session is open.
+    :ivar bytes_sent: Size of the last request message.
+    :ivar bytes_received: Size of the last response message.
+
+    """
+    def __init__(self, host, port, graph_name, serializer, username=None, password=None,
+                 timeout=None):
+        self.graph_name = graph_name
+        self.serializer = serializer
+        self.username = username
+        self.password = password
+        self.socket = socket.create_connection((host, port), timeout)
+        # Each message is written in one send, so don't wait to fill packets.
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.rfile = self.socket.makefile("rb")
+        self.session = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.open_session()
+
+    def open_session(self):
+        """
+        Opens a session on the graph.
+
+        :rtype: None
+
+        """
+        meta = dict(graphName=self.graph_name, graphObjName="g")
+        fields = self.send(SESSION_REQUEST, EMPTY_SESSION, meta,
+                           [self.username or "", self.password or ""])
+        self.session = fields[0]
+
+    def execute(self, script, params=None):
+        """
+        Runs the script in the session and returns its results.
+
+        :param script: Gremlin script to execute.
+        :type script: str
+
+        :param params: Param bindings for the script.
+        :type params: dict
+
+        :rtype: object
+
+        """
+        meta = dict(inSession=True, isolate=True, transaction=True, console=False)
+        try:
+            fields = self.send(SCRIPT_REQUEST, self.session, meta,
+                               ["groovy", script, params or {}])
+        except RexProError as e:
+            if e.flag != INVALID_SESSION:
+                raise
+            # The server dropped the session, e.g. it timed out; the script
+            # didn't run, so it's safe to open another and run it again.
+            self.open_session()
+            fields = self.send(SCRIPT_REQUEST, self.session, meta,
+                               ["groovy", script, params or {}])
+        return fields[3]
+
+    def send(self, message_type, session, meta, fields):
+        """
+        Sends a message and returns the response message's fields.
+
+        :rtype: list
+
+        """
+        serializer = self.serializer
+        if isinstance(session, uuid.UUID):
+            session = serializer.encode_uuid(session)
+        request_id = serializer.encode_uuid(uuid.uuid4())
+        message = pack_message(serializer, message_type, [session, request_id, meta] + fields)
+        self.socket.sendall(message)
+        serializer_type, response_type, body = read_message(self.rfile)
+        self.bytes_sent = len(message)
+        self.bytes_received = HEADER.size + len(body)
+        response = serializer.loads(body)
+        if response_type == ERROR:
+            raise RexProError(response[3], (response[2] or {}).get("flag"))
+        return response
+
+    def close(self):
+        """
+        Kills the session and closes the socket.
+
+        :rtype: None
+
+        """
+        try:
+            if self.session is not None:
+                self.send(SESSION_REQUEST, self.session, dict(killSession=True), ["", ""])
+        except (socket.error, RexProError):
+            pass
+        finally:
+            self.rfile.close()
+            self.socket.close()
+
+
+class RexProConnectionPool(object):
+    """
+    A pool of open RexProConnections, so each request doesn't pay for a
+    TCP handshake and a new session. The most recently used connection is
+    reused first.
+
+    :param connect: Function that returns a new RexProConnection.
+    :type connect: function
+
+    :param max_size: Maximum number of idle connections to keep open.
+    :type max_size: int
+
+    """
+    def __init__(self, connect, max_size=10):
+        self.connect = connect
+        self.idle = queue.LifoQueue(max_size)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that yields a connection and returns it to the
+        pool, or closes it if the request failed without a response.
+
+        """
+        try:
+            connection = self.idle.get_nowait()
+        except queue.Empty:
+            connection = self.connect()
+        try:
+            yield connection
+        except RexProError:
+            # The server answered, so the connection is still in sync.
+            self._put(connection)
+            raise
+        except BaseException:
+            connection.close()
+            raise
+        else:
+            self._put(connection)
+
+    def close(self):
+        """
+        Closes the idle connections.
+
+        :rtype: None
+
+        """
+        while True:
+            try:
+                connection = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            connection.close()
+
+    def _put(self, connection):
+        try:
+            self.idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+
+def normalize(value):
+    """
+    Returns a script result with the elements shaped like Rexster's REST
+    JSON, i.e. with their _properties flattened into the element.
+
+    :param value: Script result.
+    :type value: object
+
+    :rtype: object
+
+    """
+    if isinstance(value, list):
+        return [normalize(item) for item in value]
+    if isinstance(value, dict):
+        if "_type" in value and "_id" in value:
+            element = dict(value.get("_properties") or {})
+            for key in PRIVATE_KEYS:
+                if key in value:
+                    element[key] = value[key]
+            return element
+        return dict((key, normalize(item)) for key, item in value.items())
+    return value
+
+
+class RexProResponse(RexsterResponse):
+    """
+    Container class for a script's results from RexPro, with the same
+    content and results as a Rexster Gremlin response.
+
+    :param response: The script's results.
+    :type response: object
+
+    :param config: Config object.
+    :type config: bulbs.config.Config
+
+    :ivar config: Config object.
+    :ivar headers: Always an empty dict.
+    :ivar content: A dict containing the results list.
+    :ivar results: A generator of RexsterResult objects, a single RexsterResult object,
+        or None, depending on the number of results returned.
+    :ivar total_size: The number of results returned.
+    :ivar raw: The script's results. Only set when log_level is DEBUG.
+
+    """
+    def __init__(self, response, config):
+        self.config = config
+        self.headers = dict()
+        self.content = self.get_content(response)
+        self.results, self.total_size = self.get_results()
+        self.raw = self._maybe_get_raw(response, config)
+
+    def handle_response(self, response):
+        pass
+
+    def get_headers(self, response):
+        return dict()
+
+    def get_content(self, response):
+        # Like Rexster's Gremlin extension, always return a list.
+        if response is None:
+            results = []
+        elif isinstance(response, list):
+            results = normalize(response)
+        else:
+            results = [normalize(response)]
+        return dict(results=results)
+
+    def single(self):
+        """
+        Makes the response's single result, if any, its results, like the
+        REST responses for one element, and returns the response.
+
+        :rtype: RexProResponse
+
+        """
+        results = self.content['results']
+        self.content['results'] = results[0] if results else None
+        self.results, self.total_size = self.get_results()
+        return self
+
+
+class RexProRequest(RexsterRequest):
+    """
+    Sends Gremlin scripts to RexPro over pooled connections and returns a
+    RexProResponse.
+
+    :cvar pool_size: Maximum number of idle connections to keep open.
+    :cvar timeout: Socket timeout in seconds, or None for no timeout.
+
+    """
+    response_class = RexProResponse
+
+    #: Maximum number of idle connections to keep open.
+    pool_size = 10
+
+    #: Socket timeout in seconds, or None for no timeout.
+    timeout = None
+
+    def _initialize(self):
+        self.serializer = get_serializer()
+        self.host, self.port, self.graph_name = parse_uri(self.config.root_uri)
+        self.pool = RexProConnectionPool(self._connect, self.pool_size)
+
+    def request(self, method, path, params):
+        """
+        Runs a Gremlin script, which is all RexPro does. Other requests
+        raise NotImplementedError.
+
+        :rtype: RexProResponse
+
+        """
+        if method == POST and path == gremlin_path:
+            return self.execute(params['script'], params.get('params'))
+        raise NotImplementedError("RexPro only runs Gremlin scripts: %s %s" % (method, path))
+
+    def execute(self, script, params=None):
+        """
+        Runs a Gremlin script and returns the Response.
+
+        :param script: Gremlin script to execute.
+        :type script: str
+
+        :param params: Param bindings for the script.
+        :type params: dict
+
+        :rtype: RexProResponse
+
+        """
+        self._display_debug(self.config.root_uri, "SCRIPT", script)
+        if self.config.metrics is not None:
+            return self._timed_execute(script, params)
+        with self.pool.connection() as connection:
+            results = connection.execute(script, params)
+        return self.response_class(results, self.config)
+
+    def close(self):
+        """
+        Closes the pooled connections.
+
+        :rtype: None
+
+        """
+        self.pool.close()
+
+    def _connect(self):
+        return RexProConnection(self.host, self.port, self.graph_name, self.serializer,
+                                self.config.username, self.config.password, self.timeout)
+
+    def _timed_execute(self, script, params):
+        collector = self.config.metrics
+        params = dict(script=script, params=params)
+        name = self.get_call_name(gremlin_path, params)
+        fingerprint = get_script_fingerprint(params) if name in AD_HOC_NAMES else ""
+        info = CallInfo(POST, gremlin_path, name, get_params_shape(params), fingerprint)
+
+        start = timer()
+        with self.pool.connection() as connection:
+            results = connection.execute(script, params['params'])
+            info.bytes_sent = connection.bytes_sent
+            info.bytes_received = connection.bytes_received
+        info.server_time = timer() - start
+        info.status = 200
+
+        start = timer()
+        try:
+            resp = self.response_class(results, self.config)
+        finally:
+            info.decode_time = timer() - start
+            try:
+                collector.record_request(info)
+            except Exception:
+                log.exception("Metrics collector failed")
+        resp.call_info = info
+        return resp
+
+
+class RexProClient(RexsterClient):
+    """
+    Low-level client that sends Gremlin scripts to Rexster over RexPro and
+    returns a response.
+
+    It has the RexsterClient's methods and results. RexPro only runs
+    scripts, so what the RexsterClient does over REST is done with the
+    scripts in rexpro.groovy. Connections are pooled, and each has its own
+    session, so there's no HTTP framing or per-request setup. Messages are
+    serialized with MessagePack if msgpack is installed, else as JSON.
+
+    :param config: Optional Config object. Defaults to default Config.
+    :type config: bulbs.config.Config
+
+    :cvar default_uri: Default URI for the database.
+    :cvar request_class: Request class for the Client.
+
+    :ivar config: Config object.
+    :ivar registry: Registry object.
+    :ivar scripts: GroovyScripts object.
+    :ivar type_system: JSONTypeSystem object.
+    :ivar request: RexProRequest object.
+
+    Example:
+
+    >>> from bulbs.rexster import RexProClient
+    >>> client = RexProClient()
+    >>> script = client.scripts.get("get_vertices")
+    >>> response = client.gremlin(script, params=None)
+    >>> result = next(response.results)
+
+    """
+    #: Default URI for the database.
+    default_uri = REXPRO_URI
+    request_class = RexProRequest
+
+    def __init__(self, config=None, db_name=None):
+        super(RexProClient, self).__init__(config, db_name)
+        self.scripts.update(get_file_path(__file__, "rexpro.groovy"))
+
+    def _get_uri(self, db_name):
+        if db_name is not None:
+            return "rexpro://localhost:8184/graphs/%s" % db_name
+
+    def close(self):
+        """
+        Closes the pooled connections.
+
+        :rtype: None
+
+        """
+        self.request.close()
+
+    # Gremlin
+
+    def gremlin(self, script, params=None):
+        """
+        Executes a Gremlin script and returns the Response.
+
+        :param script: Gremlin script to execute.
+        :type script: str
+
+        :param params: Param bindings for the script.
+        :type params: dict
+
+        :rtype: RexProResponse
+
+        """
+        return self.request.execute(script, params)
+
+    # Vertex Proxy
+
+    def create_vertex(self, data):
+        """
+        Creates a vertex and returns the Response.
+
+        :param data: Property data.
+        :type data: dict
+
+        :rtype: RexProResponse
+
+        """
+        params = dict(data=self._remove_null_values(data))
+        return self._run("create_vertex", params).single()
+
+    def get_vertex(self, _id):
+        """
+        Gets the vertex with the _id and returns the Response.
+
+        :param data: Vertex ID.
+        :type data: int
+
+        :rtype: RexProResponse
+
+        """
+        resp = self._run("get_vertex", dict(_id=_id)).single()
+        if resp.results is None:
+            raise LookupError("Vertex not found: %s" % _id)
+        return resp
+
+    def update_vertex(self, _id, data):
+        """
+        Updates the vertex with the _id and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: dict
+
+        :param data: Property data.
+        :type data: dict
+
+        :rtype: RexProResponse
+
+        """
+        params = dict(_id=_id, data=self._remove_null_values(data))
+        return self._run("update_vertex_properties", params).single()
+
+    def delete_vertex(self, _id):
+        """
+        Deletes a vertex with the _id and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: dict
+
+        :rtype: RexProResponse
+
+        """
+        return self._drop("drop_vertex", dict(_id=_id), "Vertex not found: %s" % _id)
+
+    # Edge Proxy
+
+    def create_edge(self, outV, label, inV, data={}):
+        """
+        Creates a edge and returns the Response.
+
+        :param outV: Outgoing vertex ID.
+        :type outV: int
+
+        :param label: Edge label.
+        :type label: str
+
+        :param inV: Incoming vertex ID.
+        :type inV: int
+
+        :param data: Property data.
+        :type data: dict or None
+
+        :rtype: RexProResponse
+
+        """
+        params = dict(outV=outV, label=label, inV=inV, data=self._remove_null_values(data))
+        return self._run("create_edge", params).single()
+
+    def get_edge(self, _id):
+        """
+        Gets the edge with the _id and returns the Response.
+
+        :param data: Edge ID.
+        :type data: int
+
+        :rtype: RexProResponse
+
+        """
+        resp = self._run("get_edge", dict(_id=_id)).single()
+        if resp.results is None:
+            raise LookupError("Edge not found: %s" % _id)
+        return resp
+
+    def update_edge(self, _id, data):
+        """
+        Updates the edge with the _id and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: dict
+
+        :param data: Property data.
+        :type data: dict
+
+        :rtype: RexProResponse
+
+        """
+        params = dict(_id=_id, data=self._remove_null_values(data))
+        return self._run("update_edge_properties", params).single()
+
+    def delete_edge(self, _id):
+        """
+        Deletes a edge with the _id and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: dict
+
+        :rtype: RexProResponse
+
+        """
+        return self._drop("drop_edge", dict(_id=_id), "Edge not found: %s" % _id)
+
+    # Index Proxy - General
+
+    def get_all_indices(self):
+        """Returns a list of all the element indices."""
+        return self._run("get_indices")
+
+    def get_index(self, name):
+        return self._run("get_index", dict(index_name=name)).single()
+
+    def delete_index(self, name):
+        """Deletes the index with the index_name."""
+        return self._drop("drop_index", dict(index_name=name), "Index not found: %s" % name)
+
+    # Index Proxy - Vertex
+
+    def create_vertex_index(self, index_name, *args, **kwds):
+        """
+        Creates a vertex index with the specified params.
+
+        :param index_name: Name of the index to create.
+        :type index_name: str
+
+        :rtype: RexProResponse
+
+        """
+        return self._create_index(index_name, "vertex", kwds)
+
+    # Index Proxy - Edge
+
+    def create_edge_index(self, name, *args, **kwds):
+        """
+        Creates a edge index with the specified params.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :rtype: RexProResponse
+
+        """
+        return self._create_index(name, "edge", kwds)
+
+    def delete_edge_index(self, name):
+        """
+        Deletes the edge index with the index_name.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :rtype: RexProResponse
+
+        """
+        return self.delete_index(name)
+
+    # Index Container - General
+
+    def index_count(self, index_name, key, value):
+        resp = self._run("index_count", dict(index_name=index_name, key=key, value=value))
+        count = resp.content['results'][0] if resp.content['results'] else 0
+        resp.content = dict(totalSize=count)
+        resp.results, resp.total_size = None, 0
+        return resp
+
+    def index_keys(self, index_name):
+        raise NotImplementedError("Automatic indices aren't supported over RexPro")
+
+    # Index Container - Vertex
+
+    def put_vertex(self, index_name, key, value, _id):
+        """
+        Adds a vertex to the index with the index_name.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Name of the key.
+        :type key: str
+
+        :param value: Value of the key.
+        :type value: str
+
+        :param _id: Vertex ID
+        :type _id: int
+
+        :rtype: RexProResponse
+
+        """
+        params = dict(index_name=index_name, key=key, value=value, _id=_id)
+        return self._run("put_vertex", params)
+
+    def lookup_vertex(self, index_name, key, value):
+        """
+        Returns the vertices indexed with the key and value.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Name of the key.
+        :type key: str
+
+        :param value: Value of the key.
+        :type value: str
+
+        :rtype: RexProResponse
+
+        """
+        # Like put_vertex, values are indexed as strings.
+        params = dict(index_name=index_name, key=key, value=str(value))
+        return self._run("lookup_vertex", params)
+
+    def query_vertex(self, index_name, params):
+        raise NotImplementedError("Index queries aren't supported over RexPro")
+
+    def remove_vertex(self, index_name, _id, key=None, value=None):
+        """
+        Removes a vertex from the index and returns the Response.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Optional. Name of the key.
+        :type key: str
+
+        :param value: Optional. Value of the key.
+        :type value: str
+
+        :rtype: RexProResponse
+
+        """
+        params = dict(index_name=index_name, _id=_id, key=key, value=value)
+        return self._run("remove_vertex", params)
+
+    # Index Container - Edge
+
+    def put_edge(self, index_name, key, value, _id):
+        """
+        Adds an edge to the index and returns the Response.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Name of the key.
+        :type key: str
+
+        :param value: Value of the key.
+        :type value: str
+
+        :param _id: Edge ID
+        :type _id: int
+
+        :rtype: RexProResponse
+
+        """
+        params = dict(index_name=index_name, key=key, value=value, _id=_id)
+        return self._run("put_edge", params)
+
+    def lookup_edge(self, index_name, key, value):
+        """
+        Looks up an edge in the index and returns the Response.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Name of the key.
+        :type key: str
+
+        :param value: Value of the key.
+        :type value: str
+
+        :rtype: RexProResponse
+
+        """
+        params = dict(index_name=index_name, key=key, value=str(value))
+        return self._run("lookup_edge", params)
+
+    def query_edge(self, index_name, params):
+        raise NotImplementedError("Index queries aren't supported over RexPro")
+
+    def remove_edge(self, index_name, _id, key=None, value=None):
+        """
+        Removes an edge from the index and returns the Response.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param _id: Edge ID
+        :type _id: int
+
+        :param key: Optional. Name of the key.
+        :type key: str
+
+        :param value: Optional. Value of the key.
+        :type value: str
+
+        :rtype: RexProResponse
+
+        """
+        params = dict(index_name=index_name, _id=_id, key=key, value=value)
+        return self._run("remove_edge", params)
+
+    # Utils
+
+    def multi_get_vertices(self, id_list):
+        return self._run("multi_get_vertices", dict(id_list=list(id_list)))
+
+    def multi_get_edges(self, id_list):
+        return self._run("multi_get_edges", dict(id_list=list(id_list)))
+
+    def execute_transaction(self, transaction):
+        raise NotImplementedError("Batch transactions aren't supported over RexPro")
+
+    # Private
+
+    def _run(self, name, params=None):
+        return self.gremlin(self.scripts.get(name), params)
+
+    def _drop(self, name, params, message):
+        resp = self._run(name, params)
+        if resp.content['results'] == [False]:
+            raise LookupError(message)
+        return resp
+
+    def _create_index(self, index_name, index_class, kwds):
+        if kwds.get('index_type', "manual") != "manual":
+            raise NotImplementedError("Automatic indices aren't supported over RexPro")
+        params = dict(index_name=index_name, index_class=index_class)
+        return self._run("create_index", params).single()
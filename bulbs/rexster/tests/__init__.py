@@ -1,13 +1,24 @@
 import unittest
 from .client_tests import rexster_client_suite
 from .bulbs_tests import test_suite as bulbs_test_suite
+from .fake_server_tests import fake_server_suite
+from .rexpro_tests import rexpro_suite
+from .routing_tests import routing_suite
 
 def test_suite():
     suite = unittest.TestSuite()
     suite.addTest(rexster_client_suite())
     suite.addTest(bulbs_test_suite())
+    suite.addTest(offline_suite())
+    return suite
+
+def offline_suite():
+    # These run against local fake servers, so they don't need Rexster.
+    suite = unittest.TestSuite()
+    suite.addTest(fake_server_suite())
+    suite.addTest(rexpro_suite())
+    suite.addTest(routing_suite())
     return suite
 
 if __name__ == '__main__':
     unittest.main(defaultTest='suite')
-
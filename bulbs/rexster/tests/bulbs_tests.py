@@ -2,7 +2,7 @@ import sys
 import unittest
 import argparse
 from bulbs.config import Config, DEBUG
-from bulbs.tests import BulbsTestCase, bulbs_test_suite
+from bulbs.tests import BulbsTestCase, BulbsTestSuite, bulbs_test_suite
 from bulbs.rexster import Graph, RexsterClient, REXSTER_URI, \
     VertexIndexProxy, EdgeIndexProxy, ManualIndex
 from bulbs.tests import GremlinTestCase
@@ -22,7 +22,9 @@ def test_suite():
     suite = bulbs_test_suite()
     #suite.addTest(unittest.makeSuite(RestTestCase))
     suite.addTest(unittest.makeSuite(GremlinTestCase))
-    return suite
+    return BulbsTestSuite([suite], client=client, graph=BulbsTestCase.graph,
+                          vertex_index_proxy=VertexIndexProxy,
+                          edge_index_proxy=EdgeIndexProxy, index_class=ManualIndex)
 
 if __name__ == '__main__':
 
@@ -0,0 +1,203 @@
+import logging
+import socket
+import threading
+import unittest
+
+from bulbs.config import Config
+from bulbs.testing import FakeServer
+from bulbs.singleflight import get_request_key
+from bulbs.slowlog import SlowQueryLog
+from bulbs.utils import json
+from bulbs.tests import BulbsTestCase, BulbsTestSuite, bulbs_test_suite
+from bulbs.rexster import Graph, RexsterClient, \
+    VertexIndexProxy, EdgeIndexProxy, ManualIndex
+
+from .client_tests import RexsterClientTestCase, RexsterClientIndexTestCase
+
+# Runs the Rexster client and Bulbs suites against a local fake server, 
+# so they can run without Rexster. GremlinTestCase is left out because it
+# sends arbitrary Groovy, which the fake server doesn't interpret.
+server = FakeServer()
+
+# Slow enough that concurrent reads overlap.
+slow_server = FakeServer(latency=0.05)
+
+
+def get_client():
+    return RexsterClient(Config(server.get_graph_uri()))
+
+
+class FakeServerClientTestCase(RexsterClientTestCase):
+
+    def setUp(self):
+        self.client = get_client()
+
+
+class FakeServerClientIndexTestCase(RexsterClientIndexTestCase):
+
+    def setUp(self):
+        self.client = get_client()
+
+
+class CompressionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = get_client()
+
+    def test_uncompressed_by_default(self):
+        headers = self.client.request._build_request_args("vertices", "POST", dict(a=1))[3]
+        assert headers['Accept-Encoding'] == "identity"
+        assert 'Content-Encoding' not in headers
+
+    def test_compressed_responses(self):
+        self.client.config.compress_responses = True
+        sent = server.bytes_sent
+        resp = self.client.create_vertex(dict(name="James" * 100))
+        assert resp.results.get_data() == dict(name="James" * 100)
+        # The body is gzipped on the wire.
+        assert server.bytes_sent - sent < 200
+
+    def test_compressed_request_bodies(self):
+        self.client.config.compress_threshold = 100
+        body, headers = self.client.request._build_request_args(
+            "vertices", "POST", dict(name="James" * 100))[2:]
+        assert headers['Content-Encoding'] == "gzip"
+        assert len(body) < 100
+        resp = self.client.create_vertex(dict(name="James" * 100))
+        assert resp.results.get_data() == dict(name="James" * 100)
+        # Small bodies aren't worth it.
+        headers = self.client.request._build_request_args("vertices", "POST", dict(a=1))[3]
+        assert 'Content-Encoding' not in headers
+
+    def test_compressed_stream(self):
+        self.client.config.compress_responses = True
+        _id = self.client.create_vertex(dict(name="James")).results.get_id()
+        params = dict(script=self.client.scripts.get("get_vertex"), params=dict(_id=_id))
+        chunks = self.client.request.stream("POST", "tp/gremlin", params, chunk_size=16)
+        content = json.loads(b"".join(chunks).decode("utf-8"))
+        assert content['results'][0]['name'] == "James"
+
+
+class TimeoutTestCase(unittest.TestCase):
+
+    def setUp(self):
+        config = Config(slow_server.get_graph_uri())
+        config.timeout = 0.01
+        self.client = RexsterClient(config)
+
+    def test_stream_timeout(self):
+        params = dict(script=self.client.scripts.get("get_vertex"), params=dict(_id="1"))
+        chunks = self.client.request.stream("POST", "tp/gremlin", params)
+        self.assertRaises(socket.timeout, list, chunks)
+
+
+class SlowQueryLogTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = get_client()
+        # Every call is slow at threshold 0, so don't log them.
+        logger = logging.getLogger("bulbs.tests.slowlog")
+        logger.propagate = False
+        logger.addHandler(logging.NullHandler())
+        self.slow_log = SlowQueryLog(threshold=0, report_interval=None, logger=logger)
+        self.client.config.metrics = self.slow_log
+
+    def tearDown(self):
+        self.client.config.metrics = None
+
+    def test_ad_hoc_scripts_are_fingerprinted(self):
+        _id = self.client.create_vertex(dict(name="James")).one().get_id()
+        self.client.gremlin("g.v(%s).out('knows')" % _id)
+        self.client.gremlin("g.v(%s).out('created')" % _id)
+        self.client.gremlin("g.v(%s).outE('knows').count()" % _id)
+        names = dict((stats.key[1], stats.count) for stats in self.slow_log.get_top()
+                     if stats.key[1].startswith("gremlin"))
+        assert sorted(names.values()) == [1, 2]
+        assert all(name.startswith("gremlin:") for name in names)
+        assert "POST vertices" in self.slow_log.format_report()
+
+    def test_report_starts_a_new_period(self):
+        self.client.create_vertex(dict(name="James"))
+        self.slow_log.report()
+        assert self.slow_log.get_top() == []
+        self.client.create_vertex(dict(name="Julie"))
+        assert [stats.count for stats in self.slow_log.get_top()] == [1]
+
+
+class CoalescingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = Graph(Config(slow_server.get_graph_uri()))
+        self.graph.config.coalesce_reads = True
+
+    def run_threads(self, func, count=8):
+        results = [None] * count
+        def run(i):
+            try:
+                results[i] = func()
+            except Exception as e:
+                results[i] = e
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_identical_reads_share_a_request(self):
+        james = self.graph.vertices.create(name="James")
+        requests = slow_server.requests
+        vertices = self.run_threads(lambda: self.graph.vertices.get(james.eid))
+        assert slow_server.requests - requests < len(vertices)
+        assert self.graph.client.request.flights.coalesced > 0
+        assert set(vertex.name for vertex in vertices) == set(["James"])
+        # Each caller gets its own elements and results.
+        assert len(set(id(vertex) for vertex in vertices)) == len(vertices)
+        assert len(set(id(vertex._result) for vertex in vertices)) == len(vertices)
+        vertices[0].name = "Jim"
+        assert vertices[1].name == "James"
+
+    def test_errors_are_shared(self):
+        results = self.run_threads(lambda: self.graph.vertices.get("missing"))
+        assert all(result is None or isinstance(result, LookupError) for result in results)
+
+    def test_only_reads_are_coalesced(self):
+        request = self.graph.client.request
+        assert request.is_read("GET", "vertices/1", None)
+        script = self.graph.client.scripts.get("outV")
+        assert request.is_read("POST", "tp/gremlin", dict(script=script, params={}))
+        assert not request.is_read("POST", "vertices", dict(name="James"))
+        assert not request.is_read("POST", "tp/gremlin", dict(script="g.V", params={}))
+
+    def test_request_key(self):
+        key = get_request_key("POST", "tp/gremlin", dict(script="g.v(_id)", params=dict(_id=1)))
+        assert key == get_request_key("POST", "tp/gremlin",
+                                      dict(params=dict(_id=1), script="g.v(_id)"))
+        assert key != get_request_key("POST", "tp/gremlin",
+                                      dict(script="g.v(_id)", params=dict(_id=2)))
+        hash(get_request_key("GET", "vertices", dict(ids=[1, 2], data=dict(a=[1]))))
+
+
+def fake_server_suite():
+    server.start()
+    slow_server.start()
+    client = get_client()
+    BulbsTestCase.client = client
+    BulbsTestCase.vertex_index_proxy = VertexIndexProxy
+    BulbsTestCase.edge_index_proxy = EdgeIndexProxy
+    BulbsTestCase.index_class = ManualIndex
+    BulbsTestCase.graph = Graph(client.config)
+
+    suite = bulbs_test_suite()
+    suite.addTest(unittest.makeSuite(FakeServerClientTestCase))
+    suite.addTest(unittest.makeSuite(FakeServerClientIndexTestCase))
+    suite.addTest(unittest.makeSuite(CompressionTestCase))
+    suite.addTest(unittest.makeSuite(TimeoutTestCase))
+    suite.addTest(unittest.makeSuite(SlowQueryLogTestCase))
+    suite.addTest(unittest.makeSuite(CoalescingTestCase))
+    return BulbsTestSuite([suite], client=client, graph=BulbsTestCase.graph,
+                          vertex_index_proxy=VertexIndexProxy,
+                          edge_index_proxy=EdgeIndexProxy, index_class=ManualIndex)
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='fake_server_suite')
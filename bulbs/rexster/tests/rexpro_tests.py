@@ -0,0 +1,128 @@
+import io
+import unittest
+
+from bulbs.config import Config
+from bulbs.testing import FakeRexProServer
+from bulbs.tests import BulbsTestCase, BulbsTestSuite, bulbs_test_suite
+from bulbs.tests.client_tests import ClientTestCase
+from bulbs.tests.client_index_tests import ClientIndexTestCase
+from bulbs.rexster import Graph, RexProClient, RexProError, \
+    VertexIndexProxy, EdgeIndexProxy, ManualIndex
+from bulbs.rexster.rexpro import JSONSerializer, SCRIPT_REQUEST, \
+    pack_message, read_message, normalize, parse_uri
+
+# Runs the client and Bulbs suites over RexPro against a local fake server,
+# so they can run without Rexster. The RexsterClient tests are left out
+# because RexPro has no automatic indices.
+server = FakeRexProServer()
+
+
+def get_client():
+    return RexProClient(Config(server.get_graph_uri()))
+
+
+class RexProGraph(Graph):
+
+    client_class = RexProClient
+
+
+class Recorder(object):
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def record_request(self, info):
+        self.calls.append(info)
+
+
+class RexProClientTestCase(ClientTestCase):
+
+    def setUp(self):
+        self.client = get_client()
+
+
+class RexProClientIndexTestCase(ClientIndexTestCase):
+
+    def setUp(self):
+        self.client = get_client()
+
+
+class RexProTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = get_client()
+
+    def test_message_round_trip(self):
+        serializer = JSONSerializer()
+        fields = ["session", "request", dict(inSession=True), "groovy", "g", {}]
+        message = pack_message(serializer, SCRIPT_REQUEST, fields)
+        serializer_type, message_type, body = read_message(io.BytesIO(message))
+        assert serializer_type == serializer.serializer_type
+        assert message_type == SCRIPT_REQUEST
+        assert serializer.loads(body) == fields
+
+    def test_parse_uri(self):
+        assert parse_uri("rexpro://example.com/graphs/emptygraph") == \
+            ("example.com", 8184, "emptygraph")
+        assert parse_uri("rexpro://localhost:9000/graphs/tinkergraph/") == \
+            ("localhost", 9000, "tinkergraph")
+
+    def test_normalize(self):
+        element = dict(_id="1", _type="vertex", _properties=dict(name="James"))
+        assert normalize([element]) == [dict(_id="1", _type="vertex", name="James")]
+        assert normalize(dict(count=1)) == dict(count=1)
+
+    def test_connections_are_reused(self):
+        self.client.create_vertex(dict(name="James"))
+        pool = self.client.request.pool
+        connection = pool.idle.queue[-1]
+        self.client.create_vertex(dict(name="Julie"))
+        assert pool.idle.qsize() == 1
+        assert pool.idle.queue[-1] is connection
+
+    def test_script_error(self):
+        self.assertRaises(RexProError, self.client.gremlin, "g.unknownMethod()")
+        # The connection stays usable after an error.
+        resp = self.client.create_vertex(dict(name="James"))
+        assert resp.results.get_data() == dict(name="James")
+
+    def test_lost_session_is_reopened(self):
+        self.client.create_vertex(dict(name="James"))
+        server.sessions.clear()
+        resp = self.client.create_vertex(dict(name="Julie"))
+        assert resp.results.get_data() == dict(name="Julie")
+
+    def test_metrics(self):
+        calls = []
+        self.client.config.metrics = Recorder(calls)
+        try:
+            self.client.create_vertex(dict(name="James"))
+        finally:
+            self.client.config.metrics = None
+        assert len(calls) == 1
+        assert calls[0].name == "create_vertex"
+        assert calls[0].bytes_sent > 0 and calls[0].bytes_received > 0
+
+    def tearDown(self):
+        self.client.close()
+
+
+def rexpro_suite():
+    server.start()
+    client = get_client()
+    BulbsTestCase.client = client
+    BulbsTestCase.vertex_index_proxy = VertexIndexProxy
+    BulbsTestCase.edge_index_proxy = EdgeIndexProxy
+    BulbsTestCase.index_class = ManualIndex
+    BulbsTestCase.graph = RexProGraph(client.config)
+
+    suite = bulbs_test_suite()
+    suite.addTest(unittest.makeSuite(RexProClientTestCase))
+    suite.addTest(unittest.makeSuite(RexProClientIndexTestCase))
+    suite.addTest(unittest.makeSuite(RexProTestCase))
+    return BulbsTestSuite([suite], client=client, graph=BulbsTestCase.graph,
+                          vertex_index_proxy=VertexIndexProxy,
+                          edge_index_proxy=EdgeIndexProxy, index_class=ManualIndex)
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='rexpro_suite')
@@ -0,0 +1,204 @@
+import pickle
+import unittest
+
+from bulbs.config import Config
+from bulbs.metrics import HistogramCollector, timer
+from bulbs.routing import Router, Endpoint, LatencyWindow, MASTER, REPLICA
+from bulbs.testing import FakeServer, MemoryGraph
+from bulbs.rexster import RexsterClient
+
+# A master and two replicas, serving the same graph as if it's replicated.
+graph = MemoryGraph()
+master = FakeServer(graph)
+replicas = [FakeServer(graph), FakeServer(graph)]
+
+# Replicas for hedging, one of them paused as if it's collecting garbage.
+SLOW = 0.25
+slow_replica = FakeServer(graph, latency=SLOW)
+fast_replica = FakeServer(graph)
+
+# Nothing listens on port 1, so connecting fails right away.
+DEAD_URI = "http://127.0.0.1:1/graphs/tinkergraph"
+
+
+def get_client(router):
+    config = Config(master.get_graph_uri())
+    config.router = router
+    return RexsterClient(config)
+
+
+def get_router(**kwds):
+    endpoints = [(master.get_graph_uri(), MASTER)]
+    endpoints += [(replica.get_graph_uri(), REPLICA) for replica in replicas]
+    return Router(endpoints, **kwds)
+
+
+class Counter(object):
+    """Counts the responses each server sends."""
+
+    def __init__(self):
+        self.servers = [master] + replicas
+        self.start = [server.bytes_sent for server in self.servers]
+
+    def counts(self):
+        changed = [server.bytes_sent > start
+                   for server, start in zip(self.servers, self.start)]
+        self.start = [server.bytes_sent for server in self.servers]
+        return changed
+
+
+class RouterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.router = get_router()
+        self.client = get_client(self.router)
+
+    def test_writes_go_to_the_master(self):
+        counter = Counter()
+        self.client.create_vertex(dict(name="James"))
+        assert counter.counts() == [True, False, False]
+        self.client.get_or_create_vertex_index("people")
+        assert counter.counts() == [True, False, False]
+        self.client.create_indexed_vertex(dict(name="James"), "people")
+        assert counter.counts() == [True, False, False]
+
+    def test_reads_go_to_the_replicas(self):
+        _id = self.client.create_vertex(dict(name="James")).results.get_id()
+        counter = Counter()
+        for i in range(4):
+            assert self.client.get_vertex(_id).results.get_data() == dict(name="James")
+        assert counter.counts() == [False, True, True]
+        self.client.outV(_id)
+        assert counter.counts()[0] is False
+
+    def test_arbitrary_gremlin_goes_to_the_master(self):
+        counter = Counter()
+        self.client.gremlin("g.V")
+        assert counter.counts() == [True, False, False]
+
+    def test_least_outstanding(self):
+        first, second = self.router.replicas
+        first.outstanding = 1
+        for i in range(4):
+            endpoint = self.router.choose(read=True)
+            assert endpoint is second
+            self.router.release(endpoint)
+        first.outstanding = 0
+
+    def test_failed_replica_is_skipped(self):
+        router = Router([(master.get_graph_uri(), MASTER), (DEAD_URI, REPLICA),
+                         (replicas[0].get_graph_uri(), REPLICA)])
+        client = get_client(router)
+        _id = client.create_vertex(dict(name="James")).results.get_id()
+        for i in range(4):
+            assert client.get_vertex(_id).results.get_data() == dict(name="James")
+        dead = router.replicas[0]
+        assert not dead.is_available()
+        assert dead.outstanding == 0
+
+    def test_reads_fall_back_to_the_master(self):
+        router = Router([(master.get_graph_uri(), MASTER), (DEAD_URI, REPLICA)])
+        client = get_client(router)
+        _id = client.create_vertex(dict(name="James")).results.get_id()
+        assert client.get_vertex(_id).results.get_data() == dict(name="James")
+        assert router.choose(read=True) is router.master
+
+    def test_sticky_reads(self):
+        client = get_client(get_router(sticky_time=60))
+        counter = Counter()
+        _id = client.create_vertex(dict(name="James")).results.get_id()
+        client.get_vertex(_id)
+        assert counter.counts() == [True, False, False]
+
+    def test_check_health(self):
+        router = Router([(master.get_graph_uri(), MASTER), (DEAD_URI, REPLICA)])
+        live, dead = router.endpoints
+        live.down_until = float("inf")
+        router.check_health()
+        assert live.is_available()
+        assert not dead.is_available()
+
+    def test_one_master(self):
+        self.assertRaises(ValueError, Router, [(DEAD_URI, REPLICA)])
+        self.assertRaises(ValueError, Endpoint, DEAD_URI, "primary")
+
+    def test_pickle(self):
+        router = pickle.loads(pickle.dumps(self.router))
+        assert [endpoint.uri for endpoint in router.endpoints] == \
+            [endpoint.uri for endpoint in self.router.endpoints]
+        assert router.choose(read=False).uri == master.get_graph_uri()
+
+
+class HedgingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.router = Router([(master.get_graph_uri(), MASTER),
+                              (slow_replica.get_graph_uri(), REPLICA),
+                              (fast_replica.get_graph_uri(), REPLICA)],
+                             hedge_percentile=95, hedge_budget=1.0)
+        self.client = get_client(self.router)
+        self._id = self.client.create_vertex(dict(name="James")).results.get_id()
+
+    def prime(self, delay=0.01):
+        # As if get_vertex's p95 is known, instead of making 20 calls.
+        window = LatencyWindow(95)
+        window.value = delay
+        self.router.latencies["vertices/{id}"] = window
+
+    def test_slow_reads_are_hedged(self):
+        self.prime()
+        self.client.config.metrics = collector = HistogramCollector()
+        for i in range(4):
+            start = timer()
+            assert self.client.get_vertex(self._id).results.get_data() == dict(name="James")
+            assert timer() - start < SLOW
+        assert self.router.hedges >= 1
+        assert self.router.hedge_wins == self.router.hedges
+        histogram = collector.get("hedge_server_seconds", "GET", "vertices/{id}")
+        assert histogram.count == self.router.hedges
+
+    def test_worker_threads_are_reused(self):
+        self.prime(delay=10)
+        for i in range(6):
+            self.client.get_vertex(self._id)
+        assert self.router.hedges == 0
+        # One worker, and at most one more if a read was sent before the
+        # last one's worker was idle again.
+        assert self.router.workers <= 2
+
+    def test_budget(self):
+        self.prime()
+        self.router.hedge_budget = 0
+        for i in range(4):
+            self.client.get_vertex(self._id)
+        assert self.router.hedges == 0
+
+    def test_no_hedging_without_latencies(self):
+        self.client.get_vertex(self._id)
+        assert self.router.hedges == 0
+        assert len(self.router.latencies["vertices/{id}"].samples) == 1
+
+    def test_errors_are_raised(self):
+        self.prime()
+        for i in range(2):
+            self.assertRaises(LookupError, self.client.get_vertex, "missing")
+
+    def test_latency_window(self):
+        window = LatencyWindow(90, min_samples=10)
+        for i in range(9):
+            window.add(i)
+        assert window.value is None
+        window.add(9)
+        assert window.value == 9
+
+
+def routing_suite():
+    for server in [master, slow_replica, fast_replica] + replicas:
+        server.start()
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(RouterTestCase))
+    suite.addTest(unittest.makeSuite(HedgingTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='routing_suite')
@@ -0,0 +1,507 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Routes requests across a master and its read replicas, e.g. a Neo4j HA
+cluster.
+
+"""
+import socket
+import sys
+import threading
+from collections import deque
+
+import httplib2
+import six
+from six.moves import http_client, queue
+
+from .metrics import timer
+from .utils import get_logger
+
+log = get_logger(__name__)
+
+# Endpoint roles
+MASTER = "master"
+REPLICA = "replica"
+
+#: Errors that mean the request didn't reach the server or got no response.
+CONNECTION_ERRORS = (socket.error, httplib2.HttpLib2Error, http_client.HTTPException)
+
+#: Most hedges that can be saved up from the budget.
+HEDGE_BURST = 10
+
+#: Seconds an idle worker thread waits for another request before exiting.
+WORKER_IDLE_TIME = 60.0
+
+
+class LatencyWindow(object):
+    """
+    The latencies of the most recent calls, and a percentile of them that's
+    recomputed every so often rather than on each call.
+
+    :param percentile: The percentile to track, e.g. 95.
+    :type percentile: float
+
+    :param size: Number of latencies to keep. Defaults to 1000.
+    :type size: int
+
+    :param min_samples: Number of latencies needed before there's a
+        percentile. Defaults to 20.
+    :type min_samples: int
+
+    """
+    def __init__(self, percentile, size=1000, min_samples=20):
+        self.percentile = percentile
+        self.samples = deque(maxlen=size)
+        self.min_samples = min_samples
+        self.value = None
+        self.stale = 0
+
+    def add(self, latency):
+        """Adds a call's latency in seconds."""
+        self.samples.append(latency)
+        self.stale += 1
+        if self.stale >= self.min_samples:
+            self.stale = 0
+            samples = sorted(self.samples)
+            index = int(len(samples) * self.percentile / 100.0)
+            self.value = samples[min(index, len(samples) - 1)]
+
+
+class Endpoint(object):
+    """
+    A server the Router can send requests to.
+
+    :param uri: Root URI of the database on the server.
+    :type uri: str
+
+    :param role: MASTER or REPLICA. Defaults to REPLICA.
+    :type role: str
+
+    :ivar outstanding: Number of requests in flight.
+    :ivar down_until: Time until which the endpoint is skipped, after it
+        failed a request or a health check.
+
+    """
+    def __init__(self, uri, role=REPLICA):
+        if role not in (MASTER, REPLICA):
+            raise ValueError("Unknown endpoint role: %s" % role)
+        self.uri = uri
+        self.role = role
+        self.outstanding = 0
+        self.down_until = 0.0
+
+    def __repr__(self):
+        return "<Endpoint: %s (%s)>" % (self.uri, self.role)
+
+    def is_available(self, now=None):
+        """Returns True unless the endpoint is marked down."""
+        return (timer() if now is None else now) >= self.down_until
+
+
+class Router(object):
+    """
+    Sends mutating requests to the master and spreads reads across the
+    replicas, to the one with the fewest requests in flight.
+
+    A request is a read if it's a GET or runs one of bulbs.rest.READ_SCRIPTS.
+    Everything else, including Cypher, Multi and arbitrary Gremlin, goes to
+    the master. A replica that fails a request with a connection error is
+    marked down for retry_interval seconds, and the read is retried on
+    another replica, or on the master once no replica is left.
+
+    :param endpoints: List of (uri, role) tuples or Endpoint objects, with
+        one master.
+    :type endpoints: list
+
+    :param sticky_time: Seconds after a thread's write that its reads go to
+        the master too, so it reads its own writes despite replication lag.
+        None disables it. Defaults to None.
+    :type sticky_time: float or None
+
+    :param retry_interval: Seconds to skip an endpoint after it failed.
+        Defaults to 10.
+    :type retry_interval: float
+
+    :param health_check_path: Path below each endpoint's URI that the health
+        checks GET. Defaults to "", the URI itself.
+    :type health_check_path: str
+
+    :param timeout: Seconds before a health check fails. Defaults to 2.
+    :type timeout: float
+
+    :param hedge_percentile: Percentile of a read's recent latencies after
+        which it's hedged: sent again to another endpoint, using whichever
+        answers first. None disables hedging. Defaults to None.
+    :type hedge_percentile: float or None
+
+    :param hedge_budget: Most hedges per read, e.g. 0.05 for at most 5% extra
+        reads. Defaults to 0.05.
+    :type hedge_budget: float
+
+    :ivar hedges: Number of hedged requests sent.
+    :ivar hedge_wins: Number of hedged requests that answered first.
+
+    Example:
+
+    >>> from bulbs.config import Config
+    >>> from bulbs.routing import Router, MASTER, REPLICA
+    >>> from bulbs.neo4jserver import Graph
+    >>> config = Config("http://master:7474/db/data/")
+    >>> config.router = Router([("http://master:7474/db/data/", MASTER),
+    ...                         ("http://replica1:7474/db/data/", REPLICA),
+    ...                         ("http://replica2:7474/db/data/", REPLICA)],
+    ...                        sticky_time=1.0)
+    >>> config.router.start_health_checks(interval=5)
+    >>> g = Graph(config)
+
+    Hedging only applies to reads sent to replicas, and it sends them from
+    worker threads that are reused between reads. Each call name, e.g.
+    "get_vertex", has its own latency percentile.
+
+    """
+    def __init__(self, endpoints, sticky_time=None, retry_interval=10.0,
+                 health_check_path="", timeout=2.0, hedge_percentile=None,
+                 hedge_budget=0.05):
+        self.endpoints = [endpoint if isinstance(endpoint, Endpoint) else Endpoint(*endpoint)
+                          for endpoint in endpoints]
+        masters = [endpoint for endpoint in self.endpoints if endpoint.role == MASTER]
+        if len(masters) != 1:
+            raise ValueError("A Router needs one master endpoint, not %d" % len(masters))
+        self.master = masters[0]
+        self.replicas = [endpoint for endpoint in self.endpoints if endpoint.role == REPLICA]
+        self.sticky_time = sticky_time
+        self.retry_interval = retry_interval
+        self.health_check_path = health_check_path
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.turn = 0
+        self.stopped = None
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget
+        self.hedge_tokens = 0.0
+        self.latencies = dict()
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.tasks = queue.Queue()
+        self.workers = 0
+        self.idle_workers = 0
+
+    def is_read(self, request, method, path, params):
+        """
+        Returns True if the request doesn't write, so a replica can serve it.
+
+        :param request: The Request sending it.
+        :type request: bulbs.rest.Request
+
+        :param method: HTTP method.
+        :type method: str
+
+        :param path: Path to the server resource, relative to the root URI.
+        :type path: str
+
+        :param params: Optional URI parameters for the resource.
+        :type params: dict
+
+        :rtype: bool
+
+        """
+        return request.is_read(method, path, params)
+
+    def choose(self, read, exclude=()):
+        """
+        Returns the endpoint to send a request to, and counts it as in
+        flight until release() is called.
+
+        :param read: True if the request is a read.
+        :type read: bool
+
+        :param exclude: Endpoints to skip, e.g. the ones that already failed.
+        :type exclude: list
+
+        :rtype: Endpoint
+
+        """
+        with self.lock:
+            endpoint = self.master
+            if read and not self._is_sticky():
+                now = timer()
+                replicas = [replica for replica in self.replicas
+                            if replica not in exclude and replica.is_available(now)]
+                if replicas:
+                    # Rotate the ties so they're spread round robin.
+                    self.turn += 1
+                    start = self.turn % len(replicas)
+                    replicas = replicas[start:] + replicas[:start]
+                    endpoint = min(replicas, key=lambda replica: replica.outstanding)
+            endpoint.outstanding += 1
+        return endpoint
+
+    def release(self, endpoint):
+        """
+        Counts a request to the endpoint as done.
+
+        :param endpoint: The endpoint choose() returned.
+        :type endpoint: Endpoint
+
+        :rtype: None
+
+        """
+        with self.lock:
+            endpoint.outstanding -= 1
+
+    def mark_down(self, endpoint):
+        """
+        Skips the endpoint for retry_interval seconds. Writes still go to the
+        master, since there's nowhere else for them to go.
+
+        :rtype: None
+
+        """
+        log.warning("Marking %s down for %ss", endpoint, self.retry_interval)
+        endpoint.down_until = timer() + self.retry_interval
+
+    def send(self, request, method, path, params):
+        """
+        Sends the request to the endpoint for it and returns the Response.
+
+        :param request: The Request to send it with.
+        :type request: bulbs.rest.Request
+
+        :rtype: Response
+
+        """
+        read = self.is_read(request, method, path, params)
+        if not read and self.sticky_time is not None:
+            # Before the write, in case it's applied but the response is lost.
+            self.local.last_write = timer()
+        if read and self.hedge_percentile is not None:
+            return self._send_hedged(request, method, path, params)
+        return self._send(request, method, path, params, read)
+
+    def _send(self, request, method, path, params, read, tried=None):
+        tried = tried or []
+        while True:
+            endpoint = self.choose(read, tried)
+            try:
+                return request.send_to(endpoint.uri, method, path, params)
+            except CONNECTION_ERRORS:
+                self.mark_down(endpoint)
+                # Only reads are safe to send again.
+                if not read or endpoint is self.master:
+                    raise
+                tried.append(endpoint)
+            finally:
+                self.release(endpoint)
+
+    def check_health(self):
+        """
+        GETs each endpoint's health check path and marks the endpoints that
+        fail it down, and the ones that pass it up.
+
+        :rtype: None
+
+        """
+        http = httplib2.Http(timeout=self.timeout)
+        for endpoint in self.endpoints:
+            uri = "%s/%s" % (endpoint.uri.rstrip("/"), self.health_check_path.lstrip("/"))
+            try:
+                status = http.request(uri, "GET")[0].status
+            except CONNECTION_ERRORS as e:
+                log.debug("Health check of %s failed: %s", endpoint, e)
+                status = None
+            if status is not None and status < 500:
+                endpoint.down_until = 0.0
+            else:
+                self.mark_down(endpoint)
+
+    def start_health_checks(self, interval=5.0):
+        """
+        Runs check_health() every interval seconds in a daemon thread.
+
+        :param interval: Seconds between health checks. Defaults to 5.
+        :type interval: float
+
+        :rtype: None
+
+        """
+        self.stop_health_checks()
+        stopped = self.stopped = threading.Event()
+
+        def run():
+            while not stopped.is_set():
+                self.check_health()
+                stopped.wait(interval)
+
+        self._submit(run)
+
+    def _submit(self, task):
+        # Runs the task on an idle worker thread, or on a new one if none is.
+        with self.lock:
+            spawn = self.idle_workers == 0
+            if spawn:
+                self.workers += 1
+            else:
+                self.idle_workers -= 1
+        self.tasks.put(task)
+        if spawn:
+            thread = threading.Thread(target=self._work)
+            thread.daemon = True
+            thread.start()
+
+    def _work(self):
+        while True:
+            try:
+                task = self.tasks.get(timeout=WORKER_IDLE_TIME)
+            except queue.Empty:
+                with self.lock:
+                    # Unless a task was submitted for this worker meanwhile.
+                    if self.idle_workers:
+                        self.idle_workers -= 1
+                        self.workers -= 1
+                        return
+                continue
+            task()
+            with self.lock:
+                self.idle_workers += 1
+
+    def stop_health_checks(self):
+        """
+        Stops the health check thread, if it's running.
+
+        :rtype: None
+
+        """
+        if self.stopped is not None:
+            self.stopped.set()
+            self.stopped = None
+
+    def _send_hedged(self, request, method, path, params):
+        name = request.get_call_name(path, params)
+        with self.lock:
+            window = self.latencies.get(name)
+            if window is None:
+                window = self.latencies[name] = LatencyWindow(self.hedge_percentile)
+            self.hedge_tokens = min(self.hedge_tokens + self.hedge_budget, HEDGE_BURST)
+        endpoint = self.choose(True)
+        if endpoint is self.master or window.value is None:
+            # Nowhere to hedge to, or too few latencies to know when.
+            self.release(endpoint)
+            start = timer()
+            try:
+                return self._send(request, method, path, params, True)
+            finally:
+                with self.lock:
+                    window.add(timer() - start)
+
+        answers = queue.Queue()
+        self._start_attempt(answers, request, endpoint, method, path, params, window)
+        tried, pending, timeout = [endpoint], 1, window.value
+        while True:
+            try:
+                endpoint, resp, exc_info = answers.get(timeout=timeout)
+            except queue.Empty:
+                timeout = None
+                hedge = self._choose_hedge(tried)
+                if hedge is not None:
+                    tried.append(hedge)
+                    pending += 1
+                    self._start_attempt(answers, request, hedge, method, path, params,
+                                        window, True)
+                continue
+            pending -= 1
+            if exc_info is None:
+                if endpoint is not tried[0]:
+                    with self.lock:
+                        self.hedge_wins += 1
+                return resp
+            if not issubclass(exc_info[0], CONNECTION_ERRORS):
+                six.reraise(*exc_info)
+            self.mark_down(endpoint)
+            if not pending:
+                return self._send(request, method, path, params, True, tried)
+
+    def _choose_hedge(self, tried):
+        # Returns the endpoint to hedge to, if there's one and it's in budget.
+        with self.lock:
+            if self.hedge_tokens < 1:
+                return None
+        endpoint = self.choose(True, tried)
+        if endpoint in tried:
+            self.release(endpoint)
+            return None
+        with self.lock:
+            self.hedge_tokens -= 1
+            self.hedges += 1
+        return endpoint
+
+    def _start_attempt(self, answers, request, endpoint, method, path, params, window,
+                       hedge=False):
+        # Sends the request from a thread and puts the outcome in answers.
+        def run():
+            start = timer()
+            try:
+                with request.concurrent_http() as http:
+                    resp = request.send_to(endpoint.uri, method, path, params, http, hedge)
+            except Exception:
+                answers.put((endpoint, None, sys.exc_info()))
+            else:
+                answers.put((endpoint, resp, None))
+            finally:
+                self.release(endpoint)
+                with self.lock:
+                    window.add(timer() - start)
+
+        self._submit(run)
+
+    def _submit(self, task):
+        # Runs the task on an idle worker thread, or on a new one if none is.
+        with self.lock:
+            spawn = self.idle_workers == 0
+            if spawn:
+                self.workers += 1
+            else:
+                self.idle_workers -= 1
+        self.tasks.put(task)
+        if spawn:
+            thread = threading.Thread(target=self._work)
+            thread.daemon = True
+            thread.start()
+
+    def _work(self):
+        while True:
+            try:
+                task = self.tasks.get(timeout=WORKER_IDLE_TIME)
+            except queue.Empty:
+                with self.lock:
+                    # Unless a task was submitted for this worker meanwhile.
+                    if self.idle_workers:
+                        self.idle_workers -= 1
+                        self.workers -= 1
+                        return
+                continue
+            task()
+            with self.lock:
+                self.idle_workers += 1
+
+    def __getstate__(self):
+        # Configs are pickled with elements; the copy doesn't run health checks.
+        state = self.__dict__.copy()
+        for key in ("lock", "local", "stopped", "tasks"):
+            del state[key]
+        state.update(workers=0, idle_workers=0)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.stopped = None
+        self.tasks = queue.Queue()
+
+    def _is_sticky(self):
+        last_write = getattr(self.local, "last_write", None)
+        return last_write is not None and timer() - last_write < self.sticky_time
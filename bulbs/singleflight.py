@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Single-flight: identical concurrent reads share one request.
+
+"""
+import sys
+import threading
+
+import six
+
+from .utils import get_logger
+
+log = get_logger(__name__)
+
+
+class Flight(object):
+    """
+    A request in flight, which the callers that join it wait for.
+
+    :ivar response: The Response, once it's done.
+    :ivar exc_info: The sys.exc_info() of its error, if it failed.
+    :ivar joined: Number of callers that joined it.
+
+    """
+    __slots__ = ("done", "response", "exc_info", "joined")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.exc_info = None
+        self.joined = 0
+
+
+class SingleFlight(object):
+    """
+    Runs one call at a time per key. Callers that ask for a key while its
+    call is in flight wait for it and get a copy of its Response, with its
+    own results, so they initialize their own element objects. The copies
+    share the decoded content, which elements don't modify.
+
+    :ivar flights: Dict of the Flights in progress, keyed by request key.
+    :ivar coalesced: Number of calls that were answered by another's request.
+
+    Example:
+
+    >>> from bulbs.config import Config
+    >>> from bulbs.neo4jserver import Graph, NEO4J_URI
+    >>> config = Config(NEO4J_URI)
+    >>> config.coalesce_reads = True
+    >>> g = Graph(config)
+
+    """
+    def __init__(self):
+        self.flights = dict()
+        self.lock = threading.Lock()
+        self.coalesced = 0
+
+    def call(self, key, func):
+        """
+        Returns func's Response, or a copy of the one in flight for the key.
+
+        :param key: Hashable request key, from get_request_key().
+        :type key: tuple
+
+        :param func: Function that sends the request and returns its Response.
+        :type func: function
+
+        :rtype: Response
+
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+            else:
+                flight.joined += 1
+                self.coalesced += 1
+        if leader:
+            try:
+                flight.response = func()
+            except Exception:
+                flight.exc_info = sys.exc_info()
+                raise
+            finally:
+                with self.lock:
+                    del self.flights[key]
+                flight.done.set()
+            return flight.response
+        flight.done.wait()
+        if flight.exc_info is not None:
+            six.reraise(*flight.exc_info)
+        return copy_response(flight.response)
+
+
+def copy_response(resp):
+    """
+    Returns a Response with the same content and its own results.
+
+    :param resp: The Response to copy.
+    :type resp: Response
+
+    :rtype: Response
+
+    """
+    return resp.from_content(resp.content, resp.headers, resp.config)
+
+
+def get_request_key(method, path, params):
+    """
+    Returns a hashable key for a request, which is the same for requests
+    with equal params.
+
+    :param method: HTTP method.
+    :type method: str
+
+    :param path: Path to the server resource, relative to the root URI.
+    :type path: str
+
+    :param params: Optional URI parameters for the resource.
+    :type params: dict
+
+    :rtype: tuple
+
+    """
+    return (method, path, _freeze(params))
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        items = sorted(value.items(), key=lambda item: str(item[0]))
+        return tuple((key, _freeze(item)) for key, item in items)
+    if isinstance(value, (list, tuple)):
+        # Tagged so a list doesn't equal a dict's items.
+        return (list, tuple(_freeze(item) for item in value))
+    return value
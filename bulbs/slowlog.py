@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Slow-query log that records calls over a threshold and reports the worst
+offenders.
+
+"""
+import threading
+import time
+
+from .metrics import Collector
+from .utils import get_logger
+
+log = get_logger(__name__)
+
+
+class SlowQueryStats(object):
+    """
+    Aggregated stats for the slow calls with the same method, name, and
+    params shape.
+
+    :ivar key: (HTTP method, name, params shape) tuple. Ad-hoc scripts are
+        named by kind and fingerprint, e.g. "gremlin:3f2a9c0d1e4b".
+    :ivar count: Number of slow calls.
+    :ivar total_time: Total seconds spent in the slow calls.
+    :ivar max_time: Seconds spent in the slowest call.
+    :ivar bytes_sent: Total request bytes.
+    :ivar bytes_received: Total response bytes.
+
+    """
+    __slots__ = ("key", "count", "total_time", "max_time", "bytes_sent", "bytes_received")
+
+    def __init__(self, key):
+        self.key = key
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def add(self, info, elapsed):
+        """Adds a slow call's CallInfo and elapsed seconds."""
+        self.count += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        self.bytes_sent += info.bytes_sent
+        self.bytes_received += info.bytes_received
+
+
+class SlowQueryLog(Collector):
+    """
+    Logs the calls that take longer than the threshold and periodically
+    logs a report of the top offenders.
+
+    A call's time is its server time plus its decode time. Calls are
+    aggregated by HTTP method, name (e.g. "update_indexed_vertex"), and
+    params shape, so the same call with different values is one offender.
+    Scripts that aren't in the client's library are named by their
+    fingerprint, so each ad-hoc script is its own offender.
+
+    :param threshold: Minimum seconds for a call to be logged. Defaults to 0.5.
+    :type threshold: float
+
+    :param top_n: Number of offenders in each report. Defaults to 10.
+    :type top_n: int
+
+    :param report_interval: Seconds between reports, or None to only
+        report when report() is called. Defaults to 300.
+    :type report_interval: float or None
+
+    :param logger: Logger to write to. Defaults to this module's logger.
+    :type logger: logging.Logger
+
+    Example:
+
+    >>> from bulbs.config import Config
+    >>> from bulbs.slowlog import SlowQueryLog
+    >>> from bulbs.neo4jserver import Graph, NEO4J_URI
+    >>> config = Config(NEO4J_URI)
+    >>> config.metrics = SlowQueryLog(threshold=0.25)
+    >>> g = Graph(config)
+
+    """
+    def __init__(self, threshold=0.5, top_n=10, report_interval=300, logger=None):
+        self.threshold = threshold
+        self.top_n = top_n
+        self.report_interval = report_interval
+        self.logger = logger or log
+        self.stats = dict()
+        self.lock = threading.Lock()
+        self.last_report = time.time()
+
+    def __getstate__(self):
+        # Configs are pickled with elements, and locks can't be pickled.
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self.lock = threading.Lock()
+
+    def record_request(self, info):
+        elapsed = info.server_time + info.decode_time
+        if elapsed >= self.threshold:
+            name = info.name
+            if info.script_fingerprint:
+                name = "%s:%s" % (name, info.script_fingerprint)
+            self.logger.warning("Slow query: %s %s (%s) params=%s sent=%d received=%d "
+                                "server=%.3fs decode=%.3fs", info.method, name,
+                                info.path, info.params_shape, info.bytes_sent,
+                                info.bytes_received, info.server_time, info.decode_time)
+            key = (info.method, name, info.params_shape)
+            with self.lock:
+                stats = self.stats.get(key)
+                if stats is None:
+                    stats = self.stats[key] = SlowQueryStats(key)
+                stats.add(info, elapsed)
+        if self.report_interval is not None and \
+                time.time() - self.last_report >= self.report_interval:
+            self.report()
+
+    def record_initialization(self, info):
+        # Only the request is timed; initialization happens in the caller.
+        pass
+
+    def get_top(self, top_n=None):
+        """
+        Returns the offenders with the most total time in slow calls.
+
+        :param top_n: Number of offenders. Defaults to self.top_n.
+        :type top_n: int
+
+        :rtype: list of SlowQueryStats
+
+        """
+        with self.lock:
+            stats = list(self.stats.values())
+        return self._get_top(stats, top_n)
+
+    def format_report(self, top_n=None):
+        """
+        Returns the top offenders as a text table.
+
+        :param top_n: Number of offenders. Defaults to self.top_n.
+        :type top_n: int
+
+        :rtype: str
+
+        """
+        return self._format(self.get_top(top_n))
+
+    def report(self):
+        """
+        Logs the top offenders since the last report and starts a new period.
+
+        :rtype: None
+
+        """
+        # Swap the stats out under the lock, so calls recorded while the
+        # report is formatted count towards the next one, and concurrent
+        # reports don't log the same period twice.
+        with self.lock:
+            self.last_report = time.time()
+            stats, self.stats = self.stats, dict()
+        if stats:
+            self.logger.warning("Slow query report (top %d):\n%s", self.top_n,
+                                self._format(self._get_top(stats.values())))
+
+    def clear(self):
+        """
+        Removes the aggregated stats.
+
+        :rtype: None
+
+        """
+        with self.lock:
+            self.stats.clear()
+
+    def _get_top(self, stats, top_n=None):
+        stats = sorted(stats, key=lambda item: item.total_time, reverse=True)
+        return stats[:top_n or self.top_n]
+
+    def _format(self, top):
+        lines = ["%6s %10s %9s %10s  %s" % ("count", "total(s)", "max(s)", "recv(KB)", "call")]
+        for stats in top:
+            method, name, params_shape = stats.key
+            lines.append("%6d %10.3f %9.3f %10.1f  %s %s %s" %
+                         (stats.count, stats.total_time, stats.max_time,
+                          stats.bytes_received / 1024.0, method, name, params_shape))
+        return "\n".join(lines)
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+from bulbs.config import Config, DEBUG, INFO, WARNING, ERROR, CRITICAL
+from bulbs.element import Vertex, VertexProxy, Edge, EdgeProxy
+from bulbs.model import Node, NodeProxy, Relationship, RelationshipProxy
+
+from .graph import Graph
+from .client import SQLiteClient, SQLITE_URI
+from .index import ManualIndex, VertexIndexProxy, EdgeIndexProxy
@@ -0,0 +1,1434 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Bulbs supports pluggable clients. This is the embedded SQLite client.
+
+"""
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from bulbs.config import Config
+from bulbs.registry import Registry
+from bulbs.utils import get_logger
+
+# specific to this client
+from bulbs.json import JSONTypeSystem
+from bulbs.base import Client
+from bulbs.base.client import Request
+from bulbs.rexster.client import RexsterResponse
+from bulbs.memory.store import to_index_value, clean_data
+
+
+# The default URI: an in-memory database. Use "sqlite:///path/to/graph.db"
+# for a file, like SQLAlchemy's sqlite URIs.
+SQLITE_URI = "sqlite:///:memory:"
+
+# The logger defined in Config
+log = get_logger(__name__)
+
+# Edges are looked up by either end and label, and index entries by
+# (index_name, key, value); removing an element looks up its entries by ID.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vertices (
+    id INTEGER PRIMARY KEY AUTOINCREMENT
+);
+CREATE TABLE IF NOT EXISTS edges (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    outV INTEGER NOT NULL REFERENCES vertices (id),
+    label TEXT NOT NULL,
+    inV INTEGER NOT NULL REFERENCES vertices (id)
+);
+CREATE INDEX IF NOT EXISTS edges_outV ON edges (outV, label);
+CREATE INDEX IF NOT EXISTS edges_inV ON edges (inV, label);
+CREATE TABLE IF NOT EXISTS properties (
+    element_class TEXT NOT NULL,
+    element_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (element_class, element_id, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS indices (
+    name TEXT PRIMARY KEY,
+    class TEXT NOT NULL,
+    type TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS index_entries (
+    index_name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    element_id INTEGER NOT NULL,
+    PRIMARY KEY (index_name, key, value, element_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS index_entries_element ON index_entries (element_id, index_name);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Stays under SQLITE_MAX_VARIABLE_NUMBER, which is 999 in older builds.
+MAX_VARIABLES = 500
+
+EDGE_COLUMNS = "id, outV, label, inV"
+
+PRIVATE_KEYS = ("_id", "_type", "_outV", "_inV", "_label")
+
+
+class SQLiteResponse(RexsterResponse):
+    """
+    Container class for the database's response. The content is shaped like
+    Rexster's, so the results are RexsterResult objects.
+
+    :param content: A dict with the "results" and/or "totalSize".
+    :type content: dict
+
+    :param config: Config object.
+    :type config: bulbs.config.Config
+
+    :ivar config: Config object.
+    :ivar headers: Always an empty dict.
+    :ivar content: A dict containing the response content.
+    :ivar results: A generator of RexsterResult objects, a single RexsterResult object,
+        or None, depending on the number of results returned.
+    :ivar total_size: The number of results returned.
+    :ivar raw: Always None.
+
+    """
+    def __init__(self, content, config):
+        self.config = config
+        self.headers = dict()
+        self.content = content
+        self.results, self.total_size = self.get_results()
+        self.raw = None
+
+    def handle_response(self, response):
+        pass
+
+    def get_headers(self, response):
+        return dict()
+
+    def get_content(self, response):
+        return response
+
+    def get_multi_content(self):
+        raise NotImplementedError
+
+
+class SQLiteRequest(Request):
+    """There are no HTTP requests; this only holds the Config."""
+
+    response_class = SQLiteResponse
+
+
+class SQLiteClient(Client):
+    """
+    Low-level client that stores the graph in an embedded SQLite database,
+    for deployments that can't run a graph server.
+
+    Vertices, edges, properties, and manual index entries each have a
+    table. Adjacency and index lookups are answered by indexed queries,
+    and each write is one transaction. There's no Gremlin; the methods the
+    server clients implement with Gremlin scripts are implemented in SQL,
+    with the same semantics.
+
+    Data is converted with the JSONTypeSystem, and each property value is
+    stored as JSON, so Models round trip like they do with a server.
+
+    :param config: Optional Config object. Defaults to an in-memory database.
+        The root_uri is "sqlite:///" plus the path of the database file.
+    :type config: bulbs.config.Config
+
+    :cvar default_uri: Default URI for the database.
+    :cvar request_class: Request class for the Client.
+
+    :ivar config: Config object.
+    :ivar registry: Registry object.
+    :ivar type_system: JSONTypeSystem object.
+    :ivar request: SQLiteRequest object.
+    :ivar connection: sqlite3 Connection object.
+
+    Example:
+
+    >>> from bulbs.config import Config
+    >>> from bulbs.sqlite import SQLiteClient
+    >>> client = SQLiteClient(Config("sqlite:///graph.db"))
+    >>> response = client.create_vertex(dict(name="James"))
+    >>> result = response.results
+
+    """
+    #: Default URI for the database.
+    default_uri = SQLITE_URI
+
+    #: Request class for the Client.
+    request_class = SQLiteRequest
+
+    def __init__(self, config=None):
+        self.config = config or Config(self.default_uri)
+        self.registry = Registry(self.config)
+        self.type_system = JSONTypeSystem()
+        self.request = self.request_class(self.config, self.type_system.content_type)
+        self.lock = threading.RLock()
+        self.connection = self._connect(get_database_path(self.config.root_uri))
+
+    def close(self):
+        """
+        Closes the database connection.
+
+        :rtype: None
+
+        """
+        self.connection.close()
+
+    def gremlin(self, script, params=None):
+        """
+        Not supported: the SQLite client doesn't run Gremlin scripts.
+
+        :raises: NotImplementedError
+
+        """
+        raise NotImplementedError("The SQLite client doesn't run Gremlin scripts")
+
+    # Vertex Proxy
+
+    def create_vertex(self, data):
+        """
+        Creates a vertex and returns the Response.
+
+        :param data: Property data.
+        :type data: dict
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            vertex = self._insert_vertices(cursor, [data])[0]
+        return self._respond(vertex)
+
+    def create_vertices(self, data_list):
+        """
+        Creates a vertex for each dict of property data, in one transaction,
+        and returns the Response.
+
+        :param data_list: List of property data dicts.
+        :type data_list: list
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            vertices = self._insert_vertices(cursor, data_list)
+        return self._respond(vertices)
+
+    def get_vertex(self, _id):
+        """
+        Gets the vertex with the _id and returns the Response.
+
+        :param data: Vertex ID.
+        :type data: int
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            return self._respond(self._get_vertex(_id))
+
+    def get_all_vertices(self):
+        """
+        Returns a Response containing all the vertices in the Graph.
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            rows = self.connection.execute("SELECT id FROM vertices ORDER BY id")
+            return self._respond(self._load_vertices(rows))
+
+    def update_vertex(self, _id, data):
+        """
+        Replaces the vertex's properties and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Property data.
+        :type data: dict
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            vertex = self._get_vertex(_id)
+            self._update_properties(cursor, vertex, data)
+        return self._respond(vertex)
+
+    def delete_vertex(self, _id):
+        """
+        Deletes a vertex with the _id, and its edges, and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._get_vertex(_id)
+            edge_ids = [row[0] for row in cursor.execute(
+                "SELECT id FROM edges WHERE outV = ? UNION SELECT id FROM edges WHERE inV = ?",
+                (_id, _id))]
+            for edge_id in edge_ids:
+                self._delete_element(cursor, "edge", edge_id)
+            self._delete_element(cursor, "vertex", _id)
+        return self._respond(None)
+
+    def remove_vertex_properties(self, _id):
+        """
+        Removes all the vertex's properties and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :rtype: SQLiteResponse
+
+        """
+        return self.update_vertex(_id, None)
+
+    # Edge Proxy
+
+    def create_edge(self, outV, label, inV, data=None):
+        """
+        Creates a edge and returns the Response.
+
+        :param outV: Outgoing vertex ID.
+        :type outV: int
+
+        :param label: Edge label.
+        :type label: str
+
+        :param inV: Incoming vertex ID.
+        :type inV: int
+
+        :param data: Property data.
+        :type data: dict or None
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            edge = self._insert_edges(cursor, [(outV, label, inV, data)])[0]
+        return self._respond(edge)
+
+    def create_edges(self, edges):
+        """
+        Creates an edge for each (outV, label, inV, data) tuple, in one
+        transaction, and returns the Response.
+
+        :param edges: List of (outV, label, inV, data) tuples.
+        :type edges: list
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            edges = self._insert_edges(cursor, edges)
+        return self._respond(edges)
+
+    def get_edge(self, _id):
+        """
+        Gets the edge with the _id and returns the Response.
+
+        :param data: Edge ID.
+        :type data: int
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            return self._respond(self._get_edge(_id))
+
+    def get_all_edges(self):
+        """
+        Returns a Response containing all the edges in the Graph.
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            rows = self.connection.execute("SELECT %s FROM edges ORDER BY id" % EDGE_COLUMNS)
+            return self._respond(self._load_edges(rows))
+
+    def update_edge(self, _id, data):
+        """
+        Replaces the edge's properties and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Property data.
+        :type data: dict
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            edge = self._get_edge(_id)
+            self._update_properties(cursor, edge, data)
+        return self._respond(edge)
+
+    def delete_edge(self, _id):
+        """
+        Deletes a edge with the _id and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._get_edge(_id)
+            self._delete_element(cursor, "edge", _id)
+        return self._respond(None)
+
+    def remove_edge_properties(self, _id):
+        """
+        Removes all the edge's properties and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :rtype: SQLiteResponse
+
+        """
+        return self.update_edge(_id, None)
+
+    # Vertex Container
+
+    def outE(self, _id, label=None, start=None, limit=None):
+        """
+        Returns the outgoing edges of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param label: Optional edge label.
+        :type label: str
+
+        :param start: Optional offset of the first edge.
+        :type start: int
+
+        :param limit: Optional maximum number of edges.
+        :type limit: int
+
+        :rtype: SQLiteResponse
+
+        """
+        return self._adjacent_edges(_id, ["outV"], label, start, limit)
+
+    def inE(self, _id, label=None, start=None, limit=None):
+        """
+        Returns the incoming edges of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param label: Optional edge label.
+        :type label: str
+
+        :param start: Optional offset of the first edge.
+        :type start: int
+
+        :param limit: Optional maximum number of edges.
+        :type limit: int
+
+        :rtype: SQLiteResponse
+
+        """
+        return self._adjacent_edges(_id, ["inV"], label, start, limit)
+
+    def bothE(self, _id, label=None, start=None, limit=None):
+        """
+        Returns the incoming and outgoing edges of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param label: Optional edge label.
+        :type label: str
+
+        :param start: Optional offset of the first edge.
+        :type start: int
+
+        :param limit: Optional maximum number of edges.
+        :type limit: int
+
+        :rtype: SQLiteResponse
+
+        """
+        return self._adjacent_edges(_id, ["outV", "inV"], label, start, limit)
+
+    def outV(self, _id, label=None, start=None, limit=None):
+        """
+        Returns the out-adjacent vertices of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param label: Optional edge label.
+        :type label: str
+
+        :param start: Optional offset of the first vertex.
+        :type start: int
+
+        :param limit: Optional maximum number of vertices.
+        :type limit: int
+
+        :rtype: SQLiteResponse
+
+        """
+        return self._adjacent_vertices(_id, ["outV"], label, start, limit)
+
+    def inV(self, _id, label=None, start=None, limit=None):
+        """
+        Returns the in-adjacent vertices of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param label: Optional edge label.
+        :type label: str
+
+        :param start: Optional offset of the first vertex.
+        :type start: int
+
+        :param limit: Optional maximum number of vertices.
+        :type limit: int
+
+        :rtype: SQLiteResponse
+
+        """
+        return self._adjacent_vertices(_id, ["inV"], label, start, limit)
+
+    def bothV(self, _id, label=None, start=None, limit=None):
+        """
+        Returns the incoming- and outgoing-adjacent vertices of the vertex.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param label: Optional edge label.
+        :type label: str
+
+        :param start: Optional offset of the first vertex.
+        :type start: int
+
+        :param limit: Optional maximum number of vertices.
+        :type limit: int
+
+        :rtype: SQLiteResponse
+
+        """
+        return self._adjacent_vertices(_id, ["outV", "inV"], label, start, limit)
+
+    def neighbourhood(self, _id, depth, labels=None, direction="both", max_nodes=None):
+        """
+        Returns the vertices and then the edges within depth hops of the
+        vertex, breadth first, with one indexed query per hop and direction.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param depth: Number of hops.
+        :type depth: int
+
+        :param labels: Optional list of edge labels to follow.
+        :type labels: list
+
+        :param direction: "out", "in", or "both". Defaults to "both".
+        :type direction: str
+
+        :param max_nodes: Optional maximum number of vertices.
+        :type max_nodes: int
+
+        :rtype: SQLiteResponse
+
+        """
+        columns = dict(out=["outV"], both=["outV", "inV"]).get(direction, ["inV"])
+        with self.lock:
+            start = self._get_vertex(_id)
+            vertex_ids = [start['_id']]
+            seen = set(vertex_ids)
+            edge_rows = []
+            seen_edges = set()
+            frontier = vertex_ids
+            for hop in range(depth):
+                if not frontier:
+                    break
+                next_frontier = []
+                for column in columns:
+                    other = "inV" if column == "outV" else "outV"
+                    for row in self._select_edges(column, frontier, labels):
+                        other_id = row[2 if other == "outV" else 4]
+                        if other_id not in seen:
+                            if max_nodes is not None and len(seen) >= max_nodes:
+                                continue
+                            seen.add(other_id)
+                            vertex_ids.append(other_id)
+                            next_frontier.append(other_id)
+                        if row[1] not in seen_edges:
+                            seen_edges.add(row[1])
+                            edge_rows.append(row[1:])
+                frontier = next_frontier
+            vertices = self._load_vertices((_id,) for _id in vertex_ids)
+            return self._respond(vertices + self._load_edges(edge_rows))
+
+    # Index Proxy
+
+    def get_all_indices(self):
+        """
+        Returns a Response containing all the indices.
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            rows = self.connection.execute("SELECT name, class, type FROM indices ORDER BY name")
+            return self._respond([_index_info(row) for row in rows])
+
+    def get_index(self, name):
+        """
+        Returns a Response containing the index, or no results.
+
+        :param name: Index name.
+        :type name: str
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT name, class, type FROM indices WHERE name = ?", (name,)).fetchone()
+            return self._respond(_index_info(row) if row else None)
+
+    def delete_index(self, name):
+        """
+        Deletes the index and its entries and returns the Response.
+
+        :param name: Index name.
+        :type name: str
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._get_index(name)
+            cursor.execute("DELETE FROM index_entries WHERE index_name = ?", (name,))
+            cursor.execute("DELETE FROM indices WHERE name = ?", (name,))
+        return self._respond(None)
+
+    # Index Proxy - Vertex
+
+    def create_vertex_index(self, index_name, *args, **kwds):
+        """
+        Creates a vertex index and returns the Response.
+
+        :param index_name: Index name.
+        :type index_name: str
+
+        :rtype: SQLiteResponse
+
+        """
+        return self._create_index(index_name, "vertex", kwds)
+
+    def get_vertex_index(self, index_name):
+        """
+        Returns a Response containing the vertex index, or no results.
+
+        :param index_name: Index name.
+        :type index_name: str
+
+        :rtype: SQLiteResponse
+
+        """
+        return self.get_index(index_name)
+
+    def get_or_create_vertex_index(self, index_name, index_params=None):
+        """
+        Returns a Response containing the vertex index, creating it if needed.
+
+        :param index_name: Index name.
+        :type index_name: str
+
+        :rtype: SQLiteResponse
+
+        """
+        return self._get_or_create_index(index_name, "vertex")
+
+    def delete_vertex_index(self, name):
+        """
+        Deletes the vertex index and returns the Response.
+
+        :param name: Index name.
+        :type name: str
+
+        :rtype: SQLiteResponse
+
+        """
+        return self.delete_index(name)
+
+    # Index Proxy - Edge
+
+    def create_edge_index(self, name, *args, **kwds):
+        """
+        Creates an edge index and returns the Response.
+
+        :param name: Index name.
+        :type name: str
+
+        :rtype: SQLiteResponse
+
+        """
+        return self._create_index(name, "edge", kwds)
+
+    def get_edge_index(self, name):
+        """
+        Returns a Response containing the edge index, or no results.
+
+        :param name: Index name.
+        :type name: str
+
+        :rtype: SQLiteResponse
+
+        """
+        return self.get_index(name)
+
+    def get_or_create_edge_index(self, index_name, index_params=None):
+        """
+        Returns a Response containing the edge index, creating it if needed.
+
+        :param index_name: Index name.
+        :type index_name: str
+
+        :rtype: SQLiteResponse
+
+        """
+        return self._get_or_create_index(index_name, "edge")
+
+    def delete_edge_index(self, name):
+        """
+        Deletes the edge index and returns the Response.
+
+        :param name: Index name.
+        :type name: str
+
+        :rtype: SQLiteResponse
+
+        """
+        return self.delete_index(name)
+
+    # Index Container - General
+
+    def index_count(self, index_name, key, value):
+        """
+        Returns a Response whose content's totalSize is the number of
+        elements at the key/value pair.
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            self._get_index(index_name)
+            count = self.connection.execute(
+                "SELECT COUNT(*) FROM index_entries WHERE index_name = ? AND key = ? "
+                "AND value = ?", (index_name, key, to_index_value(value))).fetchone()[0]
+            return self._respond(dict(totalSize=count), wrap=False)
+
+    def index_keys(self, index_name):
+        """
+        Returns a Response whose results are the index's keys.
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            self._get_index(index_name)
+            rows = self.connection.execute(
+                "SELECT DISTINCT key FROM index_entries WHERE index_name = ? ORDER BY key",
+                (index_name,))
+            return self._respond(dict(results=[row[0] for row in rows]), wrap=False)
+
+    # Index Container - Vertex
+
+    def put_vertex(self, index_name, key, value, _id):
+        """
+        Adds a vertex to the index with the index_name.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Name of the key.
+        :type key: str
+
+        :param value: Value of the key.
+        :type value: str
+
+        :param _id: Vertex ID
+        :type _id: int
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._get_index(index_name)
+            self._get_vertex(_id)
+            self._put_entries(cursor, index_name, [(key, value)], _id)
+        return self._respond(None)
+
+    def lookup_vertex(self, index_name, key, value):
+        """
+        Returns the vertices indexed with the key and value.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Name of the key.
+        :type key: str
+
+        :param value: Value of the key.
+        :type value: str
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            rows = self._lookup(index_name, key, value)
+            return self._respond(self._load_vertices(rows))
+
+    def remove_vertex(self, index_name, _id, key=None, value=None):
+        """
+        Removes a vertex from the index and returns the Response.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Optional. Name of the key.
+        :type key: str
+
+        :param value: Optional. Value of the key.
+        :type value: str
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._remove_entries(cursor, index_name, _id, key, value)
+        return self._respond(None)
+
+    # Index Container - Edge
+
+    def put_edge(self, index_name, key, value, _id):
+        """
+        Adds an edge to the index and returns the Response.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Name of the key.
+        :type key: str
+
+        :param value: Value of the key.
+        :type value: str
+
+        :param _id: Edge ID
+        :type _id: int
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._get_index(index_name)
+            self._get_edge(_id)
+            self._put_entries(cursor, index_name, [(key, value)], _id)
+        return self._respond(None)
+
+    def lookup_edge(self, index_name, key, value):
+        """
+        Returns the edges indexed with the key and value.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param key: Name of the key.
+        :type key: str
+
+        :param value: Value of the key.
+        :type value: str
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            ids = [row[0] for row in self._lookup(index_name, key, value)]
+            return self._respond(self._load_edges(self._select_edges("id", ids)))
+
+    def remove_edge(self, index_name, _id, key=None, value=None):
+        """
+        Removes an edge from the index and returns the Response.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param _id: Edge ID
+        :type _id: int
+
+        :param key: Optional. Name of the key.
+        :type key: str
+
+        :param value: Optional. Value of the key.
+        :type value: str
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._remove_entries(cursor, index_name, _id, key, value)
+        return self._respond(None)
+
+    # Model Proxy - Vertex
+
+    def create_indexed_vertex(self, data, index_name, keys=None):
+        """
+        Creates a vertex, indexes it, and returns the Response.
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._get_index(index_name)
+            vertex = self._insert_vertices(cursor, [data])[0]
+            self._index_properties(cursor, index_name, vertex, keys)
+        return self._respond(vertex)
+
+    def update_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Replaces an indexed vertex's properties, only rewriting the index
+        entries for the changed keys, and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._get_index(index_name)
+            vertex = self._get_vertex(_id)
+            self._update_properties(cursor, vertex, data, index_name, keys)
+        return self._respond(vertex)
+
+    def patch_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Updates only the given properties of an indexed vertex, and only
+        their index entries, and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Changed property data. None values remove the property.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._get_index(index_name)
+            vertex = self._get_vertex(_id)
+            self._update_properties(cursor, vertex, data, index_name, keys, patch=True)
+        return self._respond(vertex)
+
+    # Model Proxy - Edge
+
+    def create_indexed_edge(self, outV, label, inV, data, index_name, keys=None):
+        """
+        Creates a edge, indexes it, and returns the Response.
+
+        :param outV: Outgoing vertex ID.
+        :type outV: int
+
+        :param label: Edge label.
+        :type label: str
+
+        :param inV: Incoming vertex ID.
+        :type inV: int
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._get_index(index_name)
+            edge = self._insert_edges(cursor, [(outV, label, inV, data)])[0]
+            self._index_properties(cursor, index_name, edge, keys)
+            # Like the scripts, index the label so edges can be found by it.
+            self._put_entries(cursor, index_name, [(self.config.label_var, label)],
+                              edge['_id'])
+        return self._respond(edge)
+
+    def update_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Replaces an indexed edge's properties, only rewriting the index
+        entries for the changed keys, and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._get_index(index_name)
+            edge = self._get_edge(_id)
+            self._update_properties(cursor, edge, data, index_name, keys)
+        return self._respond(edge)
+
+    def patch_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Updates only the given properties of an indexed edge, and only
+        their index entries, and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Changed property data. None values remove the property.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            self._get_index(index_name)
+            edge = self._get_edge(_id)
+            self._update_properties(cursor, edge, data, index_name, keys, patch=True)
+        return self._respond(edge)
+
+    # Metadata
+
+    def set_metadata(self, key, value):
+        """
+        Sets the metadata key to the supplied value.
+
+        :param key: Metadata key
+        :type key: str
+
+        :param value: Metadata value.
+        :type value: str, int, or list
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            cursor.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                           (key, json.dumps(value)))
+        return self._respond(None)
+
+    def get_metadata(self, key, default_value=None):
+        """
+        Returns a Response whose results are the metadata value for the key.
+
+        :param key: Metadata key
+        :type key: str
+
+        :param default_value: Default value to return if the key is not found.
+        :type default_value: str, int, or list
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+            value = json.loads(row[0]) if row else default_value
+            return self._respond(dict(results=value), wrap=False)
+
+    def remove_metadata(self, key):
+        """
+        Removes the metadata key and value.
+
+        :param key: Metadata key
+        :type key: str
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM metadata WHERE key = ?", (key,))
+        return self._respond(None)
+
+    # Utils
+
+    def warm_cache(self):
+        """
+        Reads every table so its pages are in SQLite's page cache.
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            for table in ("vertices", "edges", "properties", "index_entries"):
+                self.connection.execute("SELECT COUNT(*) FROM %s" % table).fetchone()
+        return self._respond(None)
+
+    def clear(self):
+        """
+        Deletes all the elements, indices, and metadata.
+
+        :rtype: SQLiteResponse
+
+        """
+        with self._transaction() as cursor:
+            for table in ("index_entries", "indices", "properties", "edges", "vertices",
+                          "metadata"):
+                cursor.execute("DELETE FROM %s" % table)
+        return self._respond(None)
+
+    def multi_get_vertices(self, id_list):
+        """
+        Returns a Response containing the vertices with the IDs that exist.
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            rows = self._select_in("SELECT id FROM vertices WHERE id IN (%s)", list(id_list))
+            return self._respond(self._load_vertices(rows))
+
+    def multi_get_edges(self, id_list):
+        """
+        Returns a Response containing the edges with the IDs that exist.
+
+        :rtype: SQLiteResponse
+
+        """
+        with self.lock:
+            return self._respond(self._load_edges(self._select_edges("id", list(id_list))))
+
+    # Private
+
+    def _connect(self, path):
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            # Readers don't block the writer, and commits don't fsync the db.
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        with self.lock:
+            with self.connection:
+                yield self.connection.cursor()
+
+    def _respond(self, results, wrap=True):
+        content = dict(results=results) if wrap else results
+        return self.request.response_class(content, self.config)
+
+    def _get_vertex(self, _id):
+        rows = self.connection.execute("SELECT id FROM vertices WHERE id = ?", (_id,))
+        vertices = self._load_vertices(rows)
+        if not vertices:
+            raise LookupError("Vertex not found: %s" % _id)
+        return vertices[0]
+
+    def _get_edge(self, _id):
+        edges = self._load_edges(self._select_edges("id", [_id]))
+        if not edges:
+            raise LookupError("Edge not found: %s" % _id)
+        return edges[0]
+
+    def _get_index(self, index_name):
+        row = self.connection.execute(
+            "SELECT name, class, type FROM indices WHERE name = ?", (index_name,)).fetchone()
+        if row is None:
+            raise LookupError("Index not found: %s" % index_name)
+        return _index_info(row)
+
+    def _create_index(self, index_name, index_class, kwds):
+        index = dict(name=index_name, type=kwds.get('index_type', "manual"))
+        index['class'] = index_class
+        try:
+            with self._transaction() as cursor:
+                cursor.execute("INSERT INTO indices (name, class, type) VALUES (?, ?, ?)",
+                               (index_name, index_class, index['type']))
+        except sqlite3.IntegrityError:
+            # Like a 409 Conflict from the server.
+            raise SystemError("Index already exists: %s" % index_name)
+        return self._respond(index)
+
+    def _get_or_create_index(self, index_name, index_class):
+        with self._transaction() as cursor:
+            cursor.execute("INSERT OR IGNORE INTO indices (name, class, type) "
+                           "VALUES (?, ?, ?)", (index_name, index_class, "manual"))
+            return self._respond(self._get_index(index_name))
+
+    def _insert_vertices(self, cursor, data_list):
+        data_list = [clean_data(data) for data in data_list]
+        first_id = self._next_id(cursor, "vertices")
+        ids = list(range(first_id, first_id + len(data_list)))
+        cursor.executemany("INSERT INTO vertices (id) VALUES (?)", [(_id,) for _id in ids])
+        self._insert_properties(cursor, "vertex", zip(ids, data_list))
+        return [_vertex(_id, data) for _id, data in zip(ids, data_list)]
+
+    def _insert_edges(self, cursor, edges):
+        edges = [(outV, label, inV, clean_data(data)) for outV, label, inV, data in edges]
+        first_id = self._next_id(cursor, "edges")
+        ids = list(range(first_id, first_id + len(edges)))
+        try:
+            cursor.executemany("INSERT INTO edges (id, outV, label, inV) VALUES (?, ?, ?, ?)",
+                               [(_id, outV, label, inV) for _id, (outV, label, inV, data)
+                                in zip(ids, edges)])
+        except sqlite3.IntegrityError:
+            raise LookupError("Edge vertex not found")
+        self._insert_properties(cursor, "edge", ((_id, edge[3]) for _id, edge in
+                                                 zip(ids, edges)))
+        return [_edge((_id, outV, label, inV), data) for _id, (outV, label, inV, data)
+                in zip(ids, edges)]
+
+    def _next_id(self, cursor, table):
+        # IDs are assigned up front so the rows can go in with executemany.
+        # AUTOINCREMENT keeps the last ID in sqlite_sequence, so deleted IDs
+        # aren't reused.
+        row = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?",
+                             (table,)).fetchone()
+        return (row[0] if row else 0) + 1
+
+    def _insert_properties(self, cursor, element_class, items):
+        rows = [(element_class, _id, key, json.dumps(value))
+                for _id, data in items for key, value in data.items()]
+        cursor.executemany("INSERT OR REPLACE INTO properties (element_class, element_id, "
+                           "key, value) VALUES (?, ?, ?, ?)", rows)
+
+    def _update_properties(self, cursor, element, data, index_name=None, keys=None,
+                           patch=False):
+        # Like the update_indexed_* and patch_indexed_* scripts: only the
+        # index entries for the changed keys are rewritten.
+        _id, element_class = element['_id'], element['_type']
+        old = _get_property_data(element)
+        data = data or {}
+        if patch:
+            new = dict(old)
+            new.update(data)
+            new = clean_data(new)
+        else:
+            new = clean_data(data)
+        removed = [key for key in old if key not in new]
+        changed = [key for key in new if key not in old or old[key] != new[key]]
+        indexed = lambda key: index_name is not None and (keys is None or key in keys)
+        cursor.executemany("DELETE FROM properties WHERE element_class = ? AND "
+                           "element_id = ? AND key = ?",
+                           [(element_class, _id, key) for key in removed])
+        self._insert_properties(cursor, element_class,
+                                [(_id, dict((key, new[key]) for key in changed))])
+        stale = [(key, old[key]) for key in removed + changed if key in old and indexed(key)]
+        for key, value in stale:
+            self._remove_entries(cursor, index_name, _id, key, value)
+        self._put_entries(cursor, index_name,
+                          [(key, new[key]) for key in changed if indexed(key)], _id)
+        for key in removed:
+            del element[key]
+        element.update((key, new[key]) for key in changed)
+
+    def _delete_element(self, cursor, element_class, _id):
+        cursor.execute("DELETE FROM index_entries WHERE element_id = ? AND index_name IN "
+                       "(SELECT name FROM indices WHERE class = ?)", (_id, element_class))
+        cursor.execute("DELETE FROM properties WHERE element_class = ? AND element_id = ?",
+                       (element_class, _id))
+        table = "vertices" if element_class == "vertex" else "edges"
+        cursor.execute("DELETE FROM %s WHERE id = ?" % table, (_id,))
+
+    def _index_properties(self, cursor, index_name, element, keys):
+        data = _get_property_data(element)
+        pairs = [(key, value) for key, value in data.items() if keys is None or key in keys]
+        self._put_entries(cursor, index_name, pairs, element['_id'])
+
+    def _put_entries(self, cursor, index_name, pairs, _id):
+        cursor.executemany("INSERT OR IGNORE INTO index_entries (index_name, key, value, "
+                           "element_id) VALUES (?, ?, ?, ?)",
+                           [(index_name, key, to_index_value(value), _id)
+                            for key, value in pairs])
+
+    def _remove_entries(self, cursor, index_name, _id, key=None, value=None):
+        sql = "DELETE FROM index_entries WHERE index_name = ? AND element_id = ?"
+        params = [index_name, _id]
+        if key is not None:
+            sql += " AND key = ?"
+            params.append(key)
+        if value is not None:
+            sql += " AND value = ?"
+            params.append(to_index_value(value))
+        cursor.execute(sql, params)
+
+    def _lookup(self, index_name, key, value):
+        self._get_index(index_name)
+        return self.connection.execute(
+            "SELECT element_id FROM index_entries WHERE index_name = ? AND key = ? "
+            "AND value = ? ORDER BY element_id", (index_name, key, to_index_value(value)))
+
+    def _adjacent_edges(self, _id, columns, label, start, limit):
+        sql = " UNION ALL ".join(
+            "SELECT %s FROM edges WHERE %s = ?%s" % (EDGE_COLUMNS, column,
+                                                      " AND label = ?" if label else "")
+            for column in columns)
+        params = [param for column in columns for param in ([_id, label] if label else [_id])]
+        sql, params = _add_range(sql + " ORDER BY id", params, start, limit)
+        with self.lock:
+            return self._respond(self._load_edges(self.connection.execute(sql, params)))
+
+    def _adjacent_vertices(self, _id, columns, label, start, limit):
+        sql = " UNION ALL ".join(
+            "SELECT %s, id FROM edges WHERE %s = ?%s" % ("inV" if column == "outV" else "outV",
+                                                          column, " AND label = ?" if label else "")
+            for column in columns)
+        params = [param for column in columns for param in ([_id, label] if label else [_id])]
+        sql, params = _add_range(sql + " ORDER BY id", params, start, limit)
+        with self.lock:
+            return self._respond(self._load_vertices(self.connection.execute(sql, params)))
+
+    def _select_edges(self, column, values, labels=None):
+        # Rows are (column value, id, outV, label, inV).
+        sql = "SELECT %s, %s FROM edges WHERE %s IN (%%s)" % (column, EDGE_COLUMNS, column)
+        rows = self._select_in(sql + " ORDER BY id", list(values))
+        if labels:
+            rows = [row for row in rows if row[3] in labels]
+        if column == "id":
+            return [row[1:] for row in rows]
+        return rows
+
+    def _select_in(self, sql, values):
+        rows = []
+        for i in range(0, len(values), MAX_VARIABLES):
+            chunk = values[i:i + MAX_VARIABLES]
+            placeholders = ", ".join("?" * len(chunk))
+            rows.extend(self.connection.execute(sql % placeholders, chunk))
+        return rows
+
+    def _load_properties(self, element_class, ids):
+        properties = dict((_id, dict()) for _id in ids)
+        sql = ("SELECT element_id, key, value FROM properties WHERE element_class = '%s' "
+               "AND element_id IN (%%s)" % element_class)
+        for _id, key, value in self._select_in(sql, list(properties)):
+            properties[_id][key] = json.loads(value)
+        return properties
+
+    def _load_vertices(self, rows):
+        ids = [row[0] for row in rows]
+        properties = self._load_properties("vertex", set(ids))
+        return [_vertex(_id, properties[_id]) for _id in ids]
+
+    def _load_edges(self, rows):
+        rows = list(rows)
+        properties = self._load_properties("edge", set(row[0] for row in rows))
+        return [_edge(row, properties[row[0]]) for row in rows]
+
+
+def get_database_path(root_uri):
+    """
+    Returns the database path in the URI, like SQLAlchemy's sqlite URIs:
+    "sqlite:///graph.db" is relative and "sqlite:////var/graph.db" absolute.
+
+    :param root_uri: The URI, e.g. "sqlite:///graph.db".
+    :type root_uri: str
+
+    :rtype: str
+
+    """
+    prefix = "sqlite:///"
+    if not root_uri.startswith(prefix):
+        raise ValueError("Not a sqlite URI: %s" % root_uri)
+    return root_uri[len(prefix):] or ":memory:"
+
+
+def _vertex(_id, data):
+    # The element as Rexster represents it in JSON.
+    vertex = dict(data)
+    vertex.update(_id=_id, _type="vertex")
+    return vertex
+
+
+def _edge(row, data):
+    _id, outV, label, inV = row
+    edge = dict(data)
+    edge.update(_id=_id, _type="edge", _outV=outV, _inV=inV, _label=label)
+    return edge
+
+
+def _get_property_data(element):
+    return dict((key, value) for key, value in element.items() if key not in PRIVATE_KEYS)
+
+
+def _index_info(row):
+    name, index_class, index_type = row
+    index = dict(name=name, type=index_type)
+    index['class'] = index_class
+    return index
+
+
+def _add_range(sql, params, start, limit):
+    # Like the scripts' [start..start+limit-1] range.
+    if start is not None and limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params = params + [limit, start]
+    return sql, params
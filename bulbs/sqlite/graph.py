@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Interface for interacting with a graph stored in an embedded SQLite database.
+
+"""
+from bulbs.base.graph import Graph as BaseGraph
+
+# SQLite-specific imports
+from .client import SQLiteClient
+from .index import ManualIndex
+
+
+class Graph(BaseGraph):
+    """
+    A graph stored in an embedded SQLite database, for deployments that 
+    can't run a graph server.
+
+    Instantiates the :class:`~bulbs.sqlite.client.SQLiteClient` object using 
+    the specified Config and sets up proxy objects to the graph. There's no
+    Gremlin, so there's no gremlin attribute.
+
+    :param config: Optional. Defaults to an in-memory database.
+    :type config: bulbs.config.Config
+
+    :cvar client_class: SQLiteClient class.
+    :cvar default_index: Default index class.
+
+    :ivar client: SQLiteClient object.
+    :ivar vertices: VertexProxy object.
+    :ivar edges: EdgeProxy object.
+    :ivar config: Config object.
+    
+    Example:
+
+    >>> from bulbs.config import Config
+    >>> from bulbs.sqlite import Graph
+    >>> g = Graph(Config("sqlite:///graph.db"))
+    >>> james = g.vertices.create(name="James")
+    >>> julie = g.vertices.create(name="Julie")
+    >>> g.edges.create(james, "knows", julie)
+
+    """
+    client_class = SQLiteClient
+    default_index = ManualIndex
+
+    def warm_cache(self):
+        """
+        Loads the database's pages into SQLite's page cache.
+
+        :rtype: SQLiteResponse
+
+        """
+        return self.client.warm_cache()
+
+    def clear(self):
+        """
+        Deletes all the elements, indices, and metadata in the graph.
+
+        :rtype: SQLiteResponse
+
+        .. admonition:: WARNING 
+
+           This will delete all your data!
+
+        """
+        return self.client.clear()
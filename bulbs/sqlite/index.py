@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+An interface for interacting with indices in sqlite.
+
+The sqlite client's index results have the same shape as Rexster's, so the
+Rexster index classes are used as is.
+
+"""
+from bulbs.rexster.index import IndexProxy, VertexIndexProxy, EdgeIndexProxy, \
+    Index, ManualIndex
@@ -0,0 +1,10 @@
+import unittest
+from .sqlite_tests import sqlite_suite
+
+def test_suite():
+    suite = unittest.TestSuite()
+    suite.addTest(sqlite_suite())
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,148 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from bulbs.config import Config
+from bulbs.tests import BulbsTestCase, BulbsTestSuite, bulbs_test_suite
+from bulbs.tests.client_tests import ClientTestCase
+from bulbs.tests.client_index_tests import ClientIndexTestCase
+from bulbs.sqlite import Graph, SQLiteClient, \
+    VertexIndexProxy, EdgeIndexProxy, ManualIndex
+from bulbs.memory.tests.memory_tests import without_tests, GREMLIN_TESTS
+
+# Runs the client and Bulbs suites against a SQLite database in a temp dir.
+# GremlinTestCase and the Bulbs tests that send Gremlin are left out 
+# because there's no Gremlin.
+db_dir = tempfile.mkdtemp()
+config = Config("sqlite:///%s" % os.path.join(db_dir, "bulbs_tests.db"))
+
+
+def get_client():
+    return SQLiteClient(config)
+
+
+class SQLiteClientTestCase(ClientTestCase):
+
+    def setUp(self):
+        self.client = get_client()
+
+    def tearDown(self):
+        self.client.close()
+
+
+class SQLiteClientIndexTestCase(ClientIndexTestCase):
+
+    def setUp(self):
+        self.client = get_client()
+
+    def tearDown(self):
+        self.client.close()
+
+
+class SQLiteGraphTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.g = Graph()
+
+    def tearDown(self):
+        self.g.client.close()
+
+    def test_data_persists(self):
+        client = get_client()
+        _id = client.create_vertex(dict(name="James", tags=["a", "b"])).results.get_id()
+        client.close()
+        client = get_client()
+        data = client.get_vertex(_id).results.get_data()
+        client.close()
+        assert data == dict(name="James", tags=["a", "b"])
+
+    def test_create_vertices(self):
+        resp = self.g.client.create_vertices([dict(name="v%d" % i) for i in range(1200)])
+        ids = [result.get_id() for result in resp.results]
+        assert len(set(ids)) == 1200
+        resp = self.g.client.multi_get_vertices(ids)
+        assert [result.get_data()['name'] for result in resp.results][-1] == "v1199"
+
+    def test_adjacent_pages(self):
+        client = self.g.client
+        ids = [result.get_id() for result in client.create_vertices([{}] * 4).results]
+        _id = ids[0]
+        for other in ids[1:]:
+            client.create_edge(other, "knows", _id)
+            client.create_edge(_id, "knows", other)
+        edges = [result.get_id() for result in client.bothE(_id).results]
+        assert edges == sorted(edges)
+        pages = [next(client.bothE(_id, start=i, limit=1).results).get_id()
+                 for i in range(len(edges))]
+        assert pages == edges
+        vertices = [next(client.bothV(_id, start=i, limit=1).results).get_id()
+                    for i in range(len(edges))]
+        assert vertices == [other for other in ids[1:] for i in range(2)]
+
+    def test_create_edges(self):
+        client = self.g.client
+        ids = [result.get_id() for result in
+               client.create_vertices([dict(name="James"), dict(name="Julie")]).results]
+        client.create_edges([(ids[0], "knows", ids[1], dict(since=2010)),
+                             (ids[1], "likes", ids[0], None)])
+        assert [r.get_data() for r in client.outE(ids[0]).results] == [dict(since=2010)]
+        assert [r.get_id() for r in client.bothV(ids[0]).results] == [ids[1], ids[1]]
+        assert client.inV(ids[1], "likes").total_size == 0
+        self.assertRaises(LookupError, client.create_edges, [(ids[0], "knows", 999, None)])
+
+    def test_delete_vertex_deletes_its_edges(self):
+        james = self.g.vertices.create(name="James")
+        julie = self.g.vertices.create(name="Julie")
+        edge = self.g.edges.create(james, "knows", julie)
+        self.g.vertices.delete(james.eid)
+        assert self.g.edges.get(edge.eid) is None
+        assert list(julie.inE() or []) == []
+
+    def test_neighbourhood(self):
+        james = self.g.vertices.create(name="James")
+        julie = self.g.vertices.create(name="Julie")
+        jack = self.g.vertices.create(name="Jack")
+        self.g.edges.create(james, "knows", julie)
+        self.g.edges.create(julie, "knows", jack)
+        resp = self.g.client.neighbourhood(james.eid, 1)
+        names = [result.get_data().get('name') for result in resp.results]
+        assert names == ["James", "Julie", None]
+        resp = self.g.client.neighbourhood(james.eid, 2, direction="in")
+        assert resp.total_size == 1
+
+    def test_update_indexed_vertex_only_reindexes_changed_keys(self):
+        client = self.g.client
+        client.get_or_create_vertex_index("people")
+        resp = client.create_indexed_vertex(dict(name="James", age=34), "people")
+        _id = resp.results.get_id()
+        client.update_indexed_vertex(_id, dict(name="Jim", age=34), "people")
+        assert client.lookup_vertex("people", "name", "James").total_size == 0
+        assert client.lookup_vertex("people", "name", "Jim").total_size == 1
+        assert client.lookup_vertex("people", "age", 34).total_size == 1
+        client.patch_indexed_vertex(_id, dict(age=None), "people")
+        assert client.lookup_vertex("people", "age", 34).total_size == 0
+        assert client.get_vertex(_id).results.get_data() == dict(name="Jim")
+
+
+def sqlite_suite():
+    client = get_client()
+    BulbsTestCase.client = client
+    BulbsTestCase.vertex_index_proxy = VertexIndexProxy
+    BulbsTestCase.edge_index_proxy = EdgeIndexProxy
+    BulbsTestCase.index_class = ManualIndex
+    BulbsTestCase.graph = Graph(config)
+
+    suite = without_tests(bulbs_test_suite(), GREMLIN_TESTS)
+    suite.addTest(unittest.makeSuite(SQLiteClientTestCase))
+    suite.addTest(unittest.makeSuite(SQLiteClientIndexTestCase))
+    suite.addTest(unittest.makeSuite(SQLiteGraphTestCase))
+    return BulbsTestSuite([suite], client=client, graph=BulbsTestCase.graph,
+                          vertex_index_proxy=VertexIndexProxy,
+                          edge_index_proxy=EdgeIndexProxy, index_class=ManualIndex)
+
+if __name__ == '__main__':
+    try:
+        unittest.main(defaultTest='sqlite_suite')
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Incremental JSON decoding for streamed responses.
+
+"""
+from __future__ import absolute_import
+
+import codecs
+import json
+import re
+
+import six  # Python 3
+
+# What can follow a bare number, true, false or null.
+SCALAR_END = re.compile(r"[\s,\]}]")
+
+
+class JSONStream(object):
+    """
+    Decodes JSON values out of a stream of byte chunks as they arrive.
+
+    Only as much of the stream as the next value needs is read, so a
+    response can be walked value by value without holding all of it in
+    memory. Use expect() and next_key() to walk the structure, and decode()
+    to decode the value at the current position. Each raises ValueError
+    if the stream doesn't have what it expects.
+
+    :param chunks: Iterable of the response body's byte chunks.
+    :type chunks: iterable
+
+    :param encoding: Encoding of the response body. Defaults to UTF-8.
+    :type encoding: str
+
+    Example:
+
+    >>> stream = JSONStream([b'{"data": [{"a": 1}', b', {"a": 2}]}'])
+    >>> stream.expect('{')
+    >>> stream.next_key()
+    'data'
+    >>> stream.expect('[')
+    >>> stream.decode()
+    {'a': 1}
+
+    """
+    def __init__(self, chunks, encoding="utf-8"):
+        self.chunks = iter(chunks)
+        self.text_decoder = codecs.getincrementaldecoder(encoding)()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = six.text_type()
+        self.pos = 0
+        self.exhausted = False
+
+    def seek(self, token):
+        """
+        Moves past the next occurrence of the token.
+
+        :param token: Text to look for.
+        :type token: str
+
+        :rtype: bool, False if the stream ended before the token
+
+        """
+        while True:
+            index = self.buffer.find(token, self.pos)
+            if index != -1:
+                self.pos = index + len(token)
+                return True
+            # Keep enough of the buffer to match a token split across chunks.
+            self.pos = max(self.pos, len(self.buffer) - len(token) + 1)
+            if not self._read():
+                return False
+
+    def peek(self):
+        """
+        Returns the next non-whitespace character without consuming it, or
+        an empty string at the end of the stream.
+
+        :rtype: str
+
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read():
+                return ""
+
+    def skip(self):
+        """
+        Consumes the next non-whitespace character and returns it.
+
+        :rtype: str
+
+        """
+        char = self.peek()
+        self.pos += len(char)
+        return char
+
+    def expect(self, char):
+        """
+        Consumes the next non-whitespace character, which has to be char.
+
+        :param char: The expected character, e.g. "{" or "[".
+        :type char: str
+
+        :rtype: None
+
+        :raises: ValueError
+
+        """
+        found = self.skip()
+        if found != char:
+            raise ValueError("Expected %r in the JSON stream, found %s" % 
+                             (char, repr(found) if found else "the end"))
+
+    def next_key(self):
+        """
+        Consumes the next key of the object being read, and the colon after 
+        it, or the end of the object.
+
+        :rtype: str, or None at the end of the object
+
+        :raises: ValueError
+
+        """
+        char = self.peek()
+        if char == ",":
+            self.skip()
+            char = self.peek()
+        if char == "}":
+            self.skip()
+            return None
+        if char != '"':
+            raise ValueError("Expected an object key in the JSON stream, found %s" % 
+                             (repr(char) if char else "the end"))
+        key = self.decode()
+        self.expect(":")
+        return key
+
+    def decode(self):
+        """
+        Decodes and consumes the JSON value at the current position.
+
+        :rtype: dict, list, str, int, float, bool, or None
+
+        :raises: ValueError
+
+        """
+        char = self.peek()
+        if char and char not in '{["':
+            # A bare number could be cut off at the end of a chunk and 
+            # still decode, so read up to what follows it.
+            while not SCALAR_END.search(self.buffer, self.pos) and self._read():
+                pass
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                # The value isn't complete yet.
+                if not self._read():
+                    raise ValueError("The JSON stream ended in the middle of a value, "
+                                     "or the value isn't valid JSON")
+            else:
+                self.pos = end
+                return value
+
+    def _read(self):
+        if self.exhausted:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.exhausted = True
+            text = self.text_decoder.decode(b"", True)
+        else:
+            text = self.text_decoder.decode(chunk)
+        # Drop what's been consumed so the buffer stays about a value long.
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return chunk is not None or bool(text)
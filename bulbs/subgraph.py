@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+In-memory subgraph of vertices and edges with adjacency lookups.
+
+"""
+from .element import Edge
+
+
+class Subgraph(object):
+    """
+    A deduplicated set of vertices and edges held in memory.
+
+    Lookups are by element ID and don't make any requests to the database.
+
+    :param elements: Initialized vertices and edges.
+    :type elements: iterable of Vertex and Edge objects
+
+    :ivar vertices: Dict of vertices keyed by ID.
+    :ivar edges: Dict of edges keyed by ID.
+
+    Example:
+
+    >>> subgraph = james.neighbourhood(depth=2, labels=["knows"])
+    >>> for friend in subgraph.outV(james._id, "knows"):
+    ...     print(friend.name)
+
+    """
+    def __init__(self, elements=None):
+        self.vertices = dict()
+        self.edges = dict()
+        self._out_edges = dict()
+        self._in_edges = dict()
+        for element in elements or []:
+            self.add(element)
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def __contains__(self, element):
+        # Vertex and edge IDs can overlap, so plain IDs are vertex IDs.
+        if isinstance(element, Edge):
+            return element._id in self.edges
+        return getattr(element, "_id", element) in self.vertices
+
+    def __iter__(self):
+        return iter(self.vertices.values())
+
+    def add(self, element):
+        """
+        Adds a vertex or edge to the subgraph.
+
+        :param element: Vertex or Edge object.
+        :type element: Element
+
+        :rtype: None
+
+        """
+        if isinstance(element, Edge):
+            if element._id not in self.edges:
+                self.edges[element._id] = element
+                self._out_edges.setdefault(element._outV, []).append(element)
+                self._in_edges.setdefault(element._inV, []).append(element)
+        else:
+            self.vertices[element._id] = element
+
+    def get_vertex(self, _id):
+        """
+        Returns the vertex for the ID, or None if it's not in the subgraph.
+
+        :param _id: Vertex ID.
+        :type _id: int or str
+
+        :rtype: Vertex or None
+
+        """
+        return self.vertices.get(_id)
+
+    def get_edge(self, _id):
+        """
+        Returns the edge for the ID, or None if it's not in the subgraph.
+
+        :param _id: Edge ID.
+        :type _id: int or str
+
+        :rtype: Edge or None
+
+        """
+        return self.edges.get(_id)
+
+    def outE(self, _id, label=None):
+        """
+        Returns the vertex's outgoing edges in the subgraph.
+
+        :param _id: Vertex ID.
+        :type _id: int or str
+
+        :param label: Optional edge label.
+        :type label: str or None
+
+        :rtype: list
+
+        """
+        return self._filter(self._out_edges.get(_id, []), label)
+
+    def inE(self, _id, label=None):
+        """
+        Returns the vertex's incoming edges in the subgraph.
+
+        :param _id: Vertex ID.
+        :type _id: int or str
+
+        :param label: Optional edge label.
+        :type label: str or None
+
+        :rtype: list
+
+        """
+        return self._filter(self._in_edges.get(_id, []), label)
+
+    def bothE(self, _id, label=None):
+        """
+        Returns the vertex's incoming and outgoing edges in the subgraph.
+
+        :param _id: Vertex ID.
+        :type _id: int or str
+
+        :param label: Optional edge label.
+        :type label: str or None
+
+        :rtype: list
+
+        """
+        return self.outE(_id, label) + self.inE(_id, label)
+
+    def outV(self, _id, label=None):
+        """
+        Returns the vertex's out-adjacent vertices in the subgraph.
+
+        :param _id: Vertex ID.
+        :type _id: int or str
+
+        :param label: Optional edge label.
+        :type label: str or None
+
+        :rtype: list
+
+        """
+        return [self.vertices[edge._inV] for edge in self.outE(_id, label)]
+
+    def inV(self, _id, label=None):
+        """
+        Returns the vertex's in-adjacent vertices in the subgraph.
+
+        :param _id: Vertex ID.
+        :type _id: int or str
+
+        :param label: Optional edge label.
+        :type label: str or None
+
+        :rtype: list
+
+        """
+        return [self.vertices[edge._outV] for edge in self.inE(_id, label)]
+
+    def bothV(self, _id, label=None):
+        """
+        Returns the vertex's in- and out-adjacent vertices in the subgraph.
+
+        :param _id: Vertex ID.
+        :type _id: int or str
+
+        :param label: Optional edge label.
+        :type label: str or None
+
+        :rtype: list
+
+        """
+        return self.outV(_id, label) + self.inV(_id, label)
+
+    def _filter(self, edges, label):
+        if label is None:
+            return list(edges)
+        return [edge for edge in edges if edge._label == label]
@@ -0,0 +1,8 @@
+"""
+Local stand-ins for the graph servers, for tests and benchmarks.
+
+"""
+from bulbs.memory.store import MemoryGraph
+from .server import LocalServer, FakeServer
+from .replay import ReplayServer
+from .rexpro import FakeRexProServer
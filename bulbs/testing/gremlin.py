@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Emulates the Gremlin scripts bulbs sends, against a MemoryGraph.
+
+There's no Groovy here: library scripts are recognized by their body and
+run as Python methods of the same name, and Traversal scripts are read
+step by step. Anything else raises UnsupportedScript.
+
+"""
+import re
+
+from bulbs.memory.store import MemoryElement, MemoryIndex
+
+
+class UnsupportedScript(Exception):
+    """Raised for a Gremlin script the emulator can't run."""
+
+
+# Parts of the scripts built by bulbs.multi.Multi
+MULTI_HEADER = re.compile(r"^// multi: (.*)$", re.M)
+MULTI_CLOSURE = re.compile(r"^def (c\d+) = \{ ([^\n]*) -> \n(.*?)\n\}\nmulti_results", re.M | re.S)
+
+# Parts of the scripts built by bulbs.traversal.Traversal and ad-hoc scripts
+START_PATTERNS = (
+    (re.compile(r"^g\.([ve])\(([\w.'\"-]+)\)"), "element"),
+    (re.compile(r"^(\w+)\.collect\{g\.([ve])\(it\)\}\._\(\)"), "collect"),
+    (re.compile(r"^g\.([VE])(?:\(\))?"), "all"),
+)
+STEP_PATTERN = re.compile(r"^\.(\w+)\(([^()]*)\)")
+RANGE_PATTERN = re.compile(r"^\[(\d+)\.\.(\d+)\]")
+
+
+class GremlinEmulator(object):
+    """
+    Runs bulbs' Gremlin scripts against a MemoryGraph.
+
+    :param graph: The graph to run the scripts against.
+    :type graph: MemoryGraph
+
+    :param scripts: The client's GroovyScripts, used to recognize the
+        library scripts by their body.
+    :type scripts: GroovyScripts
+
+    """
+    def __init__(self, graph, scripts):
+        self.graph = graph
+        self.scripts = scripts
+
+    def execute(self, script, params=None):
+        """
+        Runs the script and returns its result: a MemoryElement, a list, a
+        dict (for Multi scripts), a number, or None.
+
+        :param script: Gremlin script.
+        :type script: str
+
+        :param params: Param bindings for the script.
+        :type params: dict
+
+        :rtype: object
+
+        """
+        params = params or {}
+        script = script.strip()
+        name = self.scripts.get_name(script)
+        if name is not None:
+            method = getattr(self, name, None)
+            if method is None:
+                raise UnsupportedScript("Library script not emulated: %s" % name)
+            with self.graph.lock:
+                return method(**params)
+        if MULTI_HEADER.match(script):
+            return self._execute_multi(script, params)
+        return self._execute_traversal(script, params)
+
+    # Graph
+
+    def get_vertices(self):
+        return list(self.graph.vertices.values())
+
+    def get_edges(self):
+        return list(self.graph.edges.values())
+
+    def get_vertex(self, _id):
+        return self.graph.get_vertex(_id)
+
+    def get_edge(self, _id):
+        return self.graph.get_edge(_id)
+
+    def lookup_vertex(self, index_name, key, value):
+        return self._lookup(index_name, key, value)
+
+    def lookup_edge(self, index_name, key, value):
+        return self._lookup(index_name, key, value)
+
+    # Vertices
+
+    def outE(self, _id, label, start, limit):
+        return self._range(self.graph.get_edges(_id, "out", _labels(label)), start, limit)
+
+    def inE(self, _id, label, start, limit):
+        return self._range(self.graph.get_edges(_id, "in", _labels(label)), start, limit)
+
+    def bothE(self, _id, label, start, limit):
+        return self._range(self.graph.get_edges(_id, "both", _labels(label)), start, limit)
+
+    def outV(self, _id, label, start, limit):
+        return self._range(self.graph.get_adjacent(_id, "out", _labels(label)), start, limit)
+
+    def inV(self, _id, label, start, limit):
+        return self._range(self.graph.get_adjacent(_id, "in", _labels(label)), start, limit)
+
+    def bothV(self, _id, label, start, limit):
+        return self._range(self.graph.get_adjacent(_id, "both", _labels(label)), start, limit)
+
+    def neighbourhood(self, _id, depth, labels, direction, max_nodes):
+        return self.graph.get_neighbourhood(_id, depth, labels, direction, max_nodes)
+
+    def delete_vertex(self, _id):
+        self.graph.remove_vertex(_id)
+
+    def patch_vertex(self, _id, data):
+        return self.graph.patch_properties(self._get_vertex(_id), data)
+
+    def patch_edge(self, _id, data):
+        return self.graph.patch_properties(self._get_edge(_id), data)
+
+    def update_vertex_properties(self, _id, data):
+        return self.graph.update_properties(self._get_vertex(_id), data)
+
+    def update_edge_properties(self, _id, data):
+        return self.graph.update_properties(self._get_edge(_id), data)
+
+    # Indices
+
+    def index_count(self, index_name, key, value):
+        return self._get_index(index_name).count(key, value)
+
+    def get_or_create_vertex_index(self, index_name, index_params):
+        return self.graph.get_or_create_index(index_name, "vertex")
+
+    def get_or_create_edge_index(self, index_name, index_params):
+        return self.graph.get_or_create_index(index_name, "edge")
+
+    # Utils
+
+    def warm_cache(self):
+        return None
+
+    def clear(self):
+        self.graph.clear()
+
+    # Model Proxy
+
+    def create_indexed_vertex(self, data, index_name, keys):
+        index = self._get_index(index_name)
+        vertex = self.graph.add_vertex(data)
+        self.graph.index_properties(vertex, index, keys)
+        return vertex
+
+    def update_indexed_vertex(self, _id, data, index_name, keys):
+        index = self._get_index(index_name)
+        return self.graph.update_properties(self._get_vertex(_id), data, index, keys)
+
+    def patch_indexed_vertex(self, _id, data, index_name, keys):
+        index = self._get_index(index_name)
+        return self.graph.patch_properties(self._get_vertex(_id), data, index, keys)
+
+    def create_indexed_edge(self, outV, label, inV, data, index_name, keys, label_var):
+        index = self._get_index(index_name)
+        edge = self.graph.add_edge(outV, label, inV, data)
+        self.graph.index_properties(edge, index, keys)
+        index.put(label_var, label, edge._id)
+        return edge
+
+    def update_indexed_edge(self, _id, data, index_name, keys):
+        index = self._get_index(index_name)
+        return self.graph.update_properties(self._get_edge(_id), data, index, keys)
+
+    def patch_indexed_edge(self, _id, data, index_name, keys):
+        index = self._get_index(index_name)
+        return self.graph.patch_properties(self._get_edge(_id), data, index, keys)
+
+    # The RexPro client's scripts for what Rexster serves over REST
+
+    def create_vertex(self, data):
+        return self.graph.add_vertex(data)
+
+    def drop_vertex(self, _id):
+        return self.graph.remove_vertex(_id) is not None
+
+    def create_edge(self, outV, label, inV, data):
+        return self.graph.add_edge(outV, label, inV, data)
+
+    def drop_edge(self, _id):
+        return self.graph.remove_edge(_id) is not None
+
+    def get_indices(self):
+        return list(self.graph.indices.values())
+
+    def get_index(self, index_name):
+        return self.graph.get_index(index_name)
+
+    def create_index(self, index_name, index_class):
+        return self.graph.create_index(index_name, index_class)
+
+    def drop_index(self, index_name):
+        return self.graph.remove_index(index_name) is not None
+
+    def put_vertex(self, index_name, key, value, _id):
+        self._get_index(index_name).put(key, value, self._get_vertex(_id)._id)
+
+    def put_edge(self, index_name, key, value, _id):
+        self._get_index(index_name).put(key, value, self._get_edge(_id)._id)
+
+    def remove_vertex(self, index_name, _id, key, value):
+        self._get_index(index_name).remove(self._get_vertex(_id)._id, key, value)
+
+    def remove_edge(self, index_name, _id, key, value):
+        self._get_index(index_name).remove(self._get_edge(_id)._id, key, value)
+
+    def multi_get_vertices(self, id_list):
+        vertices = (self.graph.get_vertex(_id) for _id in id_list)
+        return [vertex for vertex in vertices if vertex is not None]
+
+    def multi_get_edges(self, id_list):
+        edges = (self.graph.get_edge(_id) for _id in id_list)
+        return [edge for edge in edges if edge is not None]
+
+    # Multi and Traversal scripts
+
+    def _execute_multi(self, script, params):
+        results = dict()
+        for key, names, body in MULTI_CLOSURE.findall(script):
+            names = [name.strip() for name in names.split(",") if name.strip()]
+            call_params = dict((name, params.get("%s_%s" % (key, name))) for name in names)
+            results[key] = self.execute(body, call_params)
+        return results
+
+    def _execute_traversal(self, script, params):
+        rest = script
+        pipe = None
+        for pattern, kind in START_PATTERNS:
+            match = pattern.match(rest)
+            if match:
+                pipe = self._start(kind, match.groups(), params)
+                rest = rest[match.end():]
+                break
+        if pipe is None:
+            raise UnsupportedScript("Can't emulate Gremlin script: %s" % script)
+        while rest:
+            match = RANGE_PATTERN.match(rest)
+            if match:
+                low, high = int(match.group(1)), int(match.group(2))
+                pipe = pipe[low:high + 1]
+                rest = rest[match.end():]
+                continue
+            match = STEP_PATTERN.match(rest)
+            if match is None:
+                raise UnsupportedScript("Can't emulate Gremlin step: %s" % rest)
+            name, args = match.groups()
+            args = [self._get_arg(arg.strip(), params) for arg in args.split(",") if arg.strip()]
+            pipe = self._step(pipe, name, args)
+            rest = rest[match.end():]
+        return pipe
+
+    def _start(self, kind, groups, params):
+        if kind == "element":
+            getter, arg = groups
+            element = self._get_element(getter, self._get_arg(arg, params))
+            return [element] if element is not None else []
+        if kind == "collect":
+            param, getter = groups
+            elements = [self._get_element(getter, _id) for _id in params.get(param) or []]
+            return [found for found in elements if found is not None]
+        getter = groups[0]
+        return self.get_vertices() if getter == "V" else self.get_edges()
+
+    def _step(self, pipe, name, args):
+        graph = self.graph
+        if name in ("out", "in", "both"):
+            return [vertex for element in pipe
+                    for vertex in graph.get_adjacent(element._id, name, args)]
+        if name in ("outE", "inE", "bothE"):
+            return [edge for element in pipe
+                    for edge in graph.get_edges(element._id, name[:-1], args)]
+        if name == "outV":
+            return [graph.vertices[edge._outV] for edge in pipe]
+        if name == "inV":
+            return [graph.vertices[edge._inV] for edge in pipe]
+        if name == "bothV":
+            return [graph.vertices[_id] for edge in pipe for _id in (edge._outV, edge._inV)]
+        if name == "has":
+            key, value = args
+            return [element for element in pipe if _get_property(element, key) == value]
+        if name == "dedup":
+            seen = set()
+            return [element for element in pipe
+                    if not (element._id in seen or seen.add(element._id))]
+        if name == "range":
+            low, high = args
+            return pipe[low:high + 1]
+        if name == "count":
+            return len(pipe)
+        if name in ("toList", "_"):
+            return pipe
+        raise UnsupportedScript("Can't emulate Gremlin step: %s" % name)
+
+    def _get_arg(self, arg, params):
+        if arg in params:
+            return params[arg]
+        if arg[:1] in ("'", '"'):
+            return arg[1:-1]
+        try:
+            return int(arg)
+        except ValueError:
+            raise UnsupportedScript("Unknown Gremlin variable: %s" % arg)
+
+    def _get_element(self, getter, _id):
+        return self.graph.get_vertex(_id) if getter == "v" else self.graph.get_edge(_id)
+
+    # Helpers
+
+    def _get_vertex(self, _id):
+        vertex = self.graph.get_vertex(_id)
+        if vertex is None:
+            raise LookupError("Vertex not found: %s" % _id)
+        return vertex
+
+    def _get_edge(self, _id):
+        edge = self.graph.get_edge(_id)
+        if edge is None:
+            raise LookupError("Edge not found: %s" % _id)
+        return edge
+
+    def _get_index(self, index_name):
+        index = self.graph.get_index(index_name)
+        if index is None:
+            raise LookupError("Index not found: %s" % index_name)
+        return index
+
+    def _lookup(self, index_name, key, value):
+        index = self._get_index(index_name)
+        elements = self.graph.vertices if index.index_class == "vertex" else self.graph.edges
+        return [elements[_id] for _id in index.get(key, value) if _id in elements]
+
+    def _range(self, elements, start, limit):
+        if start is not None and limit is not None:
+            return elements[start:start + limit]
+        return elements
+
+
+def _labels(label):
+    return [label] if label is not None else None
+
+
+def _get_property(element, key):
+    if key in ("id", "_id"):
+        return element._id
+    if key == "label":
+        return element._label
+    return element.data.get(key)
+
+
+def to_json(value):
+    """
+    Returns a script result as Rexster represents it in JSON.
+
+    :param value: Script result.
+    :type value: object
+
+    :rtype: object
+
+    """
+    if isinstance(value, (MemoryElement, MemoryIndex)):
+        return value.to_json()
+    if isinstance(value, dict):
+        return dict((key, to_json(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    return value
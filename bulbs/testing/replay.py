@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Local server that replays recorded responses.
+
+"""
+import re
+
+from .server import LocalServer
+
+
+class ReplayServer(LocalServer):
+    """
+    A local server that answers each request with a recorded response,
+    for servers the FakeServer doesn't emulate, such as Neo4j Server.
+
+    Nothing is stored: a request to create an element gets the same
+    recorded element back every time. Static responses are encoded once,
+    so replaying them costs the server almost nothing.
+
+    :param routes: Optional list of routes; see add_routes().
+    :type routes: list
+
+    :param root: Root path to serve the routes from. Defaults to "".
+    :type root: str
+
+    See LocalServer for the other params.
+
+    Example:
+
+    >>> from bulbs.config import Config
+    >>> from bulbs.neo4jserver import Graph
+    >>> from bulbs.testing import ReplayServer
+    >>> node = {"self": "http://localhost:7474/db/data/node/1", "data": {}}
+    >>> routes = [("GET", r"node/\\d+$", node)]
+    >>> with ReplayServer(routes, root="db/data") as server:
+    ...     g = Graph(Config(server.get_root_uri()))
+    ...     vertex = g.vertices.get(1)
+
+    """
+    def __init__(self, routes=None, root="", **kwds):
+        super(ReplayServer, self).__init__(**kwds)
+        self.root = root.strip("/")
+        self.routes = []
+        self.add_routes(routes or [])
+
+    def add_routes(self, routes):
+        """
+        Adds routes, which are matched in the order they're added.
+
+        :param routes: List of (method, pattern, content) tuples. The 
+            pattern is a regex matched against the request path, without 
+            the root. The content is a JSON-serializable object, a JSON 
+            body as bytes, or a function that takes the request params 
+            and returns one. Use bytes when the key order matters; JSON 
+            encoders don't keep a dict's order on Python 2.
+        :type routes: list
+
+        :rtype: None
+
+        """
+        for method, pattern, content in routes:
+            if not callable(content) and not isinstance(content, bytes):
+                content = self.encode(content)
+            self.routes.append((method, re.compile(pattern), content))
+
+    def get_root_uri(self):
+        """
+        Returns the URI the routes are served from, for the Config.
+
+        :rtype: str
+
+        """
+        return "%s/%s/" % (self.uri, self.root) if self.root else "%s/" % self.uri
+
+    def dispatch(self, method, path, params):
+        path = "/".join(path)
+        if self.root:
+            if not path.startswith(self.root):
+                return 404, dict(message="Resource not found: %s" % path)
+            path = path[len(self.root):].lstrip("/")
+        for route_method, pattern, content in self.routes:
+            if route_method == method and pattern.match(path):
+                if callable(content):
+                    content = content(params)
+                return 200, content
+        return 404, dict(message="No recorded response: %s %s" % (method, path))
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Local fake RexPro server backed by a MemoryGraph.
+
+"""
+import socket
+import time
+import uuid
+
+from six.moves import socketserver
+
+from bulbs.groovy import GroovyScripts
+from bulbs.utils import get_file_path, get_logger
+from bulbs.rexster.rexpro import MSGPACK, JSON, ERROR, SESSION_REQUEST, SESSION_RESPONSE, \
+    SCRIPT_REQUEST, SCRIPT_RESPONSE, INVALID_SESSION, HEADER, MsgPackSerializer, JSONSerializer, \
+    pack_message, read_message, msgpack
+
+from bulbs.memory.store import MemoryGraph, MemoryElement, MemoryIndex
+from .gremlin import GremlinEmulator
+from .server import LocalServer
+
+log = get_logger(__name__)
+
+# Error flag for a script that failed
+SCRIPT_FAILURE = 2
+
+
+class FakeRexProServer(LocalServer):
+    """
+    A local stand-in for Rexster's RexPro server that runs the scripts the
+    RexProClient sends against an in-memory graph, with the same
+    GremlinEmulator as the FakeServer. It speaks both of RexPro's
+    serializers, msgpack if it's installed and JSON.
+
+    :param graph: The graph to serve. Defaults to a new MemoryGraph.
+    :type graph: MemoryGraph
+
+    See LocalServer for the other params. The padding goes in each
+    response's meta, which the client ignores.
+
+    Example:
+
+    >>> from bulbs.config import Config
+    >>> from bulbs.rexster import RexProClient
+    >>> from bulbs.testing import FakeRexProServer
+    >>> with FakeRexProServer() as server:
+    ...     client = RexProClient(Config(server.get_graph_uri()))
+    ...     resp = client.create_vertex(dict(name="James"))
+
+    """
+    scheme = "rexpro"
+
+    def __init__(self, graph=None, **kwds):
+        super(FakeRexProServer, self).__init__(**kwds)
+        self.graph = graph if graph is not None else MemoryGraph()
+        self.emulator = GremlinEmulator(self.graph, self._get_scripts())
+        self.sessions = set()
+        self.serializers = {MSGPACK: MsgPackSerializer(), JSON: JSONSerializer()}
+
+    def create_server(self, address):
+        return LocalTCPServer(address, RexProRequestHandler)
+
+    def get_graph_uri(self, name="tinkergraph"):
+        """
+        Returns the URI of a graph on the server, for the Config. Every
+        graph name is served from the same MemoryGraph.
+
+        :param name: Graph name. Defaults to "tinkergraph".
+        :type name: str
+
+        :rtype: str
+
+        """
+        return "%s/graphs/%s" % (self.uri, name)
+
+    def respond_message(self, serializer_type, message_type, body):
+        """
+        Returns the response message, as bytes, to a request message.
+
+        :param serializer_type: The request's serializer type.
+        :type serializer_type: int
+
+        :param message_type: The request's message type.
+        :type message_type: int
+
+        :param body: The request's serialized body.
+        :type body: bytes
+
+        :rtype: bytes
+
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        serializer = self.serializers[serializer_type]
+        if serializer_type == MSGPACK and msgpack is None:
+            raise ValueError("msgpack isn't installed")
+        fields = serializer.loads(body)
+        session, request_id, meta = fields[:3]
+        meta = meta or {}
+        if message_type == SESSION_REQUEST:
+            response_type, session, response_meta, result = \
+                self.handle_session(session, meta, serializer)
+        elif message_type == SCRIPT_REQUEST:
+            response_type, response_meta, result = self.handle_script(session, meta, fields[3:])
+        else:
+            response_type, response_meta, result = ERROR, dict(flag=0), "Unknown message type"
+        if self.padding:
+            response_meta = dict(response_meta, padding="x" * self.padding)
+        extra = [dict()] if response_type == SCRIPT_RESPONSE else []
+        message = [session, request_id, response_meta, result] + extra
+        return pack_message(serializer, response_type, message)
+
+    def handle_session(self, session, meta, serializer):
+        """
+        Opens or kills a session, and returns the (message type, session,
+        meta, result) tuple of the response.
+
+        :rtype: tuple
+
+        """
+        with self.lock:
+            if meta.get('killSession'):
+                self.sessions.discard(session)
+                return SESSION_RESPONSE, session, dict(), []
+            session = serializer.encode_uuid(uuid.uuid4())
+            self.sessions.add(session)
+        return SESSION_RESPONSE, session, dict(), ["groovy"]
+
+    def handle_script(self, session, meta, fields):
+        """
+        Runs a script and returns the (message type, meta, result) tuple of
+        the response.
+
+        :rtype: tuple
+
+        """
+        language, script, bindings = fields
+        if meta.get('inSession') and session not in self.sessions:
+            return ERROR, dict(flag=INVALID_SESSION), "Session not found"
+        try:
+            with self.graph.lock:
+                result = self.emulator.execute(script, bindings)
+        except Exception as e:
+            log.debug("Fake RexPro server error: %s", e)
+            return ERROR, dict(flag=SCRIPT_FAILURE), str(e)
+        return SCRIPT_RESPONSE, dict(), to_rexpro(result)
+
+    def _get_scripts(self):
+        # The scripts the RexProClient sends, to recognize them by body.
+        import bulbs.rexster.client
+        scripts = GroovyScripts()
+        for file_name in ("gremlin.groovy", "rexpro.groovy"):
+            scripts.update(get_file_path(bulbs.rexster.client.__file__, file_name))
+        return scripts
+
+
+def to_rexpro(value):
+    """
+    Returns a script result as RexPro serializes it, with each element's
+    properties in _properties.
+
+    :param value: Script result.
+    :type value: object
+
+    :rtype: object
+
+    """
+    if isinstance(value, MemoryElement):
+        element = dict(_id=value._id, _type=value._type, _properties=dict(value.data))
+        if value._type == "edge":
+            element.update(_outV=value._outV, _inV=value._inV, _label=value._label)
+        return element
+    if isinstance(value, MemoryIndex):
+        return value.to_json()
+    if isinstance(value, dict):
+        return dict((key, to_rexpro(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return [to_rexpro(item) for item in value]
+    return value
+
+
+class LocalTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class RexProRequestHandler(socketserver.StreamRequestHandler):
+    """Passes each message on a connection to the server and writes its response."""
+
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        server = self.server.local_server
+        while True:
+            try:
+                serializer_type, message_type, body = read_message(self.rfile)
+            except socket.error:
+                return
+            server.transfer(received=HEADER.size + len(body))
+            response = server.respond_message(serializer_type, message_type, body)
+            server.transfer(sent=len(response))
+            self.wfile.write(response)
@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Local fake Rexster server backed by a MemoryGraph.
+
+"""
+import socket
+import sys
+import threading
+import time
+import zlib
+
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import urlsplit, parse_qsl, unquote
+
+from bulbs.groovy import GroovyScripts
+from bulbs.rest import GZIP, DEFLATE, gzip_encode, get_decoder
+from bulbs.utils import json, get_file_path, get_logger
+
+from bulbs.memory.store import MemoryGraph
+from .gremlin import GremlinEmulator, UnsupportedScript, to_json
+
+log = get_logger(__name__)
+
+
+class LocalServer(object):
+    """
+    Base class for the local stand-in servers, which serve JSON from a
+    background thread.
+
+    :param latency: Seconds to sleep before each response. Defaults to 0.
+    :type latency: float
+
+    :param padding: Number of bytes of filler to add to each response body,
+        in a "padding" field the client ignores. Defaults to 0.
+    :type padding: int
+
+    :param bandwidth: Bytes per second of the simulated link, or None for
+        no limit. Defaults to None.
+    :type bandwidth: int
+
+    :param host: Host to bind to. Defaults to "127.0.0.1".
+    :type host: str
+
+    :param port: Port to bind to. Defaults to 0, for any free port.
+    :type port: int
+
+    :ivar requests: Number of requests served.
+    :ivar bytes_received: Total size of the request bodies, as sent.
+    :ivar bytes_sent: Total size of the response bodies, as sent.
+
+    HTTP servers gzip or deflate their responses for clients that accept it,
+    and decompress gzipped request bodies.
+
+    """
+    #: URI scheme of the protocol the server speaks.
+    scheme = "http"
+
+    def __init__(self, latency=0.0, padding=0, bandwidth=None, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.padding = padding
+        self.bandwidth = bandwidth
+        self.requests = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        self.server = self.create_server((host, port))
+        self.server.local_server = self
+        self.thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def uri(self):
+        """The server's root URI."""
+        host, port = self.server.server_address[:2]
+        return "%s://%s:%s" % (self.scheme, host, port)
+
+    def start(self):
+        """
+        Starts serving in a daemon thread.
+
+        :rtype: None
+
+        """
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops serving and closes the socket.
+
+        :rtype: None
+
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def create_server(self, address):
+        """
+        Returns the socketserver that listens on the address.
+
+        :param address: The (host, port) tuple to bind to.
+        :type address: tuple
+
+        """
+        return LocalHTTPServer(address, LocalRequestHandler)
+
+    def transfer(self, received=0, sent=0):
+        """
+        Counts the bytes that crossed the link, and sleeps for as long as
+        they take at the bandwidth.
+
+        :param received: Number of bytes received from the client.
+        :type received: int
+
+        :param sent: Number of bytes sent to the client.
+        :type sent: int
+
+        :rtype: None
+
+        """
+        with self.lock:
+            self.bytes_received += received
+            self.bytes_sent += sent
+        if self.bandwidth:
+            time.sleep(float(received + sent) / self.bandwidth)
+
+    def respond(self, method, path, params):
+        """
+        Returns the (status, body) tuple for a request, after the latency.
+
+        :param method: HTTP method.
+        :type method: str
+
+        :param path: Request path, split on slashes.
+        :type path: list
+
+        :param params: Query string or JSON body params.
+        :type params: dict
+
+        :rtype: tuple
+
+        """
+        with self.lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        status, content = self.dispatch(method, path, params)
+        if isinstance(content, bytes):
+            return status, content
+        return status, self.encode(content)
+
+    def dispatch(self, method, path, params):
+        """
+        Returns the (status, content) tuple for a request. The content is a
+        JSON-serializable object, or bytes that are already encoded.
+
+        :rtype: tuple
+
+        """
+        raise NotImplementedError
+
+    def encode(self, content):
+        """
+        Returns the content as a JSON body, with the padding.
+
+        :rtype: bytes
+
+        """
+        if self.padding and isinstance(content, dict):
+            content = dict(content, padding="x" * self.padding)
+        return json.dumps(content).encode('utf-8')
+
+
+class FakeServer(LocalServer):
+    """
+    A local stand-in for Rexster that serves the subset of the REST API
+    and Gremlin extension that bulbs uses, from an in-memory graph.
+
+    It runs in a background thread, so tests and benchmarks can exercise
+    the whole client stack without a database. Latency and padding let
+    benchmarks simulate the network and larger payloads, or factor them
+    out entirely.
+
+    :param graph: The graph to serve. Defaults to a new MemoryGraph.
+    :type graph: MemoryGraph
+
+    See LocalServer for the other params.
+
+    Example:
+
+    >>> from bulbs.config import Config
+    >>> from bulbs.rexster import Graph
+    >>> from bulbs.testing import FakeServer
+    >>> with FakeServer(latency=0.001) as server:
+    ...     g = Graph(Config(server.get_graph_uri()))
+    ...     james = g.vertices.create(name="James")
+
+    """
+    def __init__(self, graph=None, **kwds):
+        super(FakeServer, self).__init__(**kwds)
+        self.graph = graph if graph is not None else MemoryGraph()
+        self.emulator = GremlinEmulator(self.graph, self._get_scripts())
+
+    def get_graph_uri(self, name="tinkergraph"):
+        """
+        Returns the URI of a graph on the server, for the Config. Every
+        graph name is served from the same MemoryGraph.
+
+        :param name: Graph name. Defaults to "tinkergraph".
+        :type name: str
+
+        :rtype: str
+
+        """
+        return "%s/graphs/%s" % (self.uri, name)
+
+    def dispatch(self, method, path, params):
+        if path[:1] == ["graphs"] and len(path) >= 2:
+            return self.handle(method, path[2:], params)
+        return 404, dict(message="Resource not found")
+
+    def handle(self, method, path, params):
+        """
+        Handles a request and returns a (status, content) tuple.
+
+        :param method: HTTP method.
+        :type method: str
+
+        :param path: Path below /graphs/<name>/, split on slashes.
+        :type path: list
+
+        :param params: Query string or JSON body params.
+        :type params: dict
+
+        :rtype: tuple
+
+        """
+        graph = self.graph
+        resource = path[0] if path else None
+        try:
+            with graph.lock:
+                if resource in ("vertices", "edges"):
+                    return self._handle_element(method, resource, path[1:], params)
+                if resource == "indices":
+                    return self._handle_index(method, path[1:], params)
+                if path == ["tp", "gremlin"] and method == "POST":
+                    result = self.emulator.execute(params.get('script', ""), params.get('params'))
+                    if result is None:
+                        result = []
+                    elif not isinstance(result, list):
+                        result = [result]
+                    return 200, dict(results=to_json(result))
+                if path[:2] == ["tp", "batch"] and method == "GET":
+                    elements = graph.vertices if path[2:] == ["vertices"] else graph.edges
+                    ids = params.get('idList', "[]").strip("[]").split(",")
+                    results = [elements[_id].to_json() for _id in ids if _id in elements]
+                    return 200, dict(results=results)
+        except LookupError as e:
+            return 404, dict(message=str(e))
+        except (ValueError, TypeError, UnsupportedScript) as e:
+            log.debug("Fake server error: %s", e)
+            return 500, dict(message=str(e))
+        return 404, dict(message="Resource not found: %s" % "/".join(path))
+
+    def _handle_element(self, method, resource, path, params):
+        graph = self.graph
+        is_vertex = resource == "vertices"
+        if not path:
+            if method != "POST":
+                return 405, dict(message="Method not allowed")
+            if is_vertex:
+                element = graph.add_vertex(params)
+            else:
+                params = dict(params)
+                outV, label, inV = params.pop('_outV'), params.pop('_label'), params.pop('_inV')
+                element = graph.add_edge(outV, label, inV, params)
+            return 200, dict(results=element.to_json())
+        element = graph.get_vertex(path[0]) if is_vertex else graph.get_edge(path[0])
+        if element is None:
+            raise LookupError("Element not found: %s" % path[0])
+        if method == "GET":
+            return 200, dict(results=element.to_json())
+        if method == "PUT":
+            # Rexster's PUT replaces all the properties.
+            element.data = dict((key, value) for key, value in params.items()
+                                if value is not None and not key.startswith("_"))
+            return 200, dict(results=element.to_json())
+        if method == "DELETE":
+            if is_vertex:
+                graph.remove_vertex(element._id)
+            else:
+                graph.remove_edge(element._id)
+            return 200, dict()
+        return 405, dict(message="Method not allowed")
+
+    def _handle_index(self, method, path, params):
+        graph = self.graph
+        if not path:
+            results = [index.to_json() for index in graph.indices.values()]
+            return 200, dict(results=results)
+        name = path[0]
+        if method == "POST":
+            index = graph.create_index(name, params.get('class'), params.get('type', "manual"))
+            return 201, dict(results=index.to_json())
+        index = graph.get_index(name)
+        if index is None:
+            raise LookupError("Index not found: %s" % name)
+        elements = graph.vertices if index.index_class == "vertex" else graph.edges
+        if path[1:] == ["count"]:
+            return 200, dict(totalSize=index.count(params.get('key'), params.get('value')))
+        if path[1:] == ["keys"]:
+            return 200, dict(results=index.keys())
+        if method == "GET":
+            if 'key' not in params:
+                return 200, dict(results=index.to_json())
+            ids = index.get(params['key'], params.get('value'))
+            results = [elements[_id].to_json() for _id in ids if _id in elements]
+            return 200, dict(results=results, totalSize=len(results))
+        if method == "PUT":
+            _id = str(params['id'])
+            if _id not in elements:
+                raise LookupError("Element not found: %s" % _id)
+            index.put(params['key'], params['value'], _id)
+            return 200, dict()
+        if method == "DELETE":
+            if 'id' in params:
+                index.remove(str(params['id']), params.get('key'), params.get('value'))
+            else:
+                graph.remove_index(name)
+            return 200, dict()
+        return 405, dict(message="Method not allowed")
+
+    def _get_scripts(self):
+        # The scripts the RexsterClient sends, to recognize them by body.
+        import bulbs.rexster.client
+        scripts = GroovyScripts()
+        scripts.update(get_file_path(bulbs.rexster.client.__file__, "gremlin.groovy"))
+        return scripts
+
+
+class LocalHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def handle_error(self, request, client_address):
+        if sys is None:
+            # Python 2 sets the module's globals to None at shutdown, while
+            # the daemon threads may still be serving.
+            return
+        # A client that timed out has closed the connection; that's fine.
+        if isinstance(sys.exc_info()[1], socket.error):
+            log.debug("Client %s went away", client_address)
+            return
+        BaseHTTPServer.HTTPServer.handle_error(self, request, client_address)
+
+
+class LocalRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Passes requests to the LocalServer and writes its responses."""
+
+    protocol_version = "HTTP/1.1"
+
+    # Headers and body are written separately, so don't let Nagle's
+    # algorithm hold back the body (StreamRequestHandler, Python 3).
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def log_message(self, format, *args):
+        log.debug(format, *args)
+
+    def _handle(self, method):
+        server = self.server.local_server
+        parts = urlsplit(self.path)
+        params = dict(parse_qsl(parts.query))
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            body = self.rfile.read(length)
+            server.transfer(received=length)
+            decoder = get_decoder(self.headers.get('Content-Encoding'))
+            if decoder is not None:
+                body = decoder.decompress(body) + decoder.flush()
+            body = json.loads(body.decode('utf-8'))
+            if isinstance(body, dict):
+                params.update(body)
+            else:
+                # e.g. the list of jobs in a Neo4j batch
+                params = body
+        path = [unquote(part) for part in parts.path.split("/") if part]
+        status, body = server.respond(method, path, params)
+        encoding = self._get_encoding()
+        if encoding is not None:
+            body = encode(body, encoding)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        server.transfer(sent=len(body))
+        self.wfile.write(body)
+
+    def _get_encoding(self):
+        # Ignores q-values, which bulbs doesn't send.
+        accepted = self.headers.get('Accept-Encoding') or ""
+        accepted = [value.split(";")[0].strip() for value in accepted.split(",")]
+        for encoding in (GZIP, DEFLATE):
+            if encoding in accepted:
+                return encoding
+        return None
+
+
+def encode(body, encoding):
+    """
+    Returns the body compressed with the gzip or deflate content coding.
+
+    :rtype: bytes
+
+    """
+    if encoding == GZIP:
+        return gzip_encode(body)
+    return zlib.compress(body)
@@ -1,3 +1,3 @@
-from .testcase import BulbsTestCase
+from .testcase import BulbsTestCase, BulbsTestSuite
 from .bulbs_tests import bulbs_test_suite
 from .gremlin_tests import GremlinTestCase
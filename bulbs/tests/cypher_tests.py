@@ -0,0 +1,75 @@
+import json
+import unittest
+
+from bulbs.config import Config
+from bulbs.neo4jserver import Neo4jClient
+from bulbs.neo4jserver.cypher import Cypher
+from bulbs.testing import ReplayServer
+
+# Recorded Cypher responses, from Neo4j 1.x's CypherPlugin, a batch of
+# CypherPlugin queries, and Neo4j 2.0's transactional endpoint.
+NODE = {"self": "http://localhost:7474/db/data/node/1", "data": {"name": "James"}}
+
+
+def batch(jobs):
+    return [dict(id=job['id'], body=dict(columns=["n"], data=[[NODE]])) for job in jobs]
+
+
+# Pre-encoded, so "columns" comes before "data" as the stream needs; JSON
+# encoders don't keep a dict's order on Python 2.
+def encode(body, **values):
+    return (body % dict((key, json.dumps(value)) for key, value in values.items())).encode('utf-8')
+
+routes = [("POST", r"batch$", batch),
+          ("POST", r"ext/CypherPlugin",
+           encode('{"columns": %(columns)s, "data": %(data)s}',
+                  columns=["n", "n.name"], data=[[NODE, "James"]])),
+          ("POST", r"transaction/commit$",
+           encode('{"results": [{"columns": %(columns)s, "data": %(data)s}], "errors": []}',
+                  columns=["n"], data=[dict(rest=[NODE])]))]
+
+server = ReplayServer(routes, root="db/data")
+
+
+class CypherPluginTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Neo4jClient(Config(server.get_root_uri()))
+        self.cypher = Cypher(self.client)
+
+    def test_query(self):
+        vertices = list(self.cypher.query("START n=node(1) RETURN n, n.name"))
+        assert [vertex.eid for vertex in vertices] == [1]
+
+    def test_table(self):
+        columns, rows = self.cypher.table("START n=node(1) RETURN n, n.name")
+        assert columns == ["n", "n.name"]
+        assert rows[0][1] == "James"
+
+    def test_stream(self):
+        rows = list(self.cypher.stream("START n=node(1) RETURN n, n.name"))
+        assert rows[0][0].eid == 1
+        assert rows[0][1] == "James"
+
+    def test_execute_all(self):
+        query = "START n=node(1) RETURN n"
+        resp = self.cypher.execute_all([(query, None), (query, None)])
+        assert len(resp.get_tables()) == 2
+        assert resp.total_size == 2
+
+    def test_transactions(self):
+        self.client.config.cypher_transactions = True
+        columns, rows = self.cypher.table("START n=node(1) RETURN n")
+        assert columns == ["n"]
+        rows = list(self.cypher.stream("START n=node(1) RETURN n"))
+        assert rows[0][0].eid == 1
+
+
+def cypher_suite():
+    server.start()
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(CypherPluginTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='cypher_suite')
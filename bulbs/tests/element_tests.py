@@ -4,10 +4,14 @@
 # BSD License (see LICENSE for details)
 #
 import time
+import pickle
 import unittest
 
 from bulbs import config
 from bulbs.element import Vertex, VertexProxy, EdgeProxy, Edge
+from bulbs.pool import client_pool
+from bulbs.metrics import CollectorGroup, HistogramCollector
+from bulbs.slowlog import SlowQueryLog
 
 from .testcase import BulbsTestCase
 
@@ -69,6 +73,68 @@ class VertexTestCase(BulbsTestCase):
         assert self.julie._type == "vertex"
         assert self.julie.name == "Julie"
 
+    def test_data_doesnt_share_the_result(self):
+        vertex = self.vertices.get(self.james._id)
+        vertex.data()['age'] = 34
+        assert 'age' not in vertex._result.get_data()
+        assert vertex.data()['age'] == 34
+
+    def test_pickle(self):
+        # Protocol 0 is Python 2's default.
+        for protocol in (0, pickle.HIGHEST_PROTOCOL):
+            vertices = pickle.loads(pickle.dumps([self.james, self.julie], protocol))
+            assert vertices[0] == self.james
+            assert vertices[0].name == "James"
+            # unpickled elements share one pooled client
+            assert vertices[0]._client is vertices[1]._client
+
+    def test_pickle_with_metrics(self):
+        collector = HistogramCollector()
+        self.client.config.metrics = CollectorGroup(collector, SlowQueryLog())
+        try:
+            vertex = pickle.loads(pickle.dumps(self.james))
+        finally:
+            self.client.config.metrics = None
+        assert vertex.name == "James"
+        copy = vertex._client.config.metrics.collectors[0]
+        with copy.lock:
+            assert copy.histograms.keys() == collector.histograms.keys()
+
+    def test_unpickle_config_without_new_options(self):
+        config = pickle.loads(pickle.dumps(self.client.config))
+        for key in ("metrics", "router", "coalesce_reads", "timeout"):
+            del config.__dict__[key]
+        client = self.client.__class__(config)
+        assert client.config.timeout is None
+        assert client.config.router is None
+
+    def test_pickle_doesnt_pool_the_client(self):
+        client_pool.clear()
+        pickle.dumps(self.james)
+        assert client_pool.clients == {}
+
+    def test_traverse(self):
+        vertices = list(self.james.traverse().out("test"))
+        assert len(vertices) == 1
+        assert vertices[0] == self.julie
+        vertices = list(self.james.traverse().out("test").out("test").dedup())
+        assert vertices == [self.james]
+
+    def test_traverse_limit(self):
+        traversal = self.james.traverse().out("test").out("test")
+        assert list(traversal.limit(1)) == [self.james]
+        assert list(self.james.traverse().out("test").limit(0)) == []
+        assert self.james.traverse().out("test").range(1, 1).count() == 0
+        self.assertRaises(ValueError, self.james.traverse().limit, -1)
+
+    def test_neighbourhood(self):
+        subgraph = self.james.neighbourhood(depth=1, labels="test")
+        assert len(subgraph) == 2
+        assert self.julie in subgraph
+        assert subgraph.outV(self.james._id, "test") == [self.julie]
+        assert subgraph.inV(self.james._id, "test") == [self.julie]
+        assert len(subgraph.bothE(self.julie._id)) == 2
+
     def test_get_out_edges(self):
         edges = self.james.outE()
         edges = list(edges)
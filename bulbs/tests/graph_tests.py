@@ -46,6 +46,19 @@ class GraphTestCase(BulbsTestCase):
         assert isinstance(self.graph.users, NodeProxy)
         assert isinstance(self.graph.groups, NodeProxy)
         assert isinstance(self.graph.members, RelationshipProxy)
+
+    def test_multi(self):
+        james = self.graph.vertices.create(name="James")
+        julie = self.graph.vertices.create(name="Julie")
+        self.graph.edges.create(james, "knows", julie)
+
+        with self.graph.multi() as multi:
+            vertex = multi.get_vertex(james._id)
+            friends = multi.outV(james._id, "knows")
+
+        assert vertex.element(self.graph.client)._id == james._id
+        friend_ids = [friend._id for friend in friends.elements(self.graph.client)]
+        assert friend_ids == [julie._id]
         
         
 def suite():
@@ -1,4 +1,8 @@
 import unittest
+from bulbs.gremlin import Gremlin
+from bulbs.frame import DictionaryColumn
+from bulbs.metrics import HistogramCollector, prometheus_text
+from bulbs.slowlog import SlowQueryLog
 from .testcase import BulbsTestCase
 
 class GremlinTestCase(BulbsTestCase):
@@ -14,3 +18,41 @@ class GremlinTestCase(BulbsTestCase):
         # limiting return count so we don't exceed heap size
         resp = self.client.gremlin("g.V[0..9]")
         assert resp.total_size > 5
+
+    def test_table(self):
+        gremlin = Gremlin(self.client)
+        script = "g.V[0..9].transform{[name: 'v' + it.id, number: 1]}"
+        columns, rows = gremlin.table(script)
+        assert sorted(columns) == ["name", "number"]
+        frame = gremlin.table(script, columnar=True)
+        assert len(frame) == len(rows)
+        assert isinstance(frame["name"], DictionaryColumn)
+        assert list(frame["number"]) == [1] * len(rows)
+
+    def test_metrics(self):
+        collector = HistogramCollector()
+        self.client.config.metrics = collector
+        try:
+            script = self.client.scripts.get("outV")
+            params = dict(_id=next(self.client.get_all_vertices().results).get_id(), 
+                          label=None, start=None, limit=None)
+            resp = self.client.gremlin(script, params)
+        finally:
+            self.client.config.metrics = None
+        assert resp.call_info.name == "outV"
+        assert resp.call_info.bytes_received > 0
+        assert collector.get("server_seconds", "POST", "outV").count == 1
+        assert 'name="outV"' in prometheus_text(collector)
+
+    def test_slow_query_log(self):
+        slow_log = SlowQueryLog(threshold=0, report_interval=None)
+        self.client.config.metrics = slow_log
+        try:
+            self.client.gremlin("g.V[0..9]")
+            self.client.gremlin("g.V[0..9]")
+        finally:
+            self.client.config.metrics = None
+        top = slow_log.get_top()
+        method, name, params_shape = top[0].key
+        assert name.startswith("gremlin:") and params_shape == "null"
+        assert top[0].count == 2
@@ -1,7 +1,7 @@
 import unittest
 from .testcase import BulbsTestCase
 from bulbs.model import Node, NodeProxy, Relationship, RelationshipProxy
-from bulbs.property import Integer, String, DateTime, Bool
+from bulbs.property import Integer, String, DateTime, Bool, List
 from bulbs.utils import current_datetime
 
 class Knows(Relationship):
@@ -18,6 +18,23 @@ class Person(Node):
     age  = Integer()
     is_adult = Bool()
 
+class Author(Node):
+
+    element_type = "author"
+
+    name = String(nullable=False)
+    tags = List()
+
+class Reader(Node):
+
+    element_type = "reader"
+
+    name = String(nullable=False)
+    age = Integer()
+    is_adult = Bool(fget="check_adult")
+
+    def check_adult(self):
+        return self.age >= 18
 
 
 class NodeTestCase(BulbsTestCase):
@@ -39,6 +56,12 @@ class NodeTestCase(BulbsTestCase):
         person = self.people.get(self.james.eid)
         assert person == self.james
         
+    def test_lazy_properties(self):
+        person = self.people.get(self.james.eid)
+        assert "name" not in person.__dict__
+        assert person.name == "James"
+        assert person.__dict__["name"] == "James"
+
     def test_get_all(self):
         people = self.people.get_all()
         assert len(list(people)) > 1
@@ -47,6 +70,53 @@ class NodeTestCase(BulbsTestCase):
         index_name = self.people.index.index_name
         assert index_name == "person"
 
+    def test_dirty_keys(self):
+        assert self.james.get_dirty_keys() == set()
+        self.james.age = 35
+        assert self.james.get_dirty_keys() == set(["age"])
+
+    def test_partial_save(self):
+        self.james.age = 35
+        self.james.save()
+        assert self.james.get_dirty_keys() == set()
+        person = self.people.get(self.james.eid)
+        assert person.age == 35
+        assert person.name == "James"
+        assert person.is_adult is True
+
+    def test_save_in_place_changes(self):
+        authors = NodeProxy(Author,self.client)
+        authors.index = self.vertex_index_proxy(self.index_class,self.client).get_or_create("author")
+        author = authors.get(authors.create(name="James", tags=["python"]).eid)
+        author.tags.append("graphs")
+        author.save()
+        assert authors.get(author.eid).tags == ["python", "graphs"]
+        author.tags.remove("python")
+        author.save()
+        assert authors.get(author.eid).tags == ["graphs"]
+
+    def test_save_calculated_properties(self):
+        readers = NodeProxy(Reader,self.client)
+        readers.index = self.vertex_index_proxy(self.index_class,self.client).get_or_create("reader")
+        reader = readers.get(readers.create(name="James", age=17).eid)
+        # unchanged calculated values aren't sent again
+        assert reader._get_changed_property_data() == {}
+        reader.age = 18
+        assert reader._get_changed_property_data() == dict(age=18, is_adult=True)
+        reader.save()
+        assert reader._get_changed_property_data() == {}
+        assert readers.get(reader.eid).is_adult is True
+
+    def test_codec(self):
+        encode, decode = Person.get_codec(self.client.type_system)
+        data = encode(self.james, dict())
+        assert data == dict(name="James", age=34, is_adult=True)
+        person = Person(self.client)
+        decode(person, data)
+        assert person.name == "James"
+        assert person.age == 34
+        assert person.is_adult is True
+
     # Will this work for autmatic indices?
     #def test_index_put_and_get(self): 
         # must test put/get together b/c self.james gets reset every time
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from bulbs.config import Config
+from bulbs.stream import JSONStream
+from bulbs.neo4jserver.client import Neo4jStream
+
+NODE = {"self": "http://localhost:7474/db/data/node/1", "data": {"name": u"Jérôme"}}
+ROWS = [[NODE, 1, 1.5, None, True], [NODE, 22, -3e-05, "x", False]]
+
+
+def chunk(body, size):
+    # The body split into chunks of size bytes, e.g. cutting through
+    # numbers and multi-byte characters.
+    body = body.encode('utf-8')
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def plugin_body(rows=ROWS, order=("columns", "data")):
+    parts = dict(columns=json.dumps(["n", "a", "b", "c", "d"]), data=json.dumps(rows))
+    return "{%s}" % ", ".join('"%s": %s' % (key, parts[key]) for key in order)
+
+
+def transaction_body(rows=ROWS, errors=()):
+    data = json.dumps([dict(rest=row) for row in rows])
+    return ('{"commit": "http://localhost:7474/db/data/transaction/1/commit", '
+            '"results": [{"columns": ["n", "a", "b", "c", "d"], "data": %s}, '
+            '{"columns": ["x"], "data": [{"rest": [1]}]}], "errors": %s}' %
+            (data, json.dumps(list(errors))))
+
+
+class JSONStreamTestCase(unittest.TestCase):
+
+    def test_values(self):
+        body = '{"a": [1, 2.5e3, -7], "b": true, "c": null, "d": "\\u00e9"}'
+        for size in (1, 2, 3, 1000):
+            stream = JSONStream(chunk(body, size))
+            stream.expect("{")
+            assert stream.next_key() == "a"
+            stream.expect("[")
+            values = [stream.decode()]
+            while stream.peek() == ",":
+                stream.skip()
+                values.append(stream.decode())
+            stream.expect("]")
+            assert values == [1, 2500.0, -7]
+            assert [(stream.next_key(), stream.decode()) for i in range(3)] == \
+                [("b", True), ("c", None), ("d", u"é")]
+            assert stream.next_key() is None
+            assert stream.peek() == ""
+
+    def test_errors(self):
+        body = '{"a": [1, 2'
+        self.assertRaises(ValueError, JSONStream(chunk(body, 1)).expect, "[")
+        self.assertRaises(ValueError, JSONStream(chunk(body, 1)).next_key)
+        stream = JSONStream(chunk(body, 1))
+        stream.expect("{")
+        assert stream.next_key() == "a"
+        self.assertRaises(ValueError, stream.decode)
+
+
+class Neo4jStreamTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config("http://localhost:7474/db/data/")
+
+    def test_plugin_rows(self):
+        for size in (1, 7, 100000):
+            stream = Neo4jStream(chunk(plugin_body(), size), self.config, transactional=False)
+            assert stream.get_columns() == ["n", "a", "b", "c", "d"]
+            assert list(stream) == ROWS
+
+    def test_transaction_rows(self):
+        for size in (1, 7, 100000):
+            stream = Neo4jStream(chunk(transaction_body(), size), self.config)
+            assert list(stream) == ROWS
+            assert stream.get_columns() == ["n", "a", "b", "c", "d"]
+
+    def test_empty(self):
+        stream = Neo4jStream(chunk(plugin_body(rows=[]), 1), self.config, transactional=False)
+        assert list(stream) == []
+        body = '{"results": [], "errors": []}'
+        stream = Neo4jStream(chunk(body, 1), self.config)
+        assert stream.get_columns() == []
+        assert list(stream) == []
+
+    def test_errors(self):
+        errors = [dict(code="Neo.ClientError.Statement.InvalidSyntax", message="Invalid")]
+        body = transaction_body(errors=errors)
+        stream = Neo4jStream(chunk(body, 1), self.config)
+        self.assertRaises(ValueError, list, stream)
+        body = '{"errors": %s, "results": []}' % json.dumps(errors)
+        stream = Neo4jStream(chunk(body, 1), self.config)
+        self.assertRaises(ValueError, stream.get_columns)
+
+    def test_wrong_key_order(self):
+        body = plugin_body(order=("data", "columns"))
+        stream = Neo4jStream(chunk(body, 1), self.config, transactional=False)
+        try:
+            stream.get_columns()
+        except ValueError as e:
+            assert '"data" before "columns"' in str(e)
+        else:
+            raise AssertionError("Expected a ValueError")
+
+    def test_truncated(self):
+        body = plugin_body()[:-20]
+        stream = Neo4jStream(chunk(body, 1), self.config, transactional=False)
+        self.assertRaises(ValueError, list, stream)
+
+
+def stream_suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(JSONStreamTestCase))
+    suite.addTest(unittest.makeSuite(Neo4jStreamTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='stream_suite')
@@ -4,4 +4,25 @@ class BulbsTestCase(unittest.TestCase):
 
     client = None
     index_class = None
-    
+
+
+class BulbsTestSuite(unittest.TestSuite):
+    """
+    Runs a backend's tests with BulbsTestCase set to its client, so the
+    suites of several backends can run in one test run.
+
+    :param tests: The backend's tests.
+    :type tests: list
+
+    :param backend: The BulbsTestCase attributes to set, e.g. client.
+    :type backend: dict
+
+    """
+    def __init__(self, tests=(), **backend):
+        super(BulbsTestSuite, self).__init__(tests)
+        self.backend = backend
+
+    def run(self, result, debug=False):
+        for key, value in self.backend.items():
+            setattr(BulbsTestCase, key, value)
+        return super(BulbsTestSuite, self).run(result, debug)
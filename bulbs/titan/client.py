@@ -56,7 +56,7 @@ class TitanResult(RexsterResult):
     :ivar data: The data in the result.
 
     """
-    pass
+    __slots__ = ()
 
 
 class TitanResponse(RexsterResponse):
@@ -121,6 +121,10 @@ class TitanClient(RexsterClient):
     def __init__(self, config=None, db_name=None):
         super(TitanClient, self).__init__(config, db_name)
 
+        # Also include the Titan-specific Gremlin-Groovy scripts
+        scripts_file = get_file_path(__file__, "gremlin.groovy")
+        self.scripts.update(scripts_file)
+
     # Titan-Specific Index Methods
 
     def create_vertex_key_index(self, key):
@@ -411,7 +415,36 @@ class TitanClient(RexsterClient):
         :rtype: TitanResponse
 
         """
-        return self.update_vertex(_id, data)
+        # Titan's key indices are automatic, so only write the changed values
+        script = self.scripts.get("update_vertex_properties")
+        params = dict(_id=_id, data=data)
+        return self.gremlin(script, params)
+
+    def patch_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Updates only the given properties of a vertex and returns the Response.
+
+        Titan maintains its key indices automatically so index_name and keys
+        are ignored. A value of None removes the property.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Changed property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: TitanResponse
+
+        """
+        script = self.scripts.get("patch_vertex")
+        params = dict(_id=_id, data=data)
+        return self.gremlin(script, params)
 
     # Model Proxy - Edge
 
@@ -461,7 +494,36 @@ class TitanClient(RexsterClient):
         :rtype: TitanResponse
 
         """
-        return self.update_edge(_id, data)
+        # Titan's key indices are automatic, so only write the changed values
+        script = self.scripts.get("update_edge_properties")
+        params = dict(_id=_id, data=data)
+        return self.gremlin(script, params)
+
+    def patch_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Updates only the given properties of an edge and returns the Response.
+
+        Titan maintains its key indices automatically so index_name and keys
+        are ignored. A value of None removes the property.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Changed property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: TitanResponse
+
+        """
+        script = self.scripts.get("patch_edge")
+        params = dict(_id=_id, data=data)
+        return self.gremlin(script, params)
 
 
 
@@ -35,25 +35,31 @@ def create_indexed_vertex(data,index_name,keys) {
 }
 
 
+// Diffs the old and new values so only the index entries of changed keys
+// are removed and re-added; unchanged keys aren't touched.
 def update_indexed_vertex(_id, data, index_name, keys) {
   def updateIndexedVertex = { 
     vertex = g.v(_id);
     index = g.idx(index_name);
-    // remove vertex from index
-    for (String key in vertex.getPropertyKeys()) {
-      if (keys == null || keys.contains(key)) {
-	value = vertex.getProperty(key);
-	index.remove(key, String.valueOf(value), vertex);
-      }
+    // remove the properties that aren't in the new data
+    for (String key in vertex.getPropertyKeys().toList()) {
+      if (data.get(key) != null) continue;
+      if (keys == null || keys.contains(key))
+	index.remove(key, String.valueOf(vertex.getProperty(key)), vertex);
+      vertex.removeProperty(key);
     }
-    ElementHelper.removeProperties([vertex]);
-    ElementHelper.setProperties(vertex,data);
-    // add vertex to index
+    // only re-index the keys whose value changed
     for (entry in data.entrySet()) {
       if (entry.value == null) continue;
-      if (keys == null || keys.contains(entry.key))
-	index.put(entry.key,String.valueOf(entry.value),vertex);
-    }    
+      old = vertex.getProperty(entry.key);
+      if (old == entry.value) continue;
+      indexed = (keys == null || keys.contains(entry.key));
+      if (indexed && old != null)
+	index.remove(entry.key, String.valueOf(old), vertex);
+      vertex.setProperty(entry.key, entry.value);
+      if (indexed)
+	index.put(entry.key, String.valueOf(entry.value), vertex);
+    }
     return vertex;
   }
   def transaction = { final Closure closure ->
@@ -100,23 +106,29 @@ def create_indexed_edge(outV,label,inV,data,index_name,keys,label_var) {
 
 // don't need to update indexed label, it can't change
 def update_indexed_edge(_id, data, index_name, keys) {
-  def updateIndexedEdge = {
+  def updateIndexedEdge = { 
     edge = g.e(_id);
     index = g.idx(index_name);
-    for (String key in edge.getPropertyKeys()) {
-      if (keys == null || keys.contains(key)) {
-	value = edge.getProperty(key)
-	index.remove(key, String.valueOf(value), edge);
-      }
+    // remove the properties that aren't in the new data
+    for (String key in edge.getPropertyKeys().toList()) {
+      if (data.get(key) != null) continue;
+      if (keys == null || keys.contains(key))
+	index.remove(key, String.valueOf(edge.getProperty(key)), edge);
+      edge.removeProperty(key);
     }
-    ElementHelper.removeProperties([edge]);
-    ElementHelper.setProperties(edge,data);
+    // only re-index the keys whose value changed
     for (entry in data.entrySet()) {
       if (entry.value == null) continue;
-      if (keys == null || keys.contains(entry.key))
-	index.put(entry.key,String.valueOf(entry.value),edge)
-    return edge;
+      old = edge.getProperty(entry.key);
+      if (old == entry.value) continue;
+      indexed = (keys == null || keys.contains(entry.key));
+      if (indexed && old != null)
+	index.remove(entry.key, String.valueOf(old), edge);
+      edge.setProperty(entry.key, entry.value);
+      if (indexed)
+	index.put(entry.key, String.valueOf(entry.value), edge);
     }
+    return edge;
   }
   def transaction = { final Closure closure ->
     try {
@@ -130,3 +142,49 @@ def update_indexed_edge(_id, data, index_name, keys) {
   }
   return transaction(updateIndexedEdge);
 }
+
+
+// Vertices
+
+// Blueprints 2 version of the neighbourhood() script in bulbs/gremlin.groovy.
+def neighbourhood(_id, depth, labels, direction, max_nodes) {
+  start = g.v(_id)
+  labelArray = (labels == null) ? new String[0] : (labels as String[])
+  vertices = new LinkedHashMap()
+  edges = new LinkedHashMap()
+  vertices.put(start.id, start)
+  frontier = [start]
+  for (hop = 0; hop < depth && !frontier.isEmpty(); hop++) {
+    next = []
+    for (vertex in frontier) {
+      pairs = []
+      if (direction != "in")
+        pairs.addAll(vertex.getEdges(Direction.OUT, labelArray).collect{ [it, it.getVertex(Direction.IN)] })
+      if (direction != "out")
+        pairs.addAll(vertex.getEdges(Direction.IN, labelArray).collect{ [it, it.getVertex(Direction.OUT)] })
+      for (pair in pairs) {
+        other = pair[1]
+        if (!vertices.containsKey(other.id)) {
+          if (max_nodes != null && vertices.size() >= max_nodes) continue;
+          vertices.put(other.id, other)
+          next.add(other)
+        }
+        edges.put(pair[0].id, pair[0])
+      }
+    }
+    frontier = next
+  }
+  results = []
+  results.addAll(vertices.values())
+  results.addAll(edges.values())
+  return results
+}
+
+// Titan only has automatic key indices, so index_name is ignored.
+def lookup_vertex(index_name, key, value) {
+  g.getVertices(key, value)
+}
+
+def lookup_edge(index_name, key, value) {
+  g.getEdges(key, value)
+}
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+A traversal builder that compiles to a single Gremlin script.
+
+"""
+from .gremlin import Gremlin
+from .element import Element, Edge
+from .utils import get_logger
+
+log = get_logger(__name__)
+
+
+class Traversal(object):
+    """
+    Builds a multi-step traversal that runs in one Gremlin request.
+
+    Each step appends a Gremlin-Groovy step to the pipeline and every
+    user-supplied value is bound as a script parameter, so the script is
+    the same for the same steps and the server can cache it.
+
+    :param client: The Client object for the database.
+    :type client: Client
+
+    :param start: Start element(s) or ID(s). IDs are assumed to be vertices.
+    :type start: Element, int, str, or list
+
+    :ivar empty: True if a step keeps no elements, e.g. limit(0), so the 
+        traversal returns nothing without a request.
+
+    Example:
+
+    >>> from bulbs.neo4jserver import Graph
+    >>> g = Graph()
+    >>> james = g.vertices.get(3)
+    >>> traversal = g.traverse(james).out("knows").out("works_at").dedup()
+    >>> companies = traversal.limit(100).all()
+
+    """
+    def __init__(self, client, start):
+        self.client = client
+        self.gremlin = Gremlin(client)
+        self.params = dict()
+        self.steps = []
+        self.empty = False
+        self._set_start(start)
+
+    def __iter__(self):
+        return self.all()
+
+    def __str__(self):
+        return self.get_script()
+
+    # Vertex steps
+
+    def out(self, *labels):
+        """Adds an out-adjacent vertices step, optionally for the labels."""
+        return self._add_step("out", labels)
+
+    def in_(self, *labels):
+        """Adds an in-adjacent vertices step, optionally for the labels."""
+        return self._add_step("in", labels)
+
+    def both(self, *labels):
+        """Adds a both-adjacent vertices step, optionally for the labels."""
+        return self._add_step("both", labels)
+
+    def outE(self, *labels):
+        """Adds an outgoing edges step, optionally for the labels."""
+        return self._add_step("outE", labels)
+
+    def inE(self, *labels):
+        """Adds an incoming edges step, optionally for the labels."""
+        return self._add_step("inE", labels)
+
+    def bothE(self, *labels):
+        """Adds an incoming and outgoing edges step, optionally for the labels."""
+        return self._add_step("bothE", labels)
+
+    # Edge steps
+
+    def outV(self):
+        """Adds a step to the edges' outgoing (tail) vertices."""
+        return self._add_step("outV")
+
+    def inV(self):
+        """Adds a step to the edges' incoming (head) vertices."""
+        return self._add_step("inV")
+
+    def bothV(self):
+        """Adds a step to both of the edges' vertices."""
+        return self._add_step("bothV")
+
+    # Filters
+
+    def has(self, key, value):
+        """
+        Adds a step that keeps the elements where the property key has the
+        value.
+
+        :param key: Property key.
+        :type key: str
+
+        :param value: Property value.
+        :type value: str, int, long, float, or bool
+
+        :rtype: Traversal
+
+        """
+        return self._add_step("has", (key, value))
+
+    def dedup(self):
+        """Adds a step that removes duplicate elements."""
+        return self._add_step("dedup")
+
+    def range(self, start, stop):
+        """
+        Adds a step that keeps the elements from start up to, but not
+        including, stop.
+
+        :param start: Index of the first element.
+        :type start: int
+
+        :param stop: Index after the last element.
+        :type stop: int
+
+        :rtype: Traversal
+
+        :raises: ValueError if start or stop is negative.
+
+        """
+        if start < 0 or stop < 0:
+            raise ValueError("range needs non-negative bounds: %s, %s" % (start, stop))
+        if stop <= start:
+            # Gremlin 1.x reads an end of -1 as unbounded, so don't send it.
+            self.empty = True
+            return self
+        # Gremlin's range is inclusive.
+        return self._add_step("range", (start, stop - 1))
+
+    def limit(self, count):
+        """
+        Adds a step that keeps the first count elements.
+
+        :param count: Maximum number of elements.
+        :type count: int
+
+        :rtype: Traversal
+
+        :raises: ValueError if count is negative.
+
+        """
+        return self.range(0, count)
+
+    # Execution
+
+    def get_script(self):
+        """
+        Returns the compiled Gremlin script.
+
+        :rtype: str
+
+        """
+        return "".join(self.steps)
+
+    def get_params(self):
+        """
+        Returns the parameters bound to the compiled Gremlin script.
+
+        :rtype: dict
+
+        """
+        return self.params.copy()
+
+    def all(self):
+        """
+        Runs the traversal and returns the initialized elements.
+
+        :rtype: Generator of objects: Vertex, Edge, Node, or Relationship
+
+        """
+        if self.empty:
+            return iter([])
+        script = self.get_script()
+        log.debug("Traversal script: %s", script)
+        return self.gremlin.query(script, self.get_params())
+
+    def count(self):
+        """
+        Runs the traversal and returns the number of elements it reaches.
+
+        :rtype: int
+
+        """
+        if self.empty:
+            return 0
+        script = self.get_script() + ".count()"
+        return self.gremlin.command(script, self.get_params())
+
+    def _set_start(self, start):
+        if isinstance(start, (list, tuple)):
+            ids = [self._get_id(element) for element in start]
+            getter = self._get_getter(start[0] if start else None)
+            param = self._add_param(ids)
+            self.steps.append("%s.collect{g.%s(it)}._()" % (param, getter))
+        else:
+            getter = self._get_getter(start)
+            param = self._add_param(self._get_id(start))
+            self.steps.append("g.%s(%s)" % (getter, param))
+
+    def _get_getter(self, start):
+        return "e" if isinstance(start, Edge) else "v"
+
+    def _get_id(self, start):
+        return start._id if isinstance(start, Element) else start
+
+    def _add_step(self, name, args=()):
+        params = [self._add_param(arg) for arg in args]
+        self.steps.append(".%s(%s)" % (name, ",".join(params)))
+        return self
+
+    def _add_param(self, value):
+        # Bind every value so the compiled script only varies by its steps.
+        name = "p%d" % len(self.params)
+        self.params[name] = value
+        return name
@@ -60,7 +60,13 @@ def initialize_elements(client,response):
     # return a generator of initialized elements.
     if response.total_size > 0:
         # yield doesn't work for conditionals
-        return (initialize_element(client, result) for result in response.results)
+        elements = (initialize_element(client, result) for result in response.results)
+        info = getattr(response, "call_info", None)
+        if info is not None and client.config.metrics is not None:
+            # imported here because metrics imports utils
+            from .metrics import timed_elements
+            return timed_elements(elements, info, client.config.metrics)
+        return elements
 
 def initialize_element(client,result):
     # result should be a single Result object, not a list or generator
@@ -204,6 +210,15 @@ def get_file_path(current_filename, target_filename):
     file_path = os.path.normpath(os.path.join(current_dir, target_filename))
     return file_path
 
+def get_defining_class(cls, name):
+    """
+    Returns the class in the MRO that defines the attribute name, or None.
+
+    """
+    for klass in inspect.getmro(cls):
+        if name in klass.__dict__:
+            return klass
+
 def coerce_id(_id):
     """
     Tries to coerce a vertex ID into an integer and returns it.
@@ -9,6 +9,8 @@ from bulbs.neo4jserver.tests.client_tests import neo4j_client_suite
 from bulbs.titan.tests.bulbs_tests import test_suite as titan_bulbs_suite
 from bulbs.titan.tests.client_tests import titan_client_suite
 
+from offline_tests import suite as offline_suite
+
 
 def suite():
     # This requires Neo4j Server and Rexster are running.
@@ -23,6 +25,8 @@ def suite():
 
     suite.addTest(titan_client_suite()) 
     suite.addTest(titan_bulbs_suite())
+
+    suite.addTest(offline_suite())
  
     return suite
 
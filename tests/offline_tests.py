@@ -0,0 +1,26 @@
+import unittest
+
+from bulbs.memory.tests import test_suite as memory_suite
+from bulbs.sqlite.tests import test_suite as sqlite_suite
+from bulbs.rexster.tests import offline_suite as rexster_offline_suite
+from bulbs.tests.cypher_tests import cypher_suite
+from bulbs.tests.stream_tests import stream_suite
+
+
+def suite():
+    # These run against in-process stores and local fake servers, so they
+    # don't need a database server, e.g. in CI.
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(memory_suite())
+    suite.addTest(sqlite_suite())
+    suite.addTest(rexster_offline_suite())
+
+    suite.addTest(cypher_suite())
+    suite.addTest(stream_suite())
+
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')